@@ -2,6 +2,7 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth.password_validation import validate_password
 from django.conf import settings
+from campus_forum.compiled import CompiledReadMixin
 from .models import User
 
 
@@ -23,7 +24,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CompiledReadMixin, serializers.ModelSerializer):
     """Serializer para mostrar datos del usuario"""
     
     full_name = serializers.SerializerMethodField()
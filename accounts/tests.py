@@ -1,3 +1,60 @@
-from django.test import TestCase
+import asyncio
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from campus_forum.sse import EventStreamApplication
+from .models import User
 
-# Create your tests here.
+
+def open_stream(path, query='', headers=()):
+    """Abrir un stream contra la aplicación ASGI y cerrarlo enseguida; devuelve el status"""
+    sent = []
+
+    async def receive():
+        await asyncio.sleep(0.05)
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    async def not_found(scope, receive, send):
+        raise AssertionError('La petición no debía llegar a Django')
+
+    scope = {
+        'type': 'http', 'method': 'GET', 'path': path, 'query_string': query.encode(),
+        'headers': [(name.encode(), value.encode()) for name, value in headers],
+    }
+    asyncio.run(EventStreamApplication(not_found)(scope, receive, send))
+    return sent[0]['status']
+
+
+class StreamTokenTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='estudiante@campus.edu', password='clave-segura', first_name='Eva', last_name='Estudiante'
+        )
+        self.access = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+
+    def stream_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+        response = self.client.post('/api/auth/stream-token/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['token']
+
+    def test_stream_token_requires_authentication(self):
+        self.assertEqual(self.client.post('/api/auth/stream-token/').status_code, 401)
+
+    def test_stream_authentication(self):
+        path = '/api/stream/posts/1/'
+        self.assertEqual(open_stream(path), 401)
+        self.assertEqual(open_stream(path, headers=[('authorization', f'Bearer {self.access}')]), 200)
+        self.assertEqual(open_stream(path, f'token={self.stream_token()}'), 200)
+        # El JWT no se acepta en la URL
+        self.assertEqual(open_stream(path, f'token={self.access}'), 401)
+        self.assertEqual(open_stream('/api/stream/categories/1/'), 200)
+
+    def test_stream_token_expires(self):
+        token = self.stream_token()
+        with override_settings(STREAM_TOKEN_SECONDS=-1):
+            self.assertEqual(open_stream('/api/stream/posts/1/', f'token={token}'), 401)
@@ -5,6 +5,7 @@ from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     RegisterView,
     CustomTokenObtainPairView,
+    StreamTokenView,
     UserProfileViewSet
 )
 
@@ -15,6 +16,7 @@ urlpatterns = [
     path('auth/register/', RegisterView.as_view({'post': 'create'}), name='register'),
     path('auth/login/', CustomTokenObtainPairView.as_view(), name='login'),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/stream-token/', StreamTokenView.as_view(), name='stream_token'),
     path('', include(router.urls)),
 ]
 
@@ -1,9 +1,12 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from campus_forum.sse import issue_stream_token
 
 from .models import User
 from .serializers import (
@@ -42,6 +45,18 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
+class StreamTokenView(APIView):
+    """Token corto para abrir streams SSE con ?token= sin poner el JWT en la URL"""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        return Response({
+            'token': issue_stream_token(request.user, request.auth),
+            'expires_in': settings.STREAM_TOKEN_SECONDS
+        })
+
+
 class UserProfileViewSet(viewsets.ModelViewSet):
     """ViewSet para gestión de perfil de usuario"""
     
@@ -0,0 +1,32 @@
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from analytics.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcular los resúmenes diarios de estadísticas desde las tablas base: todos, o los '
+        'días desde --since / los últimos --days (posts creados en esos días).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Primer día a recalcular (AAAA-MM-DD)')
+        parser.add_argument('--days', type=int, help='Recalcular solo los últimos N días')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since debe tener el formato AAAA-MM-DD')
+        elif options['days']:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        rows = rebuild_rollups(since=since)
+        scope = f'desde {since}' if since else 'completos'
+        self.stdout.write(self.style.SUCCESS(
+            f"Resúmenes {scope}: {rows['days']} días, {rows['categories']} filas de categorías, "
+            f"{rows['users']} filas de usuarios"
+        ))
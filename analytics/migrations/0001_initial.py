@@ -0,0 +1,78 @@
+# Generated by Django 4.2 on 2026-10-18 07:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_rollups(apps, schema_editor):
+    from analytics.rollups import rebuild_rollups
+    rebuild_rollups(apps=apps, using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('categories', '0002_alter_category_status'),
+        ('comments', '0004_comment_sync'),
+        ('posts', '0010_category_comments_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True, verbose_name='Día')),
+                ('published_posts', models.IntegerField(default=0, verbose_name='Posts publicados')),
+                ('comments', models.IntegerField(default=0, verbose_name='Comentarios')),
+                ('active_users', models.IntegerField(default=0, verbose_name='Usuarios activos')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario',
+                'verbose_name_plural': 'Resúmenes diarios',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('published_posts', models.IntegerField(default=0, verbose_name='Posts publicados')),
+                ('user', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de usuario',
+                'verbose_name_plural': 'Resúmenes diarios de usuarios',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('published_posts', models.IntegerField(default=0, verbose_name='Posts publicados')),
+                ('comments', models.IntegerField(default=0, verbose_name='Comentarios')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='categories.category', verbose_name='Categoría')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de categoría',
+                'verbose_name_plural': 'Resúmenes diarios de categorías',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='userdailystats',
+            constraint=models.UniqueConstraint(fields=('day', 'user'), name='analytics_userdailystats_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='categorydailystats',
+            constraint=models.UniqueConstraint(fields=('day', 'category'), name='analytics_categorydailystats_unique'),
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,75 @@
 from django.db import models
+from accounts.models import User
+from categories.models import Category
 
-# Create your models here.
+
+class DailyStats(models.Model):
+    """
+    Resumen global por día de creación (ver analytics.rollups).
+    
+    Cada fila cuenta lo creado ese día que sigue vigente: la suma de todas las
+    filas da los totales actuales.
+    """
+    day = models.DateField(unique=True, verbose_name='Día')
+    published_posts = models.IntegerField(default=0, verbose_name='Posts publicados')
+    comments = models.IntegerField(default=0, verbose_name='Comentarios')
+    active_users = models.IntegerField(default=0, verbose_name='Usuarios activos')
+    
+    class Meta:
+        verbose_name = 'Resumen diario'
+        verbose_name_plural = 'Resúmenes diarios'
+        ordering = ['-day']
+    
+    def __str__(self):
+        return str(self.day)
+
+
+class CategoryDailyStats(models.Model):
+    """Posts publicados de la categoría y comentarios en ellos, por día de creación"""
+    day = models.DateField(verbose_name='Día')
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='daily_stats',
+        verbose_name='Categoría'
+    )
+    published_posts = models.IntegerField(default=0, verbose_name='Posts publicados')
+    comments = models.IntegerField(default=0, verbose_name='Comentarios')
+    
+    class Meta:
+        verbose_name = 'Resumen diario de categoría'
+        verbose_name_plural = 'Resúmenes diarios de categorías'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'category'], name='analytics_categorydailystats_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.category_id} - {self.day}"
+
+
+class UserDailyStats(models.Model):
+    """Posts publicados del autor, por día de creación"""
+    day = models.DateField(verbose_name='Día')
+    # Sin restricción en la BD: los incrementos del borrado de un usuario se aplican
+    # después de confirmar y no deben fallar; sus filas quedan huérfanas hasta la
+    # siguiente reconstrucción y las lecturas las descartan con el JOIN
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name='Usuario'
+    )
+    published_posts = models.IntegerField(default=0, verbose_name='Posts publicados')
+    
+    class Meta:
+        verbose_name = 'Resumen diario de usuario'
+        verbose_name_plural = 'Resúmenes diarios de usuarios'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'user'], name='analytics_userdailystats_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.day}"
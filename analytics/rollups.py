@@ -0,0 +1,235 @@
+"""
+Resúmenes diarios para las estadísticas (DailyStats, CategoryDailyStats, UserDailyStats).
+
+Las filas se indexan por el día de creación del objeto y cuentan lo que sigue
+vigente: un post publicado suma en el día en que se creó y resta de ese mismo
+día si se archiva o elimina. Así la suma de todas las filas es el total actual
+y un rango de días equivale a filtrar por created_at.
+
+Las señales (analytics.signals) y la moderación por lote traducen cada
+escritura en incrementos que se aplican al confirmar la transacción, con un
+INSERT ... ON CONFLICT por tabla: las filas del día no quedan bloqueadas
+durante la request. Lo que no pasa por señales (COPY, bulk_create) o se pierde
+si el proceso cae entre la confirmación y el upsert se recalcula con
+`manage.py rollup_analytics`.
+"""
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, time
+from django.apps import apps as global_apps
+from django.db import connections, router, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+_local = threading.local()
+
+UPSERT_BATCH_SIZE = 500
+
+
+def day_of(value):
+    """Día de un datetime en la zona horaria activa (la misma que usa TruncDate)"""
+    return timezone.localdate(value)
+
+
+def start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def comment_counts_by_day(post_ids):
+    """{post_id: {día: comentarios}} con una sola consulta agrupada"""
+    from comments.models import Comment
+    counts = defaultdict(dict)
+    rows = Comment.objects.filter(post_id__in=post_ids).annotate(
+        day=TruncDate('created_at')
+    ).values_list('post_id', 'day').annotate(total=Count('id')).order_by()
+    for post_id, day, total in rows:
+        counts[post_id][day] = total
+    return counts
+
+
+def upsert_increments(model, key_fields, rows):
+    """
+    Sumar contadores a las filas de `model` (crearlas si no existen).
+
+    `rows` es {valores de key_fields: Counter(campo=incremento)}. Las claves se
+    ordenan para que dos upserts concurrentes bloqueen las filas en el mismo orden.
+    """
+    rows = {key: counters for key, counters in rows.items() if any(counters.values())}
+    if not rows:
+        return
+    opts = model._meta
+    counter_fields = [
+        field for field in opts.concrete_fields
+        if not field.primary_key and field.name not in key_fields
+    ]
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    table = quote(opts.db_table)
+    key_columns = [quote(opts.get_field(name).column) for name in key_fields]
+    counter_columns = [quote(field.column) for field in counter_fields]
+    placeholders = '(' + ', '.join(['%s'] * (len(key_columns) + len(counter_columns))) + ')'
+    updates = ', '.join(f'{column} = {table}.{column} + EXCLUDED.{column}' for column in counter_columns)
+
+    keys = sorted(rows)
+    with connection.cursor() as cursor:
+        for start in range(0, len(keys), UPSERT_BATCH_SIZE):
+            batch = keys[start:start + UPSERT_BATCH_SIZE]
+            params = []
+            for key in batch:
+                params.extend(key)
+                params.extend(rows[key][field.name] for field in counter_fields)
+            cursor.execute(
+                f'INSERT INTO {table} ({", ".join(key_columns + counter_columns)}) '
+                f'VALUES {", ".join([placeholders] * len(batch))} '
+                f'ON CONFLICT ({", ".join(key_columns)}) DO UPDATE SET {updates}',
+                params
+            )
+
+
+class RollupDelta:
+    """Incrementos pendientes sobre las tres tablas de resumen"""
+
+    def __init__(self):
+        self.days = defaultdict(Counter)
+        self.categories = defaultdict(Counter)
+        self.users = defaultdict(Counter)
+
+    def __bool__(self):
+        return bool(self.days or self.categories or self.users)
+
+    def published_post(self, created_at, category_id, author_id, sign):
+        day = day_of(created_at)
+        self.days[(day,)]['published_posts'] += sign
+        self.categories[(day, category_id)]['published_posts'] += sign
+        self.users[(day, author_id)]['published_posts'] += sign
+
+    def comments(self, counts, sign, category_id=None, total=True):
+        """
+        Comentarios por día ({día: n}). `total` los cuenta en el resumen global;
+        `category_id`, en el de la categoría (solo comentarios de posts publicados).
+        """
+        for day, count in counts.items():
+            if total:
+                self.days[(day,)]['comments'] += sign * count
+            if category_id is not None:
+                self.categories[(day, category_id)]['comments'] += sign * count
+
+    def active_user(self, date_joined, sign):
+        self.days[(day_of(date_joined),)]['active_users'] += sign
+
+    def post_transitions(self, transitions):
+        """
+        Cambios de estado o categoría de posts existentes.
+
+        `transitions` son tuplas (post, estado anterior, categoría anterior); el
+        post tiene ya los valores nuevos. Los comentarios de los posts que entran o
+        salen de "publicado" se cuentan con una sola consulta.
+        """
+        from posts.models import Post
+        published = Post.Status.PUBLISHED
+        changed = [
+            (post, previous_status == published, previous_category_id)
+            for post, previous_status, previous_category_id in transitions
+            if (previous_status == published, previous_category_id) != (post.status == published, post.category_id)
+            and published in (previous_status, post.status)
+        ]
+        if not changed:
+            return
+        counts = comment_counts_by_day([post.pk for post, _, _ in changed])
+        for post, was_published, previous_category_id in changed:
+            if was_published:
+                self.published_post(post.created_at, previous_category_id, post.author_id, -1)
+                self.comments(counts.get(post.pk, {}), -1, category_id=previous_category_id, total=False)
+            if post.status == published:
+                self.published_post(post.created_at, post.category_id, post.author_id, 1)
+                self.comments(counts.get(post.pk, {}), 1, category_id=post.category_id, total=False)
+
+    def apply(self):
+        from .models import CategoryDailyStats, DailyStats, UserDailyStats
+        upsert_increments(DailyStats, ['day'], self.days)
+        upsert_increments(CategoryDailyStats, ['day', 'category'], self.categories)
+        upsert_increments(UserDailyStats, ['day', 'user'], self.users)
+
+    def apply_on_commit(self):
+        """Aplicar al confirmar la transacción en curso (nada si se revierte)"""
+        if self:
+            transaction.on_commit(self.apply)
+
+
+def posts_being_deleted():
+    """Posts cuyo borrado está en curso en este hilo: sus comentarios se descuentan con el post"""
+    if not hasattr(_local, 'deleting_posts'):
+        _local.deleting_posts = set()
+    return _local.deleting_posts
+
+
+def rebuild_rollups(since=None, apps=global_apps, using='default'):
+    """
+    Recalcular las filas desde las tablas base (todas, o los días desde `since`).
+
+    Devuelve cuántas filas se escribieron por tabla.
+    """
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('comments', 'Comment')
+    User = apps.get_model('accounts', 'User')
+    DailyStats = apps.get_model('analytics', 'DailyStats')
+    CategoryDailyStats = apps.get_model('analytics', 'CategoryDailyStats')
+    UserDailyStats = apps.get_model('analytics', 'UserDailyStats')
+
+    posts = Post.objects.using(using).filter(status='PUBLISHED')
+    comments = Comment.objects.using(using).all()
+    users = User.objects.using(using).filter(is_active=True)
+    if since is not None:
+        start = start_of_day(since)
+        posts = posts.filter(created_at__gte=start)
+        comments = comments.filter(created_at__gte=start)
+        users = users.filter(date_joined__gte=start)
+
+    def grouped(queryset, field, *keys):
+        return queryset.annotate(day=TruncDate(field)).values_list('day', *keys).annotate(
+            total=Count('id')
+        ).order_by()
+
+    tables = [DailyStats, CategoryDailyStats, UserDailyStats]
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        if connection.vendor == 'postgresql':
+            # Los upserts concurrentes esperan a que termine la reconstrucción
+            with connection.cursor() as cursor:
+                for model in tables:
+                    cursor.execute(f'LOCK TABLE {connection.ops.quote_name(model._meta.db_table)} IN EXCLUSIVE MODE')
+
+        days = defaultdict(Counter)
+        categories = defaultdict(Counter)
+        user_days = defaultdict(Counter)
+        for day, category_id, author_id, total in grouped(posts, 'created_at', 'category_id', 'author_id'):
+            days[day]['published_posts'] += total
+            categories[(day, category_id)]['published_posts'] += total
+            user_days[(day, author_id)]['published_posts'] += total
+        for day, post_status, category_id, total in grouped(
+            comments, 'created_at', 'post__status', 'post__category_id'
+        ):
+            days[day]['comments'] += total
+            if post_status == 'PUBLISHED':
+                categories[(day, category_id)]['comments'] += total
+        for day, total in grouped(users, 'date_joined'):
+            days[day]['active_users'] += total
+
+        for model in tables:
+            stale = model.objects.using(using).all()
+            if since is not None:
+                stale = stale.filter(day__gte=since)
+            stale.delete()
+        DailyStats.objects.using(using).bulk_create(
+            [DailyStats(day=day, **counters) for day, counters in days.items()], batch_size=1000
+        )
+        CategoryDailyStats.objects.using(using).bulk_create([
+            CategoryDailyStats(day=day, category_id=category_id, **counters)
+            for (day, category_id), counters in categories.items()
+        ], batch_size=1000)
+        UserDailyStats.objects.using(using).bulk_create([
+            UserDailyStats(day=day, user_id=user_id, **counters)
+            for (day, user_id), counters in user_days.items()
+        ], batch_size=1000)
+    return {'days': len(days), 'categories': len(categories), 'users': len(user_days)}
@@ -0,0 +1,102 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from accounts.models import User
+from comments.models import Comment
+from posts.models import Post
+from .rollups import RollupDelta, comment_counts_by_day, day_of, posts_being_deleted
+
+
+@receiver(post_save, sender=Post)
+def rollup_post_saved(sender, instance, created, **kwargs):
+    """Publicar, despublicar o mover de categoría un post ajusta los resúmenes de su día"""
+    delta = RollupDelta()
+    if created:
+        if instance.status == Post.Status.PUBLISHED:
+            delta.published_post(instance.created_at, instance.category_id, instance.author_id, 1)
+    elif hasattr(instance, '_loaded_status'):
+        delta.post_transitions([(
+            instance,
+            instance._loaded_status,
+            getattr(instance, '_loaded_category_id', instance.category_id),
+        )])
+    delta.apply_on_commit()
+
+
+@receiver(pre_delete, sender=Post)
+def rollup_post_deleted(sender, instance, **kwargs):
+    """El post se descuenta con todos sus comentarios (antes de que el borrado en cascada los elimine)"""
+    posts_being_deleted().add(instance.pk)
+    delta = RollupDelta()
+    published = instance.status == Post.Status.PUBLISHED
+    if published:
+        delta.published_post(instance.created_at, instance.category_id, instance.author_id, -1)
+    delta.comments(
+        comment_counts_by_day([instance.pk]).get(instance.pk, {}), -1,
+        category_id=instance.category_id if published else None
+    )
+    delta.apply_on_commit()
+
+
+@receiver(post_delete, sender=Post)
+def forget_deleted_post(sender, instance, **kwargs):
+    posts_being_deleted().discard(instance.pk)
+
+
+def post_state(comment):
+    """(estado, categoría) del post del comentario, sin consulta si ya está cargado"""
+    if Comment.post.is_cached(comment):
+        return comment.post.status, comment.post.category_id
+    return Post.objects.filter(pk=comment.post_id).values_list('status', 'category_id').first() or (None, None)
+
+
+@receiver(post_save, sender=Comment)
+def rollup_comment_created(sender, instance, created, **kwargs):
+    if created:
+        status, category_id = post_state(instance)
+        delta = RollupDelta()
+        delta.comments(
+            {day_of(instance.created_at): 1}, 1,
+            category_id=category_id if status == Post.Status.PUBLISHED else None
+        )
+        delta.apply_on_commit()
+
+
+@receiver(post_delete, sender=Comment)
+def rollup_comment_deleted(sender, instance, **kwargs):
+    if instance.post_id in posts_being_deleted():
+        return
+    status, category_id = post_state(instance)
+    delta = RollupDelta()
+    delta.comments(
+        {day_of(instance.created_at): 1}, -1,
+        category_id=category_id if status == Post.Status.PUBLISHED else None
+    )
+    delta.apply_on_commit()
+
+
+@receiver(pre_save, sender=User)
+def remember_user_active(sender, instance, update_fields=None, **kwargs):
+    """Leer is_active antes de guardar (salvo que no se esté guardando, p. ej. last_login)"""
+    if instance._state.adding or (update_fields is not None and 'is_active' not in update_fields):
+        return
+    was_active = User.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+    if was_active is not None:
+        instance._rollup_was_active = was_active
+
+
+@receiver(post_save, sender=User)
+def rollup_user_saved(sender, instance, created, **kwargs):
+    # Se consume en cada guardado: uno posterior con update_fields no lo vuelve a leer
+    was_active = False if created else instance.__dict__.pop('_rollup_was_active', instance.is_active)
+    if was_active != instance.is_active:
+        delta = RollupDelta()
+        delta.active_user(instance.date_joined, 1 if instance.is_active else -1)
+        delta.apply_on_commit()
+
+
+@receiver(post_delete, sender=User)
+def rollup_user_deleted(sender, instance, **kwargs):
+    if instance.is_active:
+        delta = RollupDelta()
+        delta.active_user(instance.date_joined, -1)
+        delta.apply_on_commit()
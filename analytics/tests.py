@@ -1,3 +1,119 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
 from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from categories.models import Category
+from comments.models import Comment
+from posts.models import Post
+from posts.moderation import apply_bulk_action
+from .models import CategoryDailyStats, DailyStats, UserDailyStats
+from .rollups import rebuild_rollups
 
-# Create your tests here.
+
+def rollup_rows():
+    """Contenido de las tres tablas de resumen, sin filas en cero"""
+    return {
+        'days': {
+            row.pop('day'): row
+            for row in DailyStats.objects.values('day', 'published_posts', 'comments', 'active_users')
+            if any(row[field] for field in ('published_posts', 'comments', 'active_users'))
+        },
+        'categories': {
+            (row.pop('day'), row.pop('category_id')): row
+            for row in CategoryDailyStats.objects.values('day', 'category_id', 'published_posts', 'comments')
+            if row['published_posts'] or row['comments']
+        },
+        'users': {
+            (row['day'], row['user_id']): row['published_posts']
+            for row in UserDailyStats.objects.values('day', 'user_id', 'published_posts')
+            if row['published_posts']
+        },
+    }
+
+
+class IncrementalRollupTests(TestCase):
+    """Los incrementos de señales y moderación deben coincidir con una reconstrucción completa"""
+
+    def at(self, day, hour=12):
+        moment = datetime(2025, 3, day, hour, tzinfo=dt_timezone.utc)
+        return mock.patch('django.utils.timezone.now', return_value=moment)
+
+    def write(self, day, operation, *args, **kwargs):
+        """Ejecutar una escritura "ese día" y aplicar los incrementos al confirmar"""
+        with self.at(day), self.captureOnCommitCallbacks(execute=True):
+            return operation(*args, **kwargs)
+
+    def create_post(self, day, author, category, status, title):
+        return self.write(day, Post.objects.create, title=title, content='Contenido suficiente para un post.',
+                          category=category, author=author, status=status)
+
+    def comment(self, day, post, author):
+        return self.write(day, Comment.objects.create, post=post, author=author, content='Un comentario más')
+
+    def test_incremental_rollups_match_rebuild(self):
+        admin = self.write(1, User.objects.create_user, email='admin@campus.edu', password='x',
+                           first_name='Ana', last_name='Admin', role='ADMIN')
+        author = self.write(1, User.objects.create_user, email='autor@campus.edu', password='x',
+                            first_name='Luis', last_name='Autor')
+        reader = self.write(2, User.objects.create_user, email='lector@campus.edu', password='x',
+                            first_name='Eva', last_name='Lectora')
+        news = Category.objects.create(name='Avisos', created_by=admin)
+        questions = Category.objects.create(name='Dudas', created_by=admin)
+
+        welcome = self.create_post(1, author, news, 'PUBLISHED', 'Bienvenida al foro')
+        draft = self.create_post(1, author, questions, 'DRAFT', 'Borrador con comentarios')
+        schedule = self.create_post(2, admin, questions, 'PUBLISHED', 'Horario de tutorías')
+        for day, post, user in [(1, welcome, reader), (2, welcome, admin), (2, draft, admin),
+                                (3, schedule, reader), (3, schedule, author)]:
+            self.comment(day, post, user)
+        removed = self.comment(4, schedule, reader)
+
+        # Publicar, archivar y mover de categoría (save y API)
+        draft.status = 'PUBLISHED'
+        self.write(4, draft.save)
+        client = APIClient()
+        client.force_authenticate(admin)
+        response = self.write(4, client.patch, f'/api/posts/posts/{welcome.pk}/archive/')
+        self.assertEqual(response.status_code, 200)
+        response = self.write(4, client.patch, f'/api/posts/posts/{schedule.pk}/',
+                              {'category_id': news.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        # Moderación por lote y borrado de un comentario
+        self.write(5, apply_bulk_action, admin, [welcome.pk], 'publish')
+        response = self.write(5, client.delete, f'/api/comments/{removed.pk}/')
+        self.assertEqual(response.status_code, 204)
+        # Borrar un post publicado con comentarios
+        self.write(5, client.delete, f'/api/posts/posts/{draft.pk}/')
+        self.assertFalse(Post.objects.filter(pk=draft.pk).exists())
+        # Desactivar usuarios
+        reader.is_active = False
+        self.write(6, reader.save)
+        self.write(6, User.objects.get(pk=author.pk).save)
+
+        incremental = rollup_rows()
+        self.assertEqual(incremental['days'][datetime(2025, 3, 1).date()]['published_posts'], 1)
+        self.assertEqual(incremental['days'][datetime(2025, 3, 3).date()]['comments'], 2)
+
+        rebuild_rollups()
+        self.assertEqual(incremental, rollup_rows())
+
+
+class TimeseriesBoundsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(
+            email='admin@campus.edu', password='x', first_name='Ana', last_name='Admin', role='ADMIN'
+        ))
+
+    def test_date_bound_includes_whole_day(self):
+        response = self.client.get('/api/analytics/timeseries/', {'from': '2025-03-01', 'to': '2025-03-03'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['buckets'], ['2025-03-01', '2025-03-02', '2025-03-03'])
+
+    def test_out_of_range_dates_are_rejected(self):
+        for params in ({'to': '9999-12-31'}, {'from': '9999-12-30', 'to': '9999-12-31T12:00:00Z'},
+                       {'from': '0001-01-01', 'to': '0001-01-02'}, {'bucket': 'week', 'to': '0001-01-03'}):
+            response = self.client.get('/api/analytics/timeseries/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn('error', response.data)
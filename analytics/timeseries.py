@@ -0,0 +1,239 @@
+"""
+Series de tiempo para /api/analytics/timeseries/.
+
+Cada métrica se agrupa por intervalo (hora, día o semana) con una sola
+consulta: date_trunc sobre la tabla base o, para días y semanas de posts y
+comentarios, sobre los resúmenes diarios (analytics.rollups), que ya tienen un
+renglón por día. Las visitas (views) solo existen por día (PostDailyViews) y
+se cuentan por el día de la visita, no el de creación del post. El resto (rellenar intervalos vacíos, media móvil y
+comparación con la semana anterior) se hace con arreglos de NumPy.
+
+Los intervalos se alinean en UTC; las semanas empiezan el lunes, como en
+date_trunc('week').
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+import numpy as np
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+METRICS = ('posts', 'comments', 'signups', 'reports', 'views')
+# Métricas que se leen de tablas con un renglón por día
+DAILY_METRICS = ('posts', 'comments', 'views')
+BUCKETS = {
+    # intervalo: (unidad de NumPy, intervalos por semana, ventana por defecto de la media móvil)
+    'hour': ('h', 168, 24),
+    'day': ('D', 7, 7),
+    'week': ('D', 1, 4),
+}
+# Rango por defecto hacia atrás desde `to`, en intervalos
+DEFAULT_SPAN = {'hour': 48, 'day': 30, 'week': 26}
+MAX_BUCKETS = 10000
+MAX_WINDOW = 366
+
+# 1970-01-01 fue jueves: el primer lunes es el día 4 de la época
+EPOCH_MONDAY = 4
+
+
+class TimeseriesError(ValueError):
+    pass
+
+
+def bucket_start(value, bucket):
+    """Inicio del intervalo que contiene `value` (datetime aware) como datetime64"""
+    value = np.datetime64(value.astimezone(dt_timezone.utc).replace(tzinfo=None))
+    if bucket == 'hour':
+        return value.astype('datetime64[h]')
+    day = value.astype('datetime64[D]')
+    if bucket == 'week':
+        day = day - (day.astype(np.int64) - EPOCH_MONDAY) % 7
+    return day
+
+
+def bucket_step(bucket):
+    return np.timedelta64(7, 'D') if bucket == 'week' else np.timedelta64(1, BUCKETS[bucket][0])
+
+
+def to_datetime(value):
+    converted = value.astype('datetime64[s]').astype(datetime)
+    if not isinstance(converted, datetime):
+        # Fuera de los años 1-9999 NumPy devuelve un entero
+        raise TimeseriesError('El rango sale de las fechas admitidas')
+    return converted.replace(tzinfo=dt_timezone.utc)
+
+
+def parse_bound(value, end=False):
+    """
+    Fecha (AAAA-MM-DD) o fecha y hora ISO 8601 como datetime aware.
+
+    Una fecha sola como límite final incluye el día completo.
+    """
+    try:
+        # La fecha sola primero: parse_datetime también la acepta (como medianoche)
+        day = parse_date(value)
+        if day is None:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                raise ValueError
+        else:
+            parsed = datetime.combine(day + timedelta(days=1) if end else day, datetime.min.time())
+            if end:
+                parsed -= timedelta(microseconds=1)
+    except (ValueError, OverflowError):
+        # OverflowError: el día siguiente a 9999-12-31 no es representable
+        raise TimeseriesError(f'Fecha inválida: {value}')
+    return timezone.make_aware(parsed, dt_timezone.utc) if timezone.is_naive(parsed) else parsed
+
+
+def resolve_range(bucket, start=None, end=None):
+    """Límites pedidos (?from, ?to); sin from, los últimos DEFAULT_SPAN intervalos hasta `to`"""
+    end = parse_bound(end, end=True) if end else timezone.now()
+    if start:
+        return parse_bound(start), end
+    if bucket not in DEFAULT_SPAN:
+        return end, end
+    return to_datetime(bucket_start(end, bucket) - (DEFAULT_SPAN[bucket] - 1) * bucket_step(bucket)), end
+
+
+def metric_queryset(metric, category_id=None, rollup=False):
+    """
+    Queryset y campo de fecha de la métrica, más el campo a sumar si es un resumen.
+
+    Posts son los publicados; con categoría, los comentarios son los de sus
+    posts publicados (como en las estadísticas generales).
+    """
+    from accounts.models import User
+    from comments.models import Comment
+    from posts.models import Post, PostDailyViews
+    from reports.models import Report
+    from .models import CategoryDailyStats, DailyStats
+
+    if metric == 'views':
+        queryset = PostDailyViews.objects.all()
+        if category_id is not None:
+            queryset = queryset.filter(post__category_id=category_id)
+        return queryset, 'day', 'views'
+    if rollup:
+        field = 'published_posts' if metric == 'posts' else 'comments'
+        if category_id is not None:
+            return CategoryDailyStats.objects.filter(category_id=category_id), 'day', field
+        return DailyStats.objects.all(), 'day', field
+
+    if metric == 'posts':
+        queryset = Post.objects.filter(status=Post.Status.PUBLISHED)
+        if category_id is not None:
+            queryset = queryset.filter(category_id=category_id)
+        return queryset, 'created_at', None
+    if metric == 'comments':
+        queryset = Comment.objects.all()
+        if category_id is not None:
+            queryset = queryset.filter(post__category_id=category_id, post__status=Post.Status.PUBLISHED)
+        return queryset, 'created_at', None
+    if metric == 'signups':
+        if category_id is not None:
+            raise TimeseriesError('La métrica signups no admite category')
+        return User.objects.all(), 'date_joined', None
+    queryset = Report.objects.all()
+    if category_id is not None:
+        queryset = queryset.filter(Q(post__category_id=category_id) | Q(comment__post__category_id=category_id))
+    return queryset, 'created_at', None
+
+
+def bucket_counts(metric, bucket, first, last, category_id=None):
+    """
+    Totales por intervalo entre `first` y `last` (inclusive), con ceros donde no hay datos.
+
+    Una consulta agrupada; los intervalos vacíos se rellenan asignando por índice.
+    """
+    step = bucket_step(bucket)
+    starts = np.arange(first, last + step, step)
+    rollup = bucket != 'hour' and metric in DAILY_METRICS
+    queryset, date_field, sum_field = metric_queryset(metric, category_id, rollup=rollup)
+
+    if rollup:
+        # El resumen ya tiene un renglón por día: date_trunc solo hace falta para semanas
+        queryset = queryset.filter(day__gte=to_datetime(first).date(), day__lt=to_datetime(last + step).date())
+        group = 'day'
+        if bucket == 'week':
+            queryset, group = queryset.annotate(bucket=Trunc('day', 'week')), 'bucket'
+        rows = queryset.values_list(group).annotate(total=Sum(sum_field)).order_by()
+    else:
+        queryset = queryset.filter(**{
+            f'{date_field}__gte': to_datetime(first),
+            f'{date_field}__lt': to_datetime(last + step),
+        })
+        rows = queryset.annotate(
+            bucket=Trunc(date_field, bucket, tzinfo=dt_timezone.utc)
+        ).values_list('bucket').annotate(total=Count('pk')).order_by()
+
+    rows = list(rows)
+    counts = np.zeros(len(starts), dtype=np.int64)
+    if rows:
+        unit = 'h' if bucket == 'hour' else 'D'
+        buckets = np.array([
+            value.replace(tzinfo=None) if isinstance(value, datetime) else value for value, _ in rows
+        ], dtype=f'datetime64[{unit}]')
+        totals = np.fromiter((total or 0 for _, total in rows), dtype=np.int64, count=len(rows))
+        counts[((buckets - first) // step).astype(np.int64)] = totals
+    return starts, counts
+
+
+def moving_average(values, window):
+    """Media móvil hacia atrás con sumas acumuladas (ventana completa en todos los puntos)"""
+    cumulative = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+    return (cumulative[window:] - cumulative[:-window]) / window
+
+
+def build_timeseries(metric, bucket, start, end, category_id=None, window=None):
+    """
+    Serie de `metric` entre los datetimes `start` y `end` (alineados al intervalo).
+
+    Se consultan también los intervalos previos necesarios para que la media móvil
+    y la comparación con la semana anterior estén completas desde el primer punto.
+    """
+    if metric not in METRICS:
+        raise TimeseriesError(f"metric debe ser uno de: {', '.join(METRICS)}")
+    if bucket not in BUCKETS:
+        raise TimeseriesError(f"bucket debe ser uno de: {', '.join(BUCKETS)}")
+    if metric == 'views' and bucket == 'hour':
+        raise TimeseriesError('La métrica views no admite bucket=hour')
+    _, per_week, default_window = BUCKETS[bucket]
+    window = default_window if window is None else window
+    if not 1 <= window <= MAX_WINDOW:
+        raise TimeseriesError(f'window debe estar entre 1 y {MAX_WINDOW}')
+
+    step = bucket_step(bucket)
+    first, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    if last < first:
+        raise TimeseriesError('from debe ser anterior a to')
+    size = int((last - first) // step) + 1
+    if size > MAX_BUCKETS:
+        raise TimeseriesError(f'El rango abarca {size} intervalos (máximo {MAX_BUCKETS})')
+
+    lead = max(window - 1, per_week)
+    starts, counts = bucket_counts(metric, bucket, first - lead * step, last, category_id)
+
+    average = moving_average(counts, window)[lead - (window - 1):]
+    previous = counts[lead - per_week:len(counts) - per_week]
+    counts, starts = counts[lead:], starts[lead:]
+    delta = counts - previous
+    # Variación relativa; sin valor (null) cuando la semana anterior fue cero
+    change = np.full(len(counts), np.nan)
+    np.divide(delta, previous, out=change, where=previous != 0)
+
+    unit = 'm' if bucket == 'hour' else 'D'
+    return {
+        'metric': metric,
+        'bucket': bucket,
+        'category': category_id,
+        'from': to_datetime(first),
+        'to': to_datetime(last + step),
+        'window': window,
+        'total': int(counts.sum()),
+        'buckets': np.datetime_as_string(starts, unit=unit, timezone='UTC' if bucket == 'hour' else 'naive').tolist(),
+        'counts': counts.tolist(),
+        'moving_average': np.round(average, 3).tolist(),
+        'week_over_week': delta.tolist(),
+        'week_over_week_change': np.where(np.isnan(change), None, np.round(change, 4)).tolist(),
+    }
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import statistics, category_stats
+from .views import statistics, category_stats, timeseries
 
 urlpatterns = [
     path('', statistics, name='statistics'),
     path('category/<int:category_id>/', category_stats, name='category-stats'),
+    path('timeseries/', timeseries, name='timeseries'),
 ]
 
 
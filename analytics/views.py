@@ -1,68 +1,94 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count, Q
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import timedelta
 from posts.models import Post
+from categories.index import get_category_index
 from categories.models import Category
-from comments.models import Comment
-from accounts.models import User
+from .models import CategoryDailyStats, DailyStats, UserDailyStats
+from .rollups import day_of, start_of_day
+from .timeseries import TimeseriesError, build_timeseries, resolve_range
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def statistics(request):
-    """Estadísticas generales de la plataforma"""
+    """Estadísticas generales de la plataforma (desde los resúmenes diarios, ver analytics.rollups)"""
+    
+    # Totales por categoría: una fila agrupada por categoría; los nombres salen de la instantánea
+    category_totals = {
+        row['category_id']: row
+        for row in CategoryDailyStats.objects.values('category_id').annotate(
+            posts_count=Sum('published_posts'),
+            comments_count=Sum('comments')
+        ).order_by()
+    }
+    categories = get_category_index().all()
     
     # Posts por categoría
-    posts_by_category = Category.objects.annotate(
-        posts_count=Count('posts', filter=Q(posts__status='PUBLISHED'))
-    ).values('id', 'name', 'posts_count').order_by('-posts_count')
+    posts_by_category = sorted((
+        {
+            'id': category.id,
+            'name': category.name,
+            'posts_count': category_totals.get(category.id, {}).get('posts_count', 0)
+        }
+        for category in categories
+    ), key=lambda entry: -entry['posts_count'])
     
     # Usuarios más activos (top posters)
-    top_posters_raw = User.objects.annotate(
-        posts_count=Count('posts', filter=Q(posts__status='PUBLISHED'))
-    ).filter(posts_count__gt=0).order_by('-posts_count')[:10]
+    top_posters_raw = UserDailyStats.objects.values(
+        'user_id', 'user__first_name', 'user__last_name', 'user__email'
+    ).annotate(posts_count=Sum('published_posts')).filter(posts_count__gt=0).order_by('-posts_count')[:10]
     
     top_posters = []
-    for user in top_posters_raw:
+    for row in top_posters_raw:
         top_posters.append({
-            'id': user.id,
-            'full_name': user.get_full_name(),
-            'email': user.email,
-            'posts_count': user.posts_count
+            'id': row['user_id'],
+            'full_name': f"{row['user__first_name']} {row['user__last_name']}",
+            'email': row['user__email'],
+            'posts_count': row['posts_count']
         })
     
     # Categorías más comentadas
-    categories_most_commented = Category.objects.annotate(
-        comments_count=Count('posts__comments', filter=Q(posts__status='PUBLISHED'))
-    ).filter(comments_count__gt=0).values(
-        'id', 'name', 'comments_count'
-    ).order_by('-comments_count')[:10]
-    
-    # Estadísticas generales
-    total_posts = Post.objects.filter(status='PUBLISHED').count()
-    total_comments = Comment.objects.count()
-    total_users = User.objects.filter(is_active=True).count()
+    categories_most_commented = sorted((
+        {
+            'id': category.id,
+            'name': category.name,
+            'comments_count': category_totals[category.id]['comments_count']
+        }
+        for category in categories
+        if category_totals.get(category.id, {}).get('comments_count', 0) > 0
+    ), key=lambda entry: -entry['comments_count'])[:10]
     
-    # Posts recientes (últimos 7 días)
+    # Estadísticas generales y posts recientes (últimos 7 días): los días completos
+    # salen del resumen; del primero solo cuenta lo posterior a week_ago
     week_ago = timezone.now() - timedelta(days=7)
-    recent_posts = Post.objects.filter(
+    first_full_day = day_of(week_ago) + timedelta(days=1)
+    totals = DailyStats.objects.aggregate(
+        total_posts=Coalesce(Sum('published_posts'), 0),
+        total_comments=Coalesce(Sum('comments'), 0),
+        total_users=Coalesce(Sum('active_users'), 0),
+        recent_posts=Coalesce(Sum('published_posts', filter=Q(day__gte=first_full_day)), 0)
+    )
+    recent_posts = totals['recent_posts'] + Post.objects.filter(
         status='PUBLISHED',
-        created_at__gte=week_ago
+        created_at__gte=week_ago,
+        created_at__lt=start_of_day(first_full_day)
     ).count()
     
     return Response({
         'general': {
-            'total_posts': total_posts,
-            'total_comments': total_comments,
-            'total_users': total_users,
+            'total_posts': totals['total_posts'],
+            'total_comments': totals['total_comments'],
+            'total_users': totals['total_users'],
             'recent_posts_week': recent_posts
         },
-        'posts_by_category': list(posts_by_category),
+        'posts_by_category': posts_by_category,
         'top_posters': top_posters,
-        'categories_most_commented': list(categories_most_commented)
+        'categories_most_commented': categories_most_commented
     })
 
 
@@ -75,14 +101,13 @@ def category_stats(request, category_id):
     except Category.DoesNotExist:
         return Response({'error': 'Categoría no encontrada'}, status=404)
     
-    posts = Post.objects.filter(category=category, status='PUBLISHED')
-    total_posts = posts.count()
-    total_comments = Comment.objects.filter(post__in=posts).count()
+    totals = CategoryDailyStats.objects.filter(category=category).aggregate(
+        total_posts=Coalesce(Sum('published_posts'), 0),
+        total_comments=Coalesce(Sum('comments'), 0)
+    )
     
-    # Posts más comentados de esta categoría
-    top_posts = posts.annotate(
-        comments_count=Count('comments')
-    ).order_by('-comments_count')[:5].values(
+    # Posts más comentados de esta categoría (índice category, status, -comments_count)
+    top_posts = Post.objects.filter(category=category, status='PUBLISHED').order_by('-comments_count')[:5].values(
         'id', 'title', 'comments_count', 'created_at'
     )
     
@@ -93,8 +118,31 @@ def category_stats(request, category_id):
             'description': category.description
         },
         'stats': {
-            'total_posts': total_posts,
-            'total_comments': total_comments
+            'total_posts': totals['total_posts'],
+            'total_comments': totals['total_comments']
         },
         'top_posts': list(top_posts)
     })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def timeseries(request):
+    """
+    Serie de tiempo de una métrica en arreglos paralelos (ver analytics.timeseries).
+    
+    ?metric=posts|comments|signups|reports|views&bucket=hour|day|week&from=&to=&category=&window=
+    """
+    params = request.query_params
+    bucket = params.get('bucket', 'day')
+    try:
+        category_id = int(params['category']) if params.get('category') else None
+        window = int(params['window']) if params.get('window') else None
+    except ValueError:
+        return Response({'error': 'category y window deben ser enteros'}, status=400)
+    try:
+        start, end = resolve_range(bucket, params.get('from'), params.get('to'))
+        data = build_timeseries(params.get('metric', 'posts'), bucket, start, end, category_id, window)
+    except TimeseriesError as error:
+        return Response({'error': str(error)}, status=400)
+    return Response(data)
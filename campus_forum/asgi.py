@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'campus_forum.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Los streams de eventos (/api/stream/...) se atienden fuera de Django (ver campus_forum.sse)
+from campus_forum.sse import EventStreamApplication  # noqa: E402
+
+application = EventStreamApplication(django_application)
@@ -0,0 +1,67 @@
+import threading
+import time
+from contextlib import contextmanager
+from django.core.cache import cache
+from django.db import transaction
+
+_local = threading.local()
+
+
+def generation_key(name):
+    return f'generation:{name}'
+
+
+def get_generation(name):
+    """
+    Número de generación compartido a través de la caché.
+
+    Se inicializa con un valor basado en el tiempo para que, si la clave se
+    pierde (reinicio o desalojo), nunca vuelva a un valor usado antes.
+    """
+    key = generation_key(name)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(name):
+    """Invalidar todo lo derivado de la generación actual"""
+    pending = getattr(_local, 'pending', None)
+    if pending is not None:
+        pending.add(name)
+        return None
+    key = generation_key(name)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        generation = time.time_ns()
+        cache.set(key, generation, timeout=None)
+        return generation
+
+
+@contextmanager
+def deferred_generation_bumps():
+    """
+    Agrupar los incrementos del bloque: uno por generación (operaciones por lote).
+
+    Se aplican al confirmar la transacción en curso (de inmediato si no hay una):
+    antes, una petición concurrente podría cachear filas sin confirmar con la
+    generación nueva y servirlas viejas hasta que expiren.
+    """
+    if getattr(_local, 'pending', None) is not None:
+        yield
+        return
+    _local.pending = set()
+    try:
+        yield
+    finally:
+        pending, _local.pending = _local.pending, None
+        if pending:
+            transaction.on_commit(lambda: bump_generations(pending))
+
+
+def bump_generations(names):
+    for name in names:
+        bump_generation(name)
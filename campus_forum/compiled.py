@@ -0,0 +1,179 @@
+"""
+Ruta de lectura compilada para serializers.
+
+DRF serializa cada fila recorriendo sus campos genéricos (get_attribute con
+manejo de excepciones, to_representation por campo, OrderedDict). Aquí, la
+primera vez que un serializer representa un objeto se compila un lector por
+campo especializado según su tipo (acceso directo al atributo, id de la llave
+foránea, fecha ISO 8601...). Como DRF reutiliza la misma instancia hija para
+todas las filas de un listado y los serializers anidados son campos, la
+compilación ocurre una vez por respuesta y el resto es acceso a atributos. Por
+lo mismo, un objeto relacionado que se repite en el listado (el autor de varios
+posts, el post de varios comentarios) se serializa una sola vez.
+
+Los campos sin lector especializado usan exactamente la ruta de DRF, así que
+la salida es idéntica byte a byte.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import fields as drf_fields, relations, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+
+SKIP = object()
+
+
+def _identity(value):
+    return value
+
+
+# Campos cuya representación no depende de la instancia del campo
+SIMPLE_CONVERTERS = {
+    drf_fields.CharField: str,
+    drf_fields.EmailField: str,
+    drf_fields.SlugField: str,
+    drf_fields.URLField: str,
+    drf_fields.IntegerField: int,
+    drf_fields.FloatField: float,
+    drf_fields.ReadOnlyField: _identity,
+}
+
+
+def _generic_reader(field):
+    """Misma lógica que Serializer.to_representation para un campo"""
+    def read(instance):
+        try:
+            attribute = field.get_attribute(instance)
+        except SkipField:
+            return SKIP
+        check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        if check_for_none is None:
+            return None
+        return field.to_representation(attribute)
+    return read
+
+
+def _attribute_reader(attr, convert):
+    def read(instance):
+        value = getattr(instance, attr)
+        return None if value is None else convert(value)
+    return read
+
+
+def _related_reader(key_attr, attr, convert):
+    """Relación a un objeto: cada objeto distinto se representa una sola vez por respuesta"""
+    seen = {}
+
+    def read(instance):
+        key = getattr(instance, key_attr)
+        if key is None:
+            return None
+        if key not in seen:
+            seen[key] = convert(getattr(instance, attr))
+        return seen[key]
+    return read
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if not isinstance(output_format, str) or output_format.lower() != drf_fields.ISO_8601 or field_timezone is None:
+        return None
+
+    def convert(value):
+        if isinstance(value, str) or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _choice_converter(field):
+    mapping = field.choice_strings_to_values
+
+    def convert(value):
+        if value == '':
+            return value
+        return mapping.get(str(value), value)
+    return convert
+
+
+def _model_field(serializer, attr):
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return None
+    try:
+        return model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        return None
+
+
+def compile_field(field):
+    """Lector instancia -> representación especializado para un campo legible"""
+    if isinstance(field, drf_fields.SerializerMethodField):
+        return getattr(field.parent, field.method_name)
+    if field.source == '*' or len(field.source_attrs) != 1:
+        return _generic_reader(field)
+
+    attr = field.source_attrs[0]
+    model_field = _model_field(field.parent, attr)
+    if model_field is None:
+        return _generic_reader(field)
+
+    if isinstance(field, serializers.ListSerializer):
+        child = field.child
+
+        def read_many(instance):
+            value = getattr(instance, attr)
+            iterable = value.all() if isinstance(value, models.Manager) else value
+            return [child.to_representation(item) for item in iterable]
+        return read_many
+    if isinstance(field, serializers.BaseSerializer):
+        if model_field.many_to_one:
+            return _related_reader(model_field.attname, attr, field.to_representation)
+        return _attribute_reader(attr, field.to_representation)
+    if type(field) is relations.PrimaryKeyRelatedField and field.pk_field is None and model_field.many_to_one:
+        return _attribute_reader(model_field.attname, _identity)
+
+    if type(field) is drf_fields.DateTimeField:
+        convert = _datetime_converter(field)
+    elif type(field) is drf_fields.ChoiceField:
+        convert = _choice_converter(field)
+    else:
+        convert = SIMPLE_CONVERTERS.get(type(field))
+    if convert is None:
+        return _generic_reader(field)
+    return _attribute_reader(attr, convert)
+
+
+class CompiledReadMixin:
+    """
+    Serializer con to_representation compilado (ver el módulo).
+
+    La escritura y validación siguen siendo las de DRF. Para ajustar la salida
+    se sobrescribe finalize_representation en lugar de to_representation.
+    Con compiled_read = False se usa la ruta genérica de DRF (comparaciones).
+    """
+    compiled_read = True
+
+    @property
+    def compiled_readers(self):
+        readers = self.__dict__.get('_compiled_readers')
+        if readers is None:
+            readers = [(field.field_name, compile_field(field)) for field in self._readable_fields]
+            self.__dict__['_compiled_readers'] = readers
+        return readers
+
+    def finalize_representation(self, instance, data):
+        return data
+
+    def to_representation(self, instance):
+        if not self.compiled_read:
+            return self.finalize_representation(instance, super().to_representation(instance))
+        data = {}
+        for name, read in self.compiled_readers:
+            value = read(instance)
+            if value is not SKIP:
+                data[name] = value
+        return self.finalize_representation(instance, data)
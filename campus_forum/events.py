@@ -0,0 +1,181 @@
+"""
+Pub/sub en proceso para los streams de Server-Sent Events (ver campus_forum.sse).
+
+Las escrituras (señales de comentarios y posts, moderación) publican eventos en
+canales ('post:<id>', 'category:<id>') cuando se confirma la transacción. Cada
+evento se codifica una sola vez en formato SSE y se guarda en un buffer
+circular acotado, de donde se reenvía lo perdido a un cliente que se reconecta
+con Last-Event-ID.
+
+Los suscriptores viven en el event loop del servidor ASGI y las publicaciones
+llegan desde los hilos donde corren las vistas síncronas, así que la entrega se
+programa con call_soon_threadsafe (una llamada por loop, no por cliente). La
+cola de cada suscriptor es acotada: si un cliente lento la llena se le cierra
+el stream y, al reconectarse, recupera lo pendiente desde el buffer.
+
+Es por proceso: con varios workers, cada uno solo emite los eventos de las
+escrituras que atendió.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+_local = threading.local()
+
+# Centinela que termina el stream de un suscriptor cerrado
+CLOSED = object()
+
+
+def post_channel(post_id):
+    return f'post:{post_id}'
+
+
+def category_channel(category_id):
+    return f'category:{category_id}'
+
+
+def encode_event(event_id, event, data):
+    """Mensaje SSE (el JSON no lleva saltos de línea, así que cabe en una línea data:)"""
+    payload = DjangoJSONEncoder(ensure_ascii=False).encode(data)
+    return f'id: {event_id}\nevent: {event}\ndata: {payload}\n\n'.encode()
+
+
+class Subscription:
+    """Un cliente conectado: cola acotada que se consume en el loop del servidor"""
+
+    def __init__(self, channel, loop, maxsize):
+        self.channel = channel
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def deliver(self, payload):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.close()
+
+    def close(self):
+        """Descartar lo pendiente y terminar el stream (el cliente reanuda con Last-Event-ID)"""
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(CLOSED)
+
+
+def _fanout(subscriptions, payload):
+    for subscription in subscriptions:
+        subscription.deliver(payload)
+
+
+class EventBroker:
+    """
+    Canales en memoria con buffer circular para reanudar.
+
+    Los ids de evento son crecientes y se basan en el reloj (microsegundos),
+    así que no se repiten tras un reinicio. `horizon` es el id a partir del
+    cual el buffer está completo: un Last-Event-ID anterior (eventos ya
+    descartados o de antes de iniciar el proceso) recibe un evento `reset`
+    para que el cliente recargue por la API.
+    """
+
+    def __init__(self, buffer_size, queue_size):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._buffer = deque(maxlen=buffer_size)
+        self._subscribers = {}
+        self._last_id = self._horizon = time.time_ns() // 1000
+
+    def publish(self, channels, event, data):
+        by_loop = {}
+        with self._lock:
+            event_id = self._last_id = max(self._last_id + 1, time.time_ns() // 1000)
+            payload = encode_event(event_id, event, data)
+            if len(self._buffer) == self._buffer.maxlen:
+                self._horizon = self._buffer[0][0]
+            self._buffer.append((event_id, channels, payload))
+            for channel in channels:
+                for subscription in self._subscribers.get(channel, ()):
+                    by_loop.setdefault(subscription.loop, []).append(subscription)
+
+        for loop, subscriptions in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_fanout, subscriptions, payload)
+            except RuntimeError:
+                # Loop cerrado (el servidor se está deteniendo)
+                pass
+        return event_id
+
+    def subscribe(self, channel, last_event_id=None):
+        """
+        Registrar un suscriptor en el loop actual.
+
+        Devuelve la suscripción y los mensajes iniciales: lo perdido desde
+        last_event_id (o `reset`) y el id actual, para que el cliente tenga
+        desde dónde reanudar aunque no llegue ningún evento.
+        """
+        subscription = Subscription(channel, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            backlog = []
+            if last_event_id is not None:
+                if last_event_id < self._horizon:
+                    backlog.append(encode_event(self._last_id, 'reset', {}))
+                else:
+                    backlog.extend(
+                        payload for event_id, channels, payload in self._buffer
+                        if event_id > last_event_id and channel in channels
+                    )
+            backlog.append(f'id: {self._last_id}\n\n'.encode())
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription, backlog
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+
+broker = EventBroker(settings.EVENT_BUFFER_SIZE, settings.EVENT_QUEUE_SIZE)
+
+
+@contextmanager
+def event_reason(reason):
+    """Marcar los eventos publicados en el bloque (p. ej. 'report' al resolver un reporte)"""
+    previous = getattr(_local, 'reason', None)
+    _local.reason = reason
+    try:
+        yield
+    finally:
+        _local.reason = previous
+
+
+def publish_event(channels, event, data):
+    """
+    Publicar al confirmarse la transacción en curso (nada si se revierte).
+
+    `data` puede ser una función: se evalúa al confirmar, con el estado final.
+    """
+    reason = getattr(_local, 'reason', None)
+
+    def send():
+        payload = data() if callable(data) else dict(data)
+        if reason:
+            payload['reason'] = reason
+        broker.publish(tuple(channels), event, payload)
+    transaction.on_commit(send)
@@ -0,0 +1,55 @@
+"""
+HyperLogLog: cardinalidad aproximada en un bloque de tamaño fijo.
+
+Con PRECISION = 10 son 1024 registros de un byte (1 KB por boceto) y un error
+típico de ~3,2 % (1,04 / sqrt(1024)). Dos bocetos se combinan tomando el
+máximo de cada registro, así que la unión de días o de procesos se estima sin
+guardar los visitantes.
+"""
+import hashlib
+import math
+import numpy as np
+
+PRECISION = 10
+REGISTERS = 1 << PRECISION
+HASH_BITS = 64
+ALPHA = 0.7213 / (1 + 1.079 / REGISTERS)
+
+
+def hash_value(value):
+    """Hash de 64 bits estable entre procesos (hash() de Python no lo es)"""
+    return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+
+class HyperLogLog:
+    def __init__(self, registers=None):
+        self.registers = bytearray(registers) if registers else bytearray(REGISTERS)
+        if len(self.registers) != REGISTERS:
+            raise ValueError(f'Un boceto tiene {REGISTERS} registros, no {len(self.registers)}')
+
+    def add(self, value):
+        hashed = hash_value(value)
+        index = hashed >> (HASH_BITS - PRECISION)
+        rest = hashed & ((1 << (HASH_BITS - PRECISION)) - 1)
+        # Posición del primer bit en 1 de los bits restantes
+        rank = HASH_BITS - PRECISION - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        merged = np.maximum(np.frombuffer(self.registers, dtype=np.uint8),
+                            np.frombuffer(bytes(other.registers), dtype=np.uint8))
+        self.registers = bytearray(merged.tobytes())
+        return self
+
+    def count(self):
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        estimate = ALPHA * REGISTERS * REGISTERS / np.sum(np.exp2(-registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(registers == 0))
+        if estimate <= 2.5 * REGISTERS and zeros:
+            # Rango bajo: conteo lineal sobre los registros vacíos
+            estimate = REGISTERS * math.log(REGISTERS / zeros)
+        return int(round(estimate))
+
+    def __bytes__(self):
+        return bytes(self.registers)
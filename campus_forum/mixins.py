@@ -0,0 +1,114 @@
+import hashlib
+from datetime import datetime
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+from .cache import get_generation
+
+
+class ConditionalRetrieveMixin:
+    """
+    GET condicional para retrieve (ETag fuerte + Last-Modified).
+
+    `conditional_fields` son las columnas que versionan la representación.
+    Se leen con una sola consulta por clave primaria antes de serializar; si el
+    cliente ya tiene esa versión (If-None-Match / If-Modified-Since) se responde
+    304 sin cargar relaciones ni serializar.
+
+    `conditional_generations` suma a la versión generaciones de caché (ver
+    campus_forum.cache) para datos derivados que no conviene calcular solo
+    para decidir un 304, como un COUNT sobre otra tabla.
+
+    Last-Modified solo se envía si todas esas columnas son fechas y no hay
+    generaciones: un contador (comments_count) cambia la versión sin cambiar
+    ninguna fecha y un If-Modified-Since respondería 304 con datos viejos.
+    """
+    conditional_fields = ('updated_at',)
+    conditional_generations = ()
+
+    def get_conditional_queryset(self):
+        return self.get_queryset().select_related(None).prefetch_related(None)
+
+    def get_validators(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            rows = self.get_conditional_queryset().filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values(*self.conditional_fields).order_by()[:1]
+            row = next(iter(rows), None)
+        except (ValueError, TypeError, ValidationError):
+            # Clave mal formada (/posts/abc/): get_object responde 404
+            return None, None
+        if row is None:
+            return None, None
+
+        version = '|'.join(
+            [str(row[field]) for field in self.conditional_fields]
+            + [str(get_generation(name)) for name in self.conditional_generations]
+        )
+        etag = quote_etag(hashlib.md5(version.encode()).hexdigest())
+        values = list(row.values())
+        last_modified = None
+        if not self.conditional_generations and all(isinstance(value, datetime) for value in values):
+            last_modified = int(max(values).timestamp())
+        return etag, last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            # No existe, no es visible o la clave no es válida: retrieve responde 404 como siempre
+            return super().retrieve(request, *args, **kwargs)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+def explain_queryset(queryset, analyze=False):
+    """SQL final (con parámetros) y plan de ejecución de un queryset"""
+    connection = connections[queryset.db]
+    sql, params = queryset.query.sql_with_params()
+    if hasattr(connection.ops, 'compose_sql'):
+        sql = connection.ops.compose_sql(sql, params)
+    else:
+        sql = sql % tuple(repr(param) for param in params)
+    options = {'analyze': True} if analyze else {}
+    return {
+        'sql': sql,
+        'plan': queryset.explain(**options).splitlines(),
+    }
+
+
+class QueryExplainMixin:
+    """
+    Modo de depuración para listados: ?explain=1 (o ?explain=analyze).
+
+    Devuelve la consulta que generan los filtros de la vista (con el LIMIT de
+    la primera página) y su EXPLAIN, en lugar de los resultados. Solo para
+    administradores autenticados, también con DEBUG (que viene activo por
+    defecto): el plan expone tablas, índices y volúmenes de datos.
+    """
+    explain_query_param = 'explain'
+
+    def explain_requested(self):
+        value = self.request.query_params.get(self.explain_query_param)
+        if not value:
+            return False
+        user = self.request.user
+        return user.is_authenticated and user.role == 'ADMIN'
+
+    def list(self, request, *args, **kwargs):
+        if not self.explain_requested():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page_size = self.paginator.get_page_size(request) if self.paginator else None
+        if page_size:
+            queryset = queryset[:page_size]
+        analyze = request.query_params.get(self.explain_query_param) == 'analyze'
+        return Response(explain_queryset(queryset, analyze=analyze))
@@ -0,0 +1,273 @@
+import base64
+import hashlib
+import json
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre columnas ordenadas de forma descendente.
+
+    En lugar de OFFSET n + COUNT(*), cada página filtra a partir de la última fila
+    vista, por lo que el costo es el mismo sin importar qué tan profundo se navegue.
+    Los cursores son opacos y la respuesta no incluye el total.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE', 10)
+    page_size_query_param = settings.REST_FRAMEWORK.get('PAGE_SIZE_QUERY_PARAM', 'page_size')
+    max_page_size = settings.REST_FRAMEWORK.get('MAX_PAGE_SIZE', 100)
+    invalid_cursor_message = 'Cursor inválido'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @property
+    def fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def encode_cursor(self, instance, reverse):
+        values = [getattr(instance, field) for field in self.fields]
+        payload = json.dumps({'r': int(reverse), 'v': values}, default=str)
+        token = base64.urlsafe_b64encode(payload.encode()).decode()
+        url = remove_query_param(self.base_url, 'page')
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, model):
+        """(retroceder, valores) del cursor, convertidos con el to_python de cada campo"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            reverse, values = bool(payload['r']), payload['v']
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            values = [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+            if any(value is None for value in values):
+                raise ValueError
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, values
+
+    def keyset_filter(self, values, reverse):
+        """(f0, f1, ...) < (v0, v1, ...) en orden descendente, o > al retroceder"""
+        lookup = 'gt' if reverse else 'lt'
+        condition = Q()
+        for position, field in enumerate(self.fields):
+            equal = {name: values[i] for i, name in enumerate(self.fields[:position])}
+            condition |= Q(**equal, **{f'{field}__{lookup}': values[position]})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = cursor is not None and cursor[0]
+
+        if reverse:
+            queryset = queryset.order_by(*[field.lstrip('-') for field in self.ordering])
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if cursor is not None:
+            values = cursor[1]
+            # Acotar primero por la columna principal para aprovechar su índice
+            leading = {f'{self.fields[0]}__{"gte" if reverse else "lte"}': values[0]}
+            queryset = queryset.filter(**leading).filter(self.keyset_filter(values, reverse))
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = results
+        return results
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+def planner_estimate(queryset):
+    """Filas que estima PostgreSQL para el queryset (sin ejecutarlo)"""
+    connection = connections[queryset.db]
+    if not queryset.query.where and not queryset.query.distinct:
+        # Tabla completa: la estadística de pg_class es suficiente (-1 si nunca se analizó)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return row[0]
+    plan = json.loads(queryset.explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def cached_count(queryset):
+    """
+    Total de filas del queryset como (total, es_estimación).
+
+    Se cachea por la consulta SQL normalizada (mismos filtros y visibilidad,
+    sin orden) durante PAGINATION_COUNT_CACHE_TIMEOUT segundos. En PostgreSQL,
+    si el planificador estima más de PAGINATION_ESTIMATE_THRESHOLD filas se usa
+    la estimación en lugar de COUNT(*).
+    """
+    queryset = queryset.order_by()
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(repr((queryset.db, sql, params)).encode()).hexdigest()
+    key = f'pagination:count:{digest}'
+    result = cache.get(key)
+    if result is None:
+        result = (None, False)
+        if connections[queryset.db].vendor == 'postgresql':
+            estimate = planner_estimate(queryset)
+            if estimate >= settings.PAGINATION_ESTIMATE_THRESHOLD:
+                result = (estimate, True)
+        if result[0] is None:
+            result = (queryset.count(), False)
+        cache.set(key, result, settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return result
+
+
+class WindowPage(Page):
+    """Página que sabe si hay otra después por la fila extra que se leyó, no por el total"""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self.more = has_next
+
+    def has_next(self):
+        return self.more
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator de Django cuyo total sale de cached_count.
+
+    El total (estimado o cacheado) solo se muestra: la validez de la página y
+    si hay una siguiente se deciden leyendo page_size + 1 filas, así un total
+    desactualizado no produce páginas vacías con enlace `next` ni 404 en
+    páginas que existen.
+    """
+
+    @cached_property
+    def count_result(self):
+        if hasattr(self.object_list, 'query'):
+            return cached_count(self.object_list)
+        return len(self.object_list), False
+
+    @cached_property
+    def count(self):
+        return self.count_result[0]
+
+    @property
+    def count_is_estimate(self):
+        return self.count_result[1]
+
+    def validate_number(self, number):
+        """Entero mayor que cero; el límite superior no se conoce sin contar"""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('El número de página no es un entero')
+        if number < 1:
+            raise EmptyPage('El número de página es menor que 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('La página no contiene resultados')
+        return WindowPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Paginación por número de página con totales baratos.
+
+    El total se cachea por conjunto de filtros y, en tablas grandes, es una
+    estimación del planificador; la respuesta lo indica con `count_is_estimate`.
+    `next` y las páginas válidas no dependen de él (ver EstimatedCountPaginator).
+    Respeta PAGE_SIZE_QUERY_PARAM y MAX_PAGE_SIZE de REST_FRAMEWORK.
+    """
+    django_paginator_class = EstimatedCountPaginator
+    page_size_query_param = settings.REST_FRAMEWORK.get('PAGE_SIZE_QUERY_PARAM', 'page_size')
+    max_page_size = settings.REST_FRAMEWORK.get('MAX_PAGE_SIZE', 100)
+
+    def get_page_number(self, request, paginator):
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if page_number in self.last_page_strings:
+            # La última página exige el total exacto, no el estimado
+            page_number = max(1, -(-paginator.object_list.count() // paginator.per_page))
+        return page_number
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_estimate', self.page.paginator.count_is_estimate),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        response = super().get_paginated_response_schema(schema)
+        response['properties']['count_is_estimate'] = {'type': 'boolean', 'example': False}
+        return response
@@ -0,0 +1,70 @@
+"""
+Render de contenido al momento de escribir.
+
+El texto que escriben los usuarios (markdown) se convierte una sola vez a HTML
+saneado, extracto de texto plano y tiempo estimado de lectura; las lecturas
+devuelven estas columnas sin procesar texto por petición.
+"""
+import html
+import math
+import markdown
+import nh3
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+MARKDOWN_EXTENSIONS = ['fenced_code', 'tables', 'sane_lists', 'nl2br']
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'del', 'em', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'hr', 'i', 'img', 'li', 'ol', 'p', 'pre', 'strong', 'table',
+    'tbody', 'td', 'th', 'thead', 'tr', 'ul',
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'img': {'src', 'alt', 'title'},
+    'td': {'align'},
+    'th': {'align'},
+}
+URL_SCHEMES = {'http', 'https', 'mailto'}
+
+# Campos que produce render_content (mismos nombres que las columnas de los modelos)
+RENDERED_FIELDS = ('content_html', 'excerpt', 'reading_time')
+
+
+def render_html(text):
+    """Markdown a HTML sin etiquetas ni atributos peligrosos"""
+    raw = markdown.markdown(text or '', extensions=MARKDOWN_EXTENSIONS, output_format='html')
+    return nh3.clean(
+        raw,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes=URL_SCHEMES,
+        link_rel='nofollow noopener noreferrer',
+    )
+
+
+def plain_text(content_html):
+    """Texto plano con espacios normalizados a partir del HTML saneado"""
+    text = html.unescape(nh3.clean(content_html.replace('<', ' <'), tags=set()))
+    return ' '.join(text.split())
+
+
+def render_content(text, excerpt_length=EXCERPT_LENGTH):
+    """HTML saneado, extracto y minutos de lectura de un texto markdown"""
+    content_html = render_html(text)
+    text = plain_text(content_html)
+    words = len(text.split())
+    return {
+        'content_html': content_html,
+        'excerpt': Truncator(text).chars(excerpt_length),
+        'reading_time': max(1, math.ceil(words / WORDS_PER_MINUTE)) if words else 0,
+    }
+
+
+def apply_rendered_content(instance, source='content'):
+    """Asignar los campos renderizados a una instancia (admin, comandos, semillas)"""
+    for field, value in render_content(getattr(instance, source)).items():
+        setattr(instance, field, value)
+    return instance
@@ -0,0 +1,76 @@
+from rest_framework import permissions, serializers
+from .rendering import render_content
+
+
+def parse_field_list(value):
+    """Convertir 'a,b, c' en {'a', 'b', 'c'}"""
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """
+    Campos dispersos para serializers de nivel superior.
+
+    - ?fields=id,title devuelve solo esos campos.
+    - ?expand=author,category sustituye las relaciones declaradas en
+      Meta.expandable_fields (que por defecto se devuelven como id) por el
+      serializer anidado correspondiente.
+
+    Los serializers anidados no se ven afectados. ?fields= solo se aplica en
+    lecturas (GET/HEAD/OPTIONS): en una escritura quitaría campos escribibles y
+    sus valores se descartarían sin error.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def is_top_level(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+    def get_expanded_fields(self):
+        request = self.context.get('request')
+        if request is None or not self.is_top_level():
+            return set()
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        return parse_field_list(request.query_params.get(self.expand_query_param)) & set(expandable)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or not self.is_top_level():
+            return fields
+
+        expandable = getattr(self.Meta, 'expandable_fields', {})
+        for name in self.get_expanded_fields():
+            fields[name] = expandable[name](read_only=True)
+
+        if request.method not in permissions.SAFE_METHODS:
+            return fields
+        requested = parse_field_list(request.query_params.get(self.fields_query_param))
+        if requested:
+            for name in list(fields):
+                if name not in requested and not fields[name].write_only:
+                    fields.pop(name)
+        return fields
+
+
+class RenderedContentMixin:
+    """
+    Renderizar el contenido markdown al guardar.
+
+    Cuando la escritura trae `rendered_source_field`, se agregan a los datos
+    validados el HTML saneado, el extracto y el tiempo de lectura, de modo que se
+    guardan en el mismo INSERT/UPDATE que el contenido.
+    """
+    rendered_source_field = 'content'
+
+    def add_rendered_content(self, validated_data):
+        if self.rendered_source_field in validated_data:
+            validated_data.update(render_content(validated_data[self.rendered_source_field]))
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self.add_rendered_content(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self.add_rendered_content(validated_data))
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third party
     'rest_framework',
     'rest_framework_simplejwt',
@@ -101,6 +102,49 @@ DATABASES = {
     }
 }
 
+# Cache
+# Por defecto en memoria local (sin servicios externos). Con varios workers usar
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache y una ruta
+# compartida en CACHE_LOCATION para que la invalidación llegue a todos.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'campus-forum'),
+    }
+}
+
+# Segundos que vive una respuesta cacheada del feed público de posts
+FEED_CACHE_TIMEOUT = int(os.getenv('FEED_CACHE_TIMEOUT', '300'))
+
+# Tendencias: vida media del puntaje "hot" y ventana que considera la compactación
+TRENDING_HALF_LIFE_HOURS = float(os.getenv('TRENDING_HALF_LIFE_HOURS', '24'))
+TRENDING_WINDOW_DAYS = int(os.getenv('TRENDING_WINDOW_DAYS', '7'))
+
+# Totales de la paginación: segundos que se cachea cada conteo y número de filas
+# estimadas a partir del cual se usa la estimación del planificador en vez de COUNT(*)
+PAGINATION_COUNT_CACHE_TIMEOUT = int(os.getenv('PAGINATION_COUNT_CACHE_TIMEOUT', '30'))
+PAGINATION_ESTIMATE_THRESHOLD = int(os.getenv('PAGINATION_ESTIMATE_THRESHOLD', '10000'))
+
+# Sincronización incremental de comentarios: días que se conservan los registros
+# de comentarios eliminados (un cursor más antiguo obliga a recargar)
+COMMENT_TOMBSTONE_RETENTION_DAYS = int(os.getenv('COMMENT_TOMBSTONE_RETENTION_DAYS', '7'))
+
+# Server-Sent Events (campus_forum.sse): eventos recientes que se conservan para
+# reanudar con Last-Event-ID, eventos pendientes por cliente antes de cerrarle el
+# stream, intervalo del latido y segundos que puede tardar un envío
+EVENT_BUFFER_SIZE = int(os.getenv('EVENT_BUFFER_SIZE', '2000'))
+EVENT_QUEUE_SIZE = int(os.getenv('EVENT_QUEUE_SIZE', '100'))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv('EVENT_HEARTBEAT_SECONDS', '15'))
+EVENT_SEND_TIMEOUT = float(os.getenv('EVENT_SEND_TIMEOUT', '10'))
+# Segundos que vale un token de /api/auth/stream-token/ para abrir un stream
+STREAM_TOKEN_SECONDS = int(os.getenv('STREAM_TOKEN_SECONDS', '60'))
+
+# Visitas de posts (posts.view_counter): segundos entre escrituras del buffer de
+# cada proceso (0: sin hilo, solo al salir) y pares (post, día) pendientes que
+# adelantan la escritura
+VIEW_FLUSH_SECONDS = float(os.getenv('VIEW_FLUSH_SECONDS', '5'))
+VIEW_BUFFER_MAX_KEYS = int(os.getenv('VIEW_BUFFER_MAX_KEYS', '5000'))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -162,7 +206,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'campus_forum.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 10,
     'PAGE_SIZE_QUERY_PARAM': 'page_size',
     'MAX_PAGE_SIZE': 100,
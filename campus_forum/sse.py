@@ -0,0 +1,177 @@
+"""
+Streams de Server-Sent Events servidos directamente sobre ASGI.
+
+- GET /api/stream/posts/<id>/: comentarios nuevos o eliminados y cambios de
+  estado del post. Requiere token.
+- GET /api/stream/categories/<id>/: posts de la categoría publicados,
+  archivados o eliminados. Público, como el listado de posts.
+
+Autenticación: el token de acceso en Authorization o, desde un navegador
+(EventSource no permite cabeceras propias), un token de stream en ?token=. El
+JWT nunca va en la URL, que queda en los logs de acceso: POST
+/api/auth/stream-token/ entrega un token firmado que solo abre streams y vale
+STREAM_TOKEN_SECONDS. En ambos casos el stream se cierra cuando expira el token
+de acceso; el navegador se reconecta solo y, con un token nuevo, reanuda con
+Last-Event-ID (cabecera, o ?lastEventId= si hay que reabrir el EventSource).
+
+Es una aplicación ASGI propia que envuelve a la de Django, no una vista: Django
+4.2 no atiende http.disconnect durante una respuesta en streaming y un cliente
+desconectado quedaría suscrito para siempre. Cada conexión inactiva cuesta una
+suscripción y dos corrutinas en espera (la cola y la desconexión), sin hilos.
+
+Se sirve con un servidor ASGI, por ejemplo:
+    uvicorn campus_forum.asgi:application
+    gunicorn campus_forum.asgi:application -k uvicorn.workers.UvicornWorker
+"""
+import asyncio
+import re
+import time
+from urllib.parse import parse_qs
+from django.conf import settings
+from django.core import signing
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+from .events import CLOSED, broker, category_channel, post_channel
+
+STREAM_PATH = re.compile(r'^/api/stream/(?P<kind>posts|categories)/(?P<object_id>\d+)/?$')
+STREAM_CHANNELS = {
+    'posts': post_channel,
+    'categories': category_channel,
+}
+# Streams que exigen token (los comentarios solo se listan autenticado)
+AUTHENTICATED_STREAMS = {'posts'}
+
+RETRY_MILLISECONDS = 3000
+HEARTBEAT = b': ping\n\n'
+STREAM_TOKEN_SALT = 'campus_forum.sse.stream-token'
+
+
+def issue_stream_token(user, access_token):
+    """Token firmado para ?token=: abre streams hasta que expira el token de acceso"""
+    return signing.dumps({'user': user.pk, 'exp': access_token['exp']}, salt=STREAM_TOKEN_SALT)
+
+
+def read_stream_token(token):
+    """Expiración del token de acceso de origen; signing.BadSignature si no es válido o venció"""
+    return signing.loads(token, salt=STREAM_TOKEN_SALT, max_age=settings.STREAM_TOKEN_SECONDS)['exp']
+
+
+def cors_headers(origin):
+    if getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False):
+        return [(b'access-control-allow-origin', b'*')]
+    if origin and origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', []):
+        return [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+    return []
+
+
+def parse_event_id(value):
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+async def wait_for_disconnect(receive, subscription):
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            subscription.close()
+            return
+
+
+class EventStreamApplication:
+    """Atiende /api/stream/... y delega todo lo demás en la aplicación de Django"""
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            match = STREAM_PATH.match(scope['path'])
+            if match:
+                return await self.stream(scope, receive, send, match['kind'], int(match['object_id']))
+        return await self.application(scope, receive, send)
+
+    async def respond(self, send, status, message, headers):
+        body = f'{{"error": "{message}"}}'.encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers + [(b'content-type', b'application/json')],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def stream(self, scope, receive, send, kind, object_id):
+        headers = {name.decode('latin-1'): value.decode('latin-1') for name, value in scope['headers']}
+        query = {name: values[-1] for name, values in parse_qs(scope.get('query_string', b'').decode()).items()}
+        response_headers = cors_headers(headers.get('origin'))
+        if scope['method'] != 'GET':
+            return await self.respond(send, 405, 'Método no permitido', response_headers)
+
+        authorization = headers.get('authorization', '')
+        expires_at = None
+        try:
+            if authorization.startswith('Bearer '):
+                expires_at = AccessToken(authorization[len('Bearer '):])['exp']
+            elif query.get('token'):
+                expires_at = read_stream_token(query['token'])
+        except (TokenError, KeyError, signing.BadSignature):
+            return await self.respond(send, 401, 'Token inválido o expirado', response_headers)
+        if expires_at is None and kind in AUTHENTICATED_STREAMS:
+            return await self.respond(send, 401, 'Se requiere autenticación', response_headers)
+
+        last_event_id = parse_event_id(headers.get('last-event-id') or query.get('lastEventId'))
+        subscription, backlog = broker.subscribe(STREAM_CHANNELS[kind](object_id), last_event_id)
+        watcher = asyncio.ensure_future(wait_for_disconnect(receive, subscription))
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': 200,
+                'headers': response_headers + [
+                    (b'content-type', b'text/event-stream; charset=utf-8'),
+                    (b'cache-control', b'no-cache'),
+                    # Que los proxies (nginx) no acumulen la respuesta
+                    (b'x-accel-buffering', b'no'),
+                ],
+            })
+            await self.send_body(send, f'retry: {RETRY_MILLISECONDS}\n'.encode() + b''.join(backlog))
+            await self.relay(send, subscription, expires_at)
+            await self.send_body(send, b'', more_body=False)
+        except asyncio.TimeoutError:
+            # El cliente no consume lo que se le envía: se abandona la conexión
+            pass
+        finally:
+            watcher.cancel()
+            broker.unsubscribe(subscription)
+
+    async def relay(self, send, subscription, expires_at):
+        queue = subscription.queue
+        while True:
+            timeout = settings.EVENT_HEARTBEAT_SECONDS
+            if expires_at is not None:
+                timeout = min(timeout, expires_at - time.time())
+                if timeout <= 0:
+                    return
+            try:
+                payload = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                payload = HEARTBEAT
+            if payload is CLOSED:
+                return
+
+            # Lo que se acumuló mientras se enviaba lo anterior sale en un solo envío
+            chunks = [payload]
+            while not queue.empty():
+                payload = queue.get_nowait()
+                if payload is CLOSED:
+                    await self.send_body(send, b''.join(chunks))
+                    return
+                chunks.append(payload)
+            await self.send_body(send, b''.join(chunks))
+
+    async def send_body(self, send, body, more_body=True):
+        # El servidor ASGI espera a que se vacíe el buffer del socket: acotar esa espera
+        await asyncio.wait_for(
+            send({'type': 'http.response.body', 'body': body, 'more_body': more_body}),
+            settings.EVENT_SEND_TIMEOUT
+        )
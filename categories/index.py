@@ -0,0 +1,69 @@
+import copy
+import threading
+from django.db.models import Count, Q
+from campus_forum.cache import bump_generation, get_generation
+
+CATEGORY_GENERATION = 'categories'
+
+
+def bump_category_generation():
+    """Marcar la instantánea de categorías como desactualizada en todos los procesos"""
+    return bump_generation(CATEGORY_GENERATION)
+
+
+class CategoryIndex:
+    """
+    Instantánea en memoria de las categorías y sus posts publicados.
+
+    Las instancias se comparten entre hilos y solo se leen: quien necesite
+    asignarlas a otro modelo recibe una copia (ver `get`).
+    """
+
+    def __init__(self, categories):
+        self.categories = categories
+        self.by_id = {category.pk: category for category in categories}
+
+    @classmethod
+    def build(cls):
+        from .models import Category
+        # Con GROUP BY Django no aplica Meta.ordering: el orden se pide explícito
+        return cls(list(Category.objects.annotate(
+            posts_count_annotated=Count('posts', filter=Q(posts__status='PUBLISHED'))
+        ).order_by(*Category._meta.ordering)))
+
+    def all(self, exclude_status=None, status=None):
+        """Categorías en el orden del modelo (por nombre), filtradas por estado"""
+        return [
+            category for category in self.categories
+            if (status is None or category.status == status)
+            and (exclude_status is None or category.status != exclude_status)
+        ]
+
+    def get(self, category_id, status=None):
+        """Copia independiente de la categoría (None si no existe o no tiene ese estado)"""
+        category = self.by_id.get(category_id)
+        if category is None or (status is not None and category.status != status):
+            return None
+        # Model.__getstate__ copia también _state: la copia no comparte cachés
+        category = copy.copy(category)
+        del category.posts_count_annotated
+        return category
+
+    def posts_count(self, category_id):
+        category = self.by_id.get(category_id)
+        return category.posts_count_annotated if category is not None else 0
+
+
+_lock = threading.Lock()
+_state = {'generation': None, 'index': None}
+
+
+def get_category_index():
+    """Índice del proceso, reconstruido de forma perezosa cuando cambia la generación"""
+    generation = get_generation(CATEGORY_GENERATION)
+    if _state['index'] is None or _state['generation'] != generation:
+        with _lock:
+            if _state['index'] is None or _state['generation'] != generation:
+                _state['index'] = CategoryIndex.build()
+                _state['generation'] = generation
+    return _state['index']
@@ -1,13 +1,20 @@
 from rest_framework import serializers
+from campus_forum.compiled import CompiledReadMixin
+from .index import get_category_index
 from .models import Category
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(CompiledReadMixin, serializers.ModelSerializer):
     posts_count = serializers.SerializerMethodField()
     
     def get_posts_count(self, obj):
-        # Usar el valor annotado si existe, sino usar la propiedad del modelo
-        return getattr(obj, 'posts_count_annotated', getattr(obj, 'posts_count', obj.posts.filter(status='PUBLISHED').count()))
+        # Usar el valor annotado si existe, sino la instantánea del proceso
+        # (una sola por respuesta: se guarda en el contexto compartido)
+        if hasattr(obj, 'posts_count_annotated'):
+            return obj.posts_count_annotated
+        if 'category_index' not in self.context:
+            self.context['category_index'] = get_category_index()
+        return self.context['category_index'].posts_count(obj.pk)
     
     class Meta:
         model = Category
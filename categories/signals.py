@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from posts.caching import bump_feed_generation
+from .index import bump_category_generation
+from .models import Category
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_feed_on_category_change(sender, instance, **kwargs):
+    """El feed anida la categoría de cada post (nombre, estado); también la instantánea del proceso"""
+    bump_feed_generation()
+    bump_category_generation()
@@ -1,3 +1,89 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from accounts.models import User
+from posts.models import Post
+from .models import Category
 
-# Create your tests here.
+
+class CategoryIndexTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.anonymous = APIClient()
+        self.admin = User.objects.create_user(
+            email='admin@campus.edu', password='clave-segura', first_name='Ana', last_name='Admin', role='ADMIN'
+        )
+        self.client.force_authenticate(self.admin)
+        self.category = Category.objects.create(name='General', created_by=self.admin)
+
+    def listing(self):
+        response = self.anonymous.get('/api/categories/')
+        self.assertEqual(response.status_code, 200)
+        categories = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [(category['name'], category['posts_count']) for category in categories]
+
+    def test_snapshot_is_reused(self):
+        self.assertEqual(self.listing(), [('General', 0)])
+        # update() no dispara señales: la instantánea sigue vigente y no hay consultas
+        Category.objects.update(name='Cambio sin señal')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.listing(), [('General', 0)])
+
+    def test_create_and_update_invalidate(self):
+        self.assertEqual(self.listing(), [('General', 0)])
+
+        response = self.client.post('/api/categories/', {'name': 'Avisos', 'description': 'Avisos del campus'})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(self.listing(), [('Avisos', 0), ('General', 0)])
+
+        response = self.client.patch(f'/api/categories/{self.category.pk}/', {'name': 'Preguntas'})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.listing(), [('Avisos', 0), ('Preguntas', 0)])
+
+        self.assertEqual(self.client.patch(f'/api/categories/{self.category.pk}/archive/').status_code, 200)
+        self.assertEqual(self.listing(), [('Avisos', 0)])
+
+    def test_posts_count_follows_publication(self):
+        post = Post.objects.create(
+            title='Post de prueba', content='Contenido de prueba con suficiente longitud.',
+            category=self.category, author=self.admin, status=Post.Status.DRAFT
+        )
+        self.assertEqual(self.listing(), [('General', 0)])
+        post.status = Post.Status.PUBLISHED
+        post.save()
+        self.assertEqual(self.listing(), [('General', 1)])
+        post.delete()
+        self.assertEqual(self.listing(), [('General', 0)])
+
+
+class ConditionalCategoryTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email='admin@campus.edu', password='clave-segura', first_name='Ana', last_name='Admin', role='ADMIN'
+        )
+        self.category = Category.objects.create(name='General', created_by=self.admin)
+        self.url = f'/api/categories/{self.category.pk}/'
+
+    def test_not_modified_without_counting_posts(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries[0]['sql'])
+
+        # Publicar un post cambia posts_count sin tocar updated_at de la categoría
+        Post.objects.create(
+            title='Post de prueba', content='Contenido de prueba con suficiente longitud.',
+            category=self.category, author=self.admin, status=Post.Status.PUBLISHED
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['posts_count'], 1)
+        self.assertNotEqual(response['ETag'], etag)
@@ -1,15 +1,22 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.db.models import Count, Q
+from campus_forum.mixins import ConditionalRetrieveMixin
+from .index import CATEGORY_GENERATION, get_category_index
 from .models import Category
 from .serializers import CategorySerializer
 from .permissions import IsAdminOrProfessor
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = CategorySerializer
+    # posts_count cambia con cada post publicado o eliminado: en lugar de contar
+    # para decidir un 304, la versión usa la generación de la instantánea
+    conditional_fields = ('updated_at',)
+    conditional_generations = (CATEGORY_GENERATION,)
     queryset = Category.objects.annotate(
         posts_count_annotated=Count('posts', filter=Q(posts__status='PUBLISHED'))
     )
@@ -24,18 +31,43 @@ class CategoryViewSet(viewsets.ModelViewSet):
             return [IsAdminOrProfessor()]
         return [IsAuthenticated()]
     
-    def get_queryset(self):
-        queryset = super().get_queryset()
+    def get_status_filter(self):
+        """?status explícito o, por defecto, sin las archivadas (solo para usuarios no admin)"""
         status_filter = self.request.query_params.get('status')
         if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        else:
-            # Por defecto, excluir categorías archivadas en list (solo para usuarios no admin)
-            user = self.request.user
-            if not user.is_authenticated or user.role not in ['ADMIN', 'PROFESSOR']:
-                queryset = queryset.exclude(status='ARCHIVED')
+            return {'status': status_filter}
+        user = self.request.user
+        if not user.is_authenticated or user.role not in ['ADMIN', 'PROFESSOR']:
+            return {'exclude_status': 'ARCHIVED'}
+        return {}
+    
+    def filter_status(self, queryset):
+        status_filter = self.get_status_filter()
+        if 'status' in status_filter:
+            queryset = queryset.filter(status=status_filter['status'])
+        elif 'exclude_status' in status_filter:
+            queryset = queryset.exclude(status=status_filter['exclude_status'])
         return queryset
     
+    def get_queryset(self):
+        return self.filter_status(super().get_queryset())
+    
+    def get_conditional_queryset(self):
+        # Sin la anotación: el 304 se decide sin el COUNT sobre posts
+        return self.filter_status(Category.objects.all())
+    
+    def list(self, request, *args, **kwargs):
+        """Listado desde la instantánea del proceso: sin consultas mientras no cambie la generación"""
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return super().list(request, *args, **kwargs)
+        categories = get_category_index().all(**self.get_status_filter())
+        page = self.paginate_queryset(categories)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer(categories, many=True)
+        return Response(serializer.data)
+    
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
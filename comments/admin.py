@@ -1,10 +1,17 @@
 from django.contrib import admin
+from campus_forum.rendering import apply_rendered_content
 from .models import Comment
 
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
-    list_display = ['content', 'author', 'post', 'created_at']
+    list_display = ['content', 'author', 'post', 'depth', 'created_at']
     list_filter = ['created_at']
     search_fields = ['content', 'author__email', 'post__title']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['parent']
+    
+    def save_model(self, request, obj, form, change):
+        if not change or 'content' in form.changed_data:
+            apply_rendered_content(obj)
+        super().save_model(request, obj, form, change)
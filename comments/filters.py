@@ -0,0 +1,17 @@
+import django_filters
+from .models import Comment
+
+
+class CommentFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de comentarios.
+
+    ?post usa el índice (post, -created_at), que también resuelve el orden.
+    """
+    post = django_filters.NumberFilter(field_name='post_id')
+    author = django_filters.NumberFilter(field_name='author_id')
+    parent = django_filters.NumberFilter(field_name='parent_id')
+    
+    class Meta:
+        model = Comment
+        fields = ['post', 'author', 'parent']
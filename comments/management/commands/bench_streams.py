@@ -0,0 +1,150 @@
+import asyncio
+import json
+import resource
+import statistics
+import time
+import urllib.request
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+
+
+def api_request(base_url, path, data=None, token=None):
+    request = urllib.request.Request(
+        base_url + path,
+        data=json.dumps(data).encode() if data is not None else None,
+        headers={'Content-Type': 'application/json'},
+    )
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def resident_memory_kb(pid):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+class StreamClient:
+    """Conexión SSE mínima sobre un socket (sin EventSource): guarda cuándo llega cada comentario"""
+
+    def __init__(self):
+        self.received = {}
+        self.connected = False
+
+    async def run(self, host, port, path, token, ready):
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write((
+                f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n'
+                f'Authorization: Bearer {token}\r\n\r\n'
+            ).encode())
+            await writer.drain()
+            status = await reader.readline()
+            self.connected = b' 200 ' in status
+        except OSError:
+            self.connected = False
+        ready.set()
+        if not self.connected:
+            return
+        event = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.startswith(b'event: '):
+                    event = line[7:].strip()
+                elif line.startswith(b'data: ') and event == b'comment.created':
+                    self.received[json.loads(line[6:])['id']] = time.perf_counter()
+        finally:
+            self.connected = False
+            writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Prueba de carga de los streams SSE contra un servidor ASGI en ejecución: abre muchas '
+        'conexiones inactivas a un post, crea comentarios y mide cuánto tarda cada uno en llegar a todas.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--post', type=int, required=True)
+        parser.add_argument('--email', required=True)
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--connections', type=int, default=2000)
+        parser.add_argument('--events', type=int, default=5)
+        parser.add_argument('--hold', type=float, default=5, help='Segundos con las conexiones inactivas')
+        parser.add_argument('--pid', type=int, help='Proceso del servidor, para medir su memoria')
+
+    def handle(self, *args, **options):
+        # Un descriptor por conexión
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        if options['connections'] + 100 > hard:
+            raise CommandError(f'El límite de archivos abiertos ({hard}) no alcanza para {options["connections"]} conexiones')
+        token = api_request(options['url'], '/api/auth/login/', {
+            'email': options['email'], 'password': options['password'],
+        })['access']
+        asyncio.run(self.run(options, token))
+
+    async def run(self, options, token):
+        url = urlsplit(options['url'])
+        path = f"/api/stream/posts/{options['post']}/"
+        pid = options['pid']
+        memory_before = resident_memory_kb(pid) if pid else None
+
+        start = time.perf_counter()
+        clients, tasks = [], []
+        for _ in range(options['connections']):
+            client, ready = StreamClient(), asyncio.Event()
+            clients.append(client)
+            tasks.append(asyncio.ensure_future(client.run(url.hostname, url.port or 80, path, token, ready)))
+            await ready.wait()
+        connected = sum(client.connected for client in clients)
+        self.stdout.write(f'Conexiones: {connected}/{len(clients)} en {time.perf_counter() - start:.1f} s')
+
+        await asyncio.sleep(options['hold'])
+        still = sum(client.connected for client in clients)
+        if pid:
+            memory = resident_memory_kb(pid)
+            self.stdout.write(
+                f'Tras {options["hold"]:.0f} s inactivas: {still} abiertas; memoria del servidor '
+                f'{memory / 1024:.1f} MB (+{(memory - memory_before) / max(still, 1):.1f} KB por conexión)'
+            )
+        else:
+            self.stdout.write(f'Tras {options["hold"]:.0f} s inactivas: {still} abiertas')
+
+        loop = asyncio.get_running_loop()
+        for number in range(options['events']):
+            sent = time.perf_counter()
+            comment = await loop.run_in_executor(None, lambda: api_request(
+                options['url'], '/api/comments/',
+                {'post_id': options['post'], 'content': f'Comentario de la prueba de carga {number}'}, token
+            ))
+            created = time.perf_counter()
+            deadline = sent + 30
+            while time.perf_counter() < deadline and any(
+                client.connected and comment['id'] not in client.received for client in clients
+            ):
+                await asyncio.sleep(0.01)
+            latencies = sorted(
+                (client.received[comment['id']] - sent) * 1000
+                for client in clients if comment['id'] in client.received
+            )
+            if not latencies:
+                self.stdout.write(f'Evento {number + 1}: no llegó a ningún cliente')
+                continue
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            self.stdout.write(
+                f'Evento {number + 1}: entregado a {len(latencies)} clientes; p50={statistics.median(latencies):.1f}ms '
+                f'p99={p99:.1f}ms máx={latencies[-1]:.1f}ms (desde el POST, que tardó {(created - sent) * 1000:.1f}ms)'
+            )
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
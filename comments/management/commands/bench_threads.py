@@ -0,0 +1,127 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from comments.models import Comment
+from comments.threads import MAX_DEPTH, build_tree, child_path, subtree_queryset
+from posts.models import Post
+
+
+def load_by_levels(post_id, root=None):
+    """Carga ingenua: una consulta por nivel del hilo"""
+    queryset = Comment.objects.filter(post_id=post_id).order_by('id')
+    comments = [root] if root else list(queryset.filter(parent__isnull=True))
+    level = comments
+    while level:
+        level = list(queryset.filter(parent_id__in=[comment.id for comment in level]))
+        comments.extend(level)
+    return comments
+
+
+def assemble_by_levels(comments):
+    children = {}
+    for comment in comments:
+        children.setdefault(comment.parent_id, []).append(comment)
+
+    def node(comment):
+        return {'id': comment.id, 'replies': [node(child) for child in children.get(comment.id, [])]}
+    loaded = {comment.id for comment in comments}
+    return [node(comment) for comment in comments if comment.parent_id not in loaded]
+
+
+def load_by_path(queryset):
+    """Una consulta ordenada por path y armado en O(n)"""
+    comments = list(queryset)
+    return build_tree(comments, [{'id': comment.id} for comment in comments])
+
+
+def count_nodes(nodes):
+    return sum(1 + count_nodes(node['replies']) for node in nodes)
+
+
+class Command(BaseCommand):
+    help = (
+        'Comparar la carga de hilos por niveles con la ruta materializada. Crea un hilo '
+        'sintético en el primer post y lo descarta al terminar.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument('--roots', type=int, default=50, help='Comentarios raíz del hilo')
+        parser.add_argument('--iterations', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        post = Post.objects.order_by('id').first()
+        if post is None:
+            raise CommandError('No hay posts: ejecutar antes seed_posts')
+
+        with transaction.atomic():
+            self.create_thread(post, options)
+            self.run(post, options)
+            transaction.set_rollback(True)
+
+    def create_thread(self, post, options):
+        rng = random.Random(options['seed'])
+        total, roots = options['comments'], options['roots']
+        # Las respuestas prefieren comentarios recientes: ramas profundas, como en una discusión
+        parents, depths = [], []
+        for index in range(total):
+            parent = None
+            if index >= roots:
+                parent = max(0, index - 1 - int(rng.expovariate(1 / 20)))
+                if depths[parent] >= MAX_DEPTH:
+                    parent = parents[parent]
+            parents.append(parent)
+            depths.append(0 if parent is None else depths[parent] + 1)
+
+        # bulk_create no pasa por Comment.save: la ruta se completa con los ids asignados
+        comments = Comment.objects.bulk_create([
+            Comment(post=post, author_id=post.author_id, content=f'Comentario sintético {index}',
+                    depth=depths[index])
+            for index in range(total)
+        ], batch_size=2000)
+        for comment, parent in zip(comments, parents):
+            parent = comments[parent] if parent is not None else None
+            comment.parent_id = parent.id if parent else None
+            comment.path = child_path(parent.path if parent else '', comment.id)
+        Comment.objects.bulk_update(comments, ['parent', 'path'], batch_size=2000)
+        # Subárbol de ejemplo: la rama de primer nivel con más respuestas
+        sizes = [1] * total
+        for index in range(total - 1, -1, -1):
+            if parents[index] is not None:
+                sizes[parents[index]] += sizes[index]
+        self.sample = comments[max((i for i in range(total) if depths[i] == 1), key=sizes.__getitem__)]
+        self.stdout.write(
+            f'Hilo: {total} comentarios, {roots} raíces, profundidad máxima {max(depths)}'
+        )
+
+    def measure(self, label, load, iterations):
+        timings = []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                tree = load()
+                timings.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(
+            f'{label}: p50={statistics.median(timings):.1f}ms consultas={len(queries.captured_queries)} '
+            f'nodos={count_nodes(tree)}'
+        )
+
+    def run(self, post, options):
+        iterations = options['iterations']
+        sample = Comment.objects.get(pk=self.sample.pk)
+        self.measure('Hilo completo por niveles', lambda: assemble_by_levels(
+            load_by_levels(post.id)
+        ), iterations)
+        self.measure('Hilo completo por ruta', lambda: load_by_path(
+            Comment.objects.filter(post_id=post.id).order_by('path')
+        ), iterations)
+        self.measure(f'Subárbol de #{sample.id} por niveles', lambda: assemble_by_levels(
+            load_by_levels(post.id, sample)
+        ), iterations)
+        self.measure(f'Subárbol de #{sample.id} por ruta', lambda: load_by_path(
+            subtree_queryset(Comment.objects.all(), sample)
+        ), iterations)
@@ -0,0 +1,25 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from comments.models import CommentTombstone
+
+
+class Command(BaseCommand):
+    help = 'Eliminar los registros de comentarios borrados más antiguos que COMMENT_TOMBSTONE_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        limit = timezone.now() - timedelta(days=settings.COMMENT_TOMBSTONE_RETENTION_DAYS)
+        expired = CommentTombstone.objects.filter(deleted_at__lt=limit).order_by('id')
+        deleted = 0
+        while True:
+            with transaction.atomic():
+                ids = list(expired.values_list('id', flat=True)[:options['batch_size']])
+                if not ids:
+                    break
+                deleted += CommentTombstone.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'{deleted} registros eliminados'))
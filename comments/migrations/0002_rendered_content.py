@@ -0,0 +1,28 @@
+# Generated by Django 4.2 on 2026-10-18 07:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Contenido HTML'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=280, verbose_name='Extracto'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reading_time',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Minutos de lectura'),
+        ),
+    ]
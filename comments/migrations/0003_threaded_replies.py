@@ -0,0 +1,54 @@
+# Generated by Django 4.2 on 2026-10-18 07:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_path(apps, schema_editor):
+    # Los comentarios existentes son todos raíz. Segmentos de 8 dígitos, como
+    # comments.threads al crear la migración (0005 los ensancha a 16)
+    Comment = apps.get_model('comments', 'Comment')
+    batch = []
+    for comment in Comment.objects.only('id').iterator(chunk_size=2000):
+        comment.path = format(comment.id, '08x')
+        batch.append(comment)
+        if len(batch) >= 2000:
+            Comment.objects.bulk_update(batch, ['path'])
+            batch = []
+    if batch:
+        Comment.objects.bulk_update(batch, ['path'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0002_rendered_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Profundidad'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='comments.comment', verbose_name='Respuesta a'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=255, verbose_name='Ruta'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Respuestas'),
+        ),
+        migrations.RunPython(populate_path, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'path'], name='comments_co_post_id_adad8a_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0003_threaded_replies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('comment_id', models.BigIntegerField(verbose_name='Id del comentario')),
+                ('post_id', models.BigIntegerField(verbose_name='Id del post')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de eliminación')),
+            ],
+            options={
+                'verbose_name': 'Comentario eliminado',
+                'verbose_name_plural': 'Comentarios eliminados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'updated_at'], name='comments_co_post_id_014a78_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='commenttombstone',
+            index=models.Index(fields=['post_id', 'deleted_at'], name='comments_co_post_id_ab0a7d_idx'),
+        ),
+    ]
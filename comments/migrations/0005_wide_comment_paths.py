@@ -0,0 +1,45 @@
+# Generated by Django 4.2 on 2026-10-18 08:38
+
+from django.db import migrations, models
+from django.db.migrations.exceptions import IrreversibleError
+
+OLD_WIDTH = 8
+NEW_WIDTH = 16
+
+
+def widen_paths(apps, schema_editor):
+    # Cada segmento de 8 dígitos pasa a 16 con ceros a la izquierda; el orden
+    # por path y los rangos de subárbol se conservan
+    Comment = apps.get_model('comments', 'Comment')
+    schema_editor.execute(
+        f'UPDATE {schema_editor.quote_name(Comment._meta.db_table)} '
+        f"SET path = regexp_replace(path, '([0-9a-f]{{{OLD_WIDTH}}})', %s, 'g') WHERE path <> ''",
+        ['0' * (NEW_WIDTH - OLD_WIDTH) + '\\1'],
+    )
+
+
+def narrow_paths(apps, schema_editor):
+    Comment = apps.get_model('comments', 'Comment')
+    if Comment.objects.filter(id__gte=16 ** OLD_WIDTH).exists():
+        raise IrreversibleError('Hay comentarios con ids que no caben en segmentos de 8 dígitos')
+    schema_editor.execute(
+        f'UPDATE {schema_editor.quote_name(Comment._meta.db_table)} '
+        f"SET path = regexp_replace(path, '[0-9a-f]{{{NEW_WIDTH - OLD_WIDTH}}}([0-9a-f]{{{OLD_WIDTH}}})', "
+        f"'\\1', 'g') WHERE path <> ''",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0004_comment_sync'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(blank=True, editable=False, max_length=496, verbose_name='Ruta'),
+        ),
+        migrations.RunPython(widen_paths, narrow_paths),
+    ]
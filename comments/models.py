@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinLengthValidator
 from accounts.models import User
-from posts.models import Post
+from campus_forum.rendering import EXCERPT_LENGTH
+from posts.models import Post, fields_without_counters
+from .threads import MAX_DEPTH, PATH_MAX_LENGTH, child_path
 
 
 class Comment(models.Model):
@@ -21,6 +23,23 @@ class Comment(models.Model):
         related_name='comments',
         verbose_name='Autor'
     )
+    parent = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='replies',
+        verbose_name='Respuesta a'
+    )
+    # Ruta materializada del hilo (ver comments.threads)
+    path = models.CharField(max_length=PATH_MAX_LENGTH, blank=True, editable=False, verbose_name='Ruta')
+    depth = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Profundidad')
+    # Respuestas directas (desnormalizado, se actualiza con señales)
+    replies_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Respuestas')
+    # Render precalculado al escribir (ver campus_forum.rendering)
+    content_html = models.TextField(blank=True, editable=False, verbose_name='Contenido HTML')
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False, verbose_name='Extracto')
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Minutos de lectura')
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
     
@@ -30,7 +49,45 @@ class Comment(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['post', '-created_at']),
+            models.Index(fields=['post', 'path']),
+            # Sincronización incremental (?updated_after): nuevos y editados
+            models.Index(fields=['post', 'updated_at']),
         ]
     
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # replies_count lo mantienen las señales con F(): no escribir la copia leída
+            kwargs['update_fields'] = fields_without_counters(self, ['replies_count'])
+        if not self._state.adding or self.path:
+            return super().save(*args, **kwargs)
+        
+        # La ruta incluye el id propio: se completa tras el INSERT, en la misma transacción
+        parent = self.parent
+        if parent is not None and parent.depth >= MAX_DEPTH:
+            self.parent = parent = parent.parent
+        self.depth = parent.depth + 1 if parent is not None else 0
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            self.path = child_path(parent.path if parent is not None else '', self.pk)
+            Comment.objects.using(self._state.db).filter(pk=self.pk).update(path=self.path)
+    
     def __str__(self):
         return f"Comentario de {self.author.get_full_name()} en {self.post.title[:30]}"
+
+
+class CommentTombstone(models.Model):
+    """Registro de un comentario eliminado, para que la sincronización incremental lo informe"""
+    comment_id = models.BigIntegerField(verbose_name='Id del comentario')
+    # Sin llave foránea: el post también puede haberse eliminado
+    post_id = models.BigIntegerField(verbose_name='Id del post')
+    deleted_at = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de eliminación')
+    
+    class Meta:
+        verbose_name = 'Comentario eliminado'
+        verbose_name_plural = 'Comentarios eliminados'
+        indexes = [
+            models.Index(fields=['post_id', 'deleted_at']),
+        ]
+    
+    def __str__(self):
+        return f"Comentario {self.comment_id} eliminado del post {self.post_id}"
@@ -2,42 +2,61 @@ from rest_framework import serializers
 from django.core.validators import MinLengthValidator
 from .models import Comment
 from accounts.serializers import UserSerializer
+from campus_forum.compiled import CompiledReadMixin
+from campus_forum.serializers import RenderedContentMixin, SparseFieldsetMixin
+from posts.models import Post
 from posts.serializers import PostSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    author = serializers.SerializerMethodField()
-    post = PostSerializer(read_only=True)
+class CommentSerializer(SparseFieldsetMixin, RenderedContentMixin, CompiledReadMixin, serializers.ModelSerializer):
+    # El contexto (request, para URLs absolutas) se hereda del serializer padre
+    author = UserSerializer(read_only=True)
+    # El post se devuelve como id; ?expand=post lo incluye completo.
+    # Permitir comentar en todos los posts (PUBLISHED, DRAFT, etc.)
+    # La validación de permisos se hace en la vista
+    post_id = serializers.PrimaryKeyRelatedField(
+        queryset=Post.objects.all(),
+        source='post',
+        required=True
+    )
+    # Respuesta a otro comentario del mismo post (null para comentarios raíz)
+    parent_id = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.all(),
+        source='parent',
+        required=False,
+        allow_null=True
+    )
     
     class Meta:
         model = Comment
-        fields = ['id', 'content', 'post', 'author', 'created_at', 'updated_at']
-        read_only_fields = ['author', 'created_at', 'updated_at']
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from posts.models import Post
-        
-        # Agregar post_id como campo write-only
-        # Permitir comentar en todos los posts (PUBLISHED, DRAFT, etc.)
-        # La validación de permisos se hace en la vista
-        self.fields['post_id'] = serializers.PrimaryKeyRelatedField(
-            queryset=Post.objects.all(),
-            write_only=True,
-            source='post',
-            required=True
-        )
-    
-    def get_author(self, obj):
-        """Obtener el autor con el contexto del request para URLs absolutas"""
-        request = self.context.get('request')
-        return UserSerializer(obj.author, context={'request': request}).data
+        fields = ['id', 'content', 'content_html', 'excerpt', 'reading_time', 'post_id', 'parent_id',
+                  'depth', 'replies_count', 'author', 'created_at', 'updated_at']
+        read_only_fields = ['author', 'content_html', 'excerpt', 'reading_time', 'depth', 'replies_count',
+                            'created_at', 'updated_at']
+        expandable_fields = {
+            'post': PostSerializer,
+        }
     
     def validate_content(self, value):
         if len(value) < 5:
             raise serializers.ValidationError("El comentario debe tener al menos 5 caracteres")
         return value
     
+    def validate(self, data):
+        instance = self.instance
+        if instance is not None:
+            # La ruta del hilo no se recalcula: no se permite mover comentarios
+            if 'parent' in data and getattr(data['parent'], 'pk', None) != instance.parent_id:
+                raise serializers.ValidationError({'parent_id': 'No se puede cambiar el comentario al que se responde'})
+            if 'post' in data and data['post'].pk != instance.post_id and (instance.parent_id or instance.replies_count):
+                raise serializers.ValidationError({'post_id': 'No se puede mover un comentario que es parte de un hilo'})
+        
+        parent = data.get('parent')
+        post_id = data['post'].pk if 'post' in data else getattr(instance, 'post_id', None)
+        if parent is not None and parent.post_id != post_id:
+            raise serializers.ValidationError({'parent_id': 'La respuesta debe pertenecer al mismo post'})
+        return data
+    
     def create(self, validated_data):
         validated_data['author'] = self.context['request'].user
         return super().create(validated_data)
@@ -0,0 +1,82 @@
+import threading
+from contextlib import contextmanager
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from campus_forum.events import post_channel, publish_event
+from posts.caching import bump_feed_generation
+from posts.models import Post, Tag
+from posts.trending import add_event_expression, event_score
+from .models import Comment, CommentTombstone
+
+_local = threading.local()
+
+
+@contextmanager
+def suspend_comment_counters():
+    """No tocar contadores mientras se borran los propios posts (borrado masivo)"""
+    _local.suspended = True
+    try:
+        yield
+    finally:
+        _local.suspended = False
+
+
+@receiver(post_save, sender=Comment)
+def increment_post_comments_count(sender, instance, created, **kwargs):
+    """Sumar el comentario nuevo a los contadores y al puntaje de tendencia en UPDATE atómicos"""
+    if created:
+        hot = add_event_expression(event_score('comment'))
+        Post.objects.filter(pk=instance.post_id).update(
+            comments_count=F('comments_count') + 1,
+            hot_score=hot
+        )
+        Tag.objects.filter(posts__id=instance.post_id).update(hot_score=hot)
+        if instance.parent_id:
+            Comment.objects.filter(pk=instance.parent_id).update(replies_count=F('replies_count') + 1)
+        bump_feed_generation()
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_post_comments_count(sender, instance, **kwargs):
+    """Descontar el comentario eliminado (también en borrados en cascada)"""
+    if getattr(_local, 'suspended', False):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comments_count=Greatest(F('comments_count') - 1, 0)
+    )
+    if instance.parent_id:
+        # En un borrado en cascada el padre puede ya no existir: el UPDATE no hace nada
+        Comment.objects.filter(pk=instance.parent_id).update(
+            replies_count=Greatest(F('replies_count') - 1, 0)
+        )
+    bump_feed_generation()
+
+
+@receiver(post_delete, sender=Comment)
+def record_comment_tombstone(sender, instance, **kwargs):
+    """Dejar constancia del borrado para los clientes que sincronizan (ver comments.sync)"""
+    if getattr(_local, 'suspended', False):
+        return
+    CommentTombstone.objects.create(comment_id=instance.pk, post_id=instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+def publish_comment_created(sender, instance, created, **kwargs):
+    if created:
+        def data():
+            from .serializers import CommentSerializer
+            return CommentSerializer(instance).data
+        publish_event([post_channel(instance.post_id)], 'comment.created', data)
+
+
+@receiver(post_delete, sender=Comment)
+def publish_comment_deleted(sender, instance, **kwargs):
+    if getattr(_local, 'suspended', False):
+        return
+    publish_event([post_channel(instance.post_id)], 'comment.deleted', {
+        'id': instance.pk,
+        'post_id': instance.post_id,
+        'parent_id': instance.parent_id,
+    })
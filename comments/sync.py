@@ -0,0 +1,110 @@
+"""
+Sincronización incremental de los comentarios de un post (GET /comments/sync/).
+
+Los clientes que sondean envían el cursor de la respuesta anterior y reciben
+solo lo que cambió: ?updated_after=<cursor> devuelve comentarios nuevos o
+editados (índice (post, updated_at)) y los ids eliminados desde entonces
+(índice (post_id, deleted_at) de CommentTombstone); ?after_id=<id> devuelve
+solo comentarios nuevos (rango de la llave primaria). Sin cambios, ambas
+consultas son recorridos de índice vacíos.
+
+El cursor que se entrega al estar al día es el instante de la consulta menos
+SYNC_OVERLAP, para no perder escrituras cuya transacción confirma después de
+leer: un cambio puede llegar dos veces y el cliente lo reemplaza por id.
+
+Si una respuesta se trunca, el cursor es compuesto: "<instante>,<id comentario>,
+<id borrado>" marca la última fila entregada de cada lista, para que más de
+SYNC_LIMIT filas con el mismo updated_at no devuelvan siempre la misma página.
+"""
+from datetime import timedelta, timezone as dt_timezone
+from typing import NamedTuple
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.fields import DateTimeField
+from .models import CommentTombstone
+
+SYNC_LIMIT = 200
+SYNC_OVERLAP = timedelta(seconds=2)
+
+
+class SyncCursor(NamedTuple):
+    """Posición en ambas listas: (updated_at, id) de comentarios y (deleted_at, id) de borrados"""
+    since: object
+    comment_id: int = 0
+    tombstone_id: int = 0
+
+
+def parse_cursor(value):
+    """Leer ?updated_after (fecha ISO 8601 o cursor compuesto); ValueError si no es válido"""
+    since, *ids = value.split(',')
+    since = parse_datetime(since)
+    if since is None or len(ids) not in (0, 2):
+        raise ValueError(value)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, dt_timezone.utc)
+    comment_id, tombstone_id = (int(id_) for id_ in ids) if ids else (0, 0)
+    return SyncCursor(since, comment_id, tombstone_id)
+
+
+def format_cursor(cursor):
+    since = DateTimeField().to_representation(cursor.since)
+    if not cursor.comment_id and not cursor.tombstone_id:
+        return since
+    return f'{since},{cursor.comment_id},{cursor.tombstone_id}'
+
+
+def cursor_expired(cursor, now=None):
+    """Los registros de borrados más antiguos se eliminan: el cliente debe recargar"""
+    retention = timedelta(days=settings.COMMENT_TOMBSTONE_RETENTION_DAYS)
+    return cursor.since < (now or timezone.now()) - retention
+
+
+def initial_cursor():
+    return SyncCursor(timezone.now() - SYNC_OVERLAP)
+
+
+def changes_since(queryset, post_id, cursor, limit=SYNC_LIMIT):
+    """Comentarios nuevos o editados e ids eliminados desde `cursor`, con el próximo cursor"""
+    since = cursor.since
+    next_cursor = initial_cursor()
+    comments = list(queryset.filter(
+        Q(updated_at__gt=since) | Q(updated_at=since, id__gt=cursor.comment_id), post_id=post_id
+    ).order_by('updated_at', 'id')[:limit + 1])
+    deleted = list(CommentTombstone.objects.filter(
+        Q(deleted_at__gt=since) | Q(deleted_at=since, id__gt=cursor.tombstone_id), post_id=post_id
+    ).order_by('deleted_at', 'id').values_list('comment_id', 'deleted_at', 'id')[:limit + 1])
+
+    # Si alguna lista se trunca, el cursor se queda en la primera fila no entregada:
+    # la lista que llegó más lejos se repite desde ese instante (el cliente reemplaza por id)
+    boundaries = []
+    if len(comments) > limit:
+        comments = comments[:limit]
+        boundaries.append((comments[-1].updated_at, 'comment', comments[-1].id))
+    if len(deleted) > limit:
+        deleted = deleted[:limit]
+        boundaries.append((deleted[-1][1], 'tombstone', deleted[-1][2]))
+    if boundaries:
+        since = min(moment for moment, _, _ in boundaries)
+        ids = {stream: id_ for moment, stream, id_ in boundaries if moment == since}
+        next_cursor = SyncCursor(since, ids.get('comment', 0), ids.get('tombstone', 0))
+    return {
+        'comments': comments,
+        'deleted': [comment_id for comment_id, _, _ in deleted],
+        'cursor': next_cursor,
+        'has_more': bool(boundaries),
+    }
+
+
+def comments_after(queryset, post_id, after_id, limit=SYNC_LIMIT):
+    """Solo comentarios nuevos: id mayor que el último conocido"""
+    comments = list(queryset.filter(post_id=post_id, id__gt=after_id).order_by('id')[:limit + 1])
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+    return {
+        'comments': comments,
+        'deleted': [],
+        'last_id': comments[-1].id if comments else after_id,
+        'has_more': has_more,
+    }
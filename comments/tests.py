@@ -1,3 +1,187 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import User
+from categories.models import Category
+from posts.models import Post
+from .models import Comment, CommentTombstone
+from .sync import SYNC_LIMIT
+from .threads import MAX_DEPTH, path_segment, subtree_queryset
 
-# Create your tests here.
+
+class CommentThreadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='estudiante@campus.edu', password='clave-segura', first_name='Eva', last_name='Estudiante'
+        )
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='General', created_by=self.user)
+        self.post = Post.objects.create(
+            title='Post con hilos', content='Contenido del post con varios hilos.',
+            category=category, author=self.user, status='PUBLISHED'
+        )
+        self.other_post = Post.objects.create(
+            title='Otro post', content='Contenido de otro post distinto.',
+            category=category, author=self.user, status='PUBLISHED'
+        )
+
+    def reply(self, parent=None, post=None, content='Comentario de prueba'):
+        response = self.client.post('/api/comments/', {
+            'post_id': (post or self.post).pk,
+            'parent_id': parent,
+            'content': content,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def test_reply_paths_and_counters(self):
+        root = self.reply()
+        child = self.reply(root)
+        grandchild = self.reply(child)
+
+        comment = Comment.objects.get(pk=grandchild)
+        self.assertEqual(comment.depth, 2)
+        self.assertEqual(comment.path, path_segment(root) + path_segment(child) + path_segment(grandchild))
+        self.assertEqual(Comment.objects.get(pk=root).replies_count, 1)
+        self.assertEqual(Comment.objects.get(pk=child).replies_count, 1)
+
+        self.client.delete(f'/api/comments/{grandchild}/')
+        self.assertEqual(Comment.objects.get(pk=child).replies_count, 0)
+        # Borrar la raíz se lleva el hilo completo
+        self.client.delete(f'/api/comments/{root}/')
+        self.assertFalse(Comment.objects.filter(post=self.post).exists())
+        self.assertEqual(Post.objects.get(pk=self.post.pk).comments_count, 0)
+
+    def test_reply_must_stay_in_post_and_thread(self):
+        root = self.reply()
+        response = self.client.post('/api/comments/', {
+            'post_id': self.other_post.pk, 'parent_id': root, 'content': 'Respuesta en otro post'
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('parent_id', response.data)
+
+        child = self.reply(root)
+        other_root = self.reply()
+        response = self.client.patch(f'/api/comments/{child}/', {'parent_id': other_root}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(f'/api/comments/{root}/', {'post_id': self.other_post.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_depth_is_capped(self):
+        parent = None
+        for _ in range(MAX_DEPTH + 3):
+            parent = Comment.objects.create(post=self.post, author=self.user, parent=parent, content='Respuesta')
+        self.assertEqual(parent.depth, MAX_DEPTH)
+        self.assertEqual(Comment.objects.filter(post=self.post).order_by('-depth').first().depth, MAX_DEPTH)
+        self.assertTrue(all(
+            len(path) == (depth + 1) * len(path_segment(1))
+            for path, depth in Comment.objects.values_list('path', 'depth')
+        ))
+
+    def test_ids_beyond_32_bits(self):
+        small = Comment.objects.create(id=0x10000000, post=self.post, author=self.user, content='Raíz con id chico')
+        big = Comment.objects.create(id=2 ** 32, post=self.post, author=self.user, content='Raíz con id grande')
+        reply = Comment.objects.create(post=self.post, author=self.user, parent=big, content='Respuesta')
+        self.assertEqual(reply.path, path_segment(big.pk) + path_segment(reply.pk))
+
+        # Con segmentos de 8 dígitos el hilo de `big` caía dentro del rango de `small`
+        self.assertEqual(list(subtree_queryset(Comment.objects.all(), small)), [small])
+        response = self.client.get(f'/api/comments/{big.pk}/thread/')
+        self.assertEqual([node['id'] for node in response.data['replies']], [reply.pk])
+        self.assertEqual(
+            list(Comment.objects.filter(post=self.post).order_by('path').values_list('id', flat=True)),
+            [small.pk, big.pk, reply.pk]
+        )
+        path_segment(2 ** 63 - 1)
+        with self.assertRaises(ValueError):
+            path_segment(2 ** 64)
+
+    def test_threads_and_subtree(self):
+        first = self.reply(content='Primer hilo')
+        first_reply = self.reply(first)
+        deep = self.reply(first_reply)
+        deeper = self.reply(deep)
+        second = self.reply(content='Segundo hilo')
+        self.reply(post=self.other_post)
+
+        response = self.client.get('/api/comments/threads/', {'post': self.post.pk, 'depth': 2})
+        self.assertEqual(response.status_code, 200)
+        roots = response.data['results']
+        # Raíces más recientes primero, solo del post pedido
+        self.assertEqual([root['id'] for root in roots], [second, first])
+        self.assertEqual(roots[0]['replies'], [])
+        level_one = roots[1]['replies']
+        self.assertEqual([node['id'] for node in level_one], [first_reply])
+        level_two = level_one[0]['replies']
+        self.assertEqual([node['id'] for node in level_two], [deep])
+        # Más allá de ?depth la rama llega colapsada
+        self.assertEqual(level_two[0]['replies'], [])
+        self.assertEqual(level_two[0]['replies_count'], 1)
+
+        response = self.client.get(f'/api/comments/{deep}/thread/')
+        self.assertEqual(response.data['id'], deep)
+        self.assertEqual([node['id'] for node in response.data['replies']], [deeper])
+
+        response = self.client.get('/api/comments/threads/', {'post': 'x'})
+        self.assertEqual(response.status_code, 400)
+
+
+class CommentSyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='estudiante@campus.edu', password='clave-segura', first_name='Eva', last_name='Estudiante'
+        )
+        self.client.force_authenticate(self.user)
+        category = Category.objects.create(name='General', created_by=self.user)
+        self.post = Post.objects.create(
+            title='Post sincronizado', content='Contenido del post que se sondea.',
+            category=category, author=self.user, status='PUBLISHED'
+        )
+
+    def sync(self, cursor=None):
+        params = {'post': self.post.pk}
+        if cursor:
+            params['updated_after'] = cursor
+        response = self.client.get('/api/comments/sync/', params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_same_timestamp_rows_do_not_stall(self):
+        cursor = self.sync()['cursor']
+        moment = timezone.now()
+        Comment.objects.bulk_create([
+            Comment(post=self.post, author=self.user, content=f'Comentario {number}')
+            for number in range(SYNC_LIMIT + 50)
+        ])
+        Comment.objects.update(updated_at=moment)
+        CommentTombstone.objects.bulk_create([
+            CommentTombstone(comment_id=10_000 + number, post_id=self.post.pk)
+            for number in range(SYNC_LIMIT + 10)
+        ])
+        CommentTombstone.objects.update(deleted_at=moment + timedelta(seconds=1))
+
+        seen, deleted, pages = set(), set(), 0
+        while True:
+            pages += 1
+            self.assertLess(pages, 10)
+            data = self.sync(cursor)
+            seen.update(comment['id'] for comment in data['comments'])
+            deleted.update(data['deleted'])
+            cursor = data['cursor']
+            if not data['has_more']:
+                break
+        self.assertEqual(seen, set(Comment.objects.values_list('id', flat=True)))
+        self.assertEqual(len(deleted), SYNC_LIMIT + 10)
+        # Al estar al día el cursor vuelve a ser una fecha
+        self.assertNotIn(',', cursor)
+
+    def test_invalid_cursor(self):
+        for cursor in ('ayer', '2025-03-01T10:00:00Z,1', '2025-03-01T10:00:00Z,a,b'):
+            response = self.client.get('/api/comments/sync/', {'post': self.post.pk, 'updated_after': cursor})
+            self.assertEqual(response.status_code, 400)
+        old = (timezone.now() - timedelta(days=30)).isoformat()
+        response = self.client.get('/api/comments/sync/', {'post': self.post.pk, 'updated_after': old})
+        self.assertEqual(response.status_code, 410)
@@ -0,0 +1,70 @@
+"""
+Respuestas en hilo con ruta materializada.
+
+Cada comentario guarda en `path` los ids de sus ancestros y el suyo, en
+segmentos hexadecimales de ancho fijo (raíz 7 -> '0000000000000007', su
+respuesta 12 -> '0000000000000007000000000000000c'). El ancho cubre todo el
+rango de Comment.id (BigAutoField, hasta 2^63 - 1): con segmentos más cortos
+un id grande ocuparía más dígitos y rompería el orden. Así:
+
+- Ordenar por path recorre el hilo en profundidad, con los hermanos en orden
+  de creación: los padres siempre llegan antes que sus respuestas.
+- Un subárbol es el rango [path, path + PATH_END) dentro del mismo post, que
+  el índice (post, path) resuelve con un solo recorrido y sin recursión.
+- Los hilos de una página de comentarios raíz (ordenados por path) también son
+  un rango contiguo.
+"""
+SEGMENT_WIDTH = 16
+# Profundidad máxima (la raíz tiene profundidad 0); las respuestas más
+# profundas se cuelgan del último nivel permitido
+MAX_DEPTH = 30
+PATH_MAX_LENGTH = (MAX_DEPTH + 1) * SEGMENT_WIDTH
+# Mayor que cualquier dígito hexadecimal, también con collations no binarias
+PATH_END = 'g'
+
+# Niveles de respuestas que se devuelven anidados por defecto; las ramas más
+# profundas llegan colapsadas (replies vacío y replies_count > 0)
+DEFAULT_THREAD_DEPTH = 4
+
+
+def path_segment(comment_id):
+    if not 0 < comment_id < 16 ** SEGMENT_WIDTH:
+        raise ValueError(f'Id fuera del rango de la ruta: {comment_id}')
+    return format(comment_id, f'0{SEGMENT_WIDTH}x')
+
+
+def child_path(parent_path, comment_id):
+    return (parent_path or '') + path_segment(comment_id)
+
+
+def path_range(first_path, last_path=None):
+    """Filtro del rango que cubre los subárboles de first_path a last_path (ambos incluidos)"""
+    return {'path__gte': first_path, 'path__lt': (last_path or first_path) + PATH_END}
+
+
+def subtree_queryset(queryset, comment, depth=None):
+    """Subárbol de un comentario (él incluido) en orden de hilo, con `depth` niveles de respuestas"""
+    queryset = queryset.filter(post_id=comment.post_id, **path_range(comment.path))
+    if depth is not None:
+        queryset = queryset.filter(depth__lte=comment.depth + depth)
+    return queryset.order_by('path')
+
+
+def build_tree(comments, representations):
+    """
+    Anidar en O(n) las representaciones de comentarios ordenados por path.
+
+    A cada representación se le agrega `replies`. Los comentarios cuyo padre no
+    está en la lista son las raíces del resultado, en el orden recibido.
+    """
+    nodes = {}
+    roots = []
+    for comment, data in zip(comments, representations):
+        data['replies'] = []
+        nodes[comment.pk] = data
+        parent = nodes.get(comment.parent_id)
+        if parent is None:
+            roots.append(data)
+        else:
+            parent['replies'].append(data)
+    return roots
@@ -2,28 +2,55 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from rest_framework.filters import OrderingFilter
+from django.db.models import Prefetch
+from django_filters.rest_framework import DjangoFilterBackend
+from campus_forum.export import StreamingExportMixin
+from campus_forum.mixins import ConditionalRetrieveMixin, QueryExplainMixin
+from campus_forum.serializers import parse_field_list
+from posts.models import Post
+from reports.permissions import IsModerator
+from .filters import CommentFilter
 from .models import Comment
 from .serializers import CommentSerializer
+from .sync import changes_since, comments_after, cursor_expired, format_cursor, initial_cursor, parse_cursor
+from .threads import DEFAULT_THREAD_DEPTH, MAX_DEPTH, build_tree, path_range, subtree_queryset
 from .permissions import IsAuthorOrModerator
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(StreamingExportMixin, QueryExplainMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
+    # Con ?expand=post el comentario incluye el post, así que su versión también cuenta
+    conditional_fields = ('updated_at', 'post__updated_at', 'post__comments_count')
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = CommentFilter
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
+    export_fields = ('id', 'post_id', 'parent_id', 'author_id', 'content', 'created_at', 'updated_at')
+    
+    def is_post_expanded(self):
+        expandable = CommentSerializer.Meta.expandable_fields
+        return 'post' in parse_field_list(self.request.query_params.get('expand')) & set(expandable)
     
     def get_queryset(self):
-        queryset = Comment.objects.select_related('author', 'post')
-        post_id = self.request.query_params.get('post')
-        
-        if post_id:
-            queryset = queryset.filter(post_id=post_id)
-        
-        return queryset.order_by('-created_at')
+        queryset = Comment.objects.select_related('author')
+        if self.is_post_expanded():
+            # Los posts se cargan por lote (una consulta por relación, sin importar el
+            # tamaño de la página) y cada post distinto se instancia una sola vez
+            queryset = queryset.prefetch_related(
+                # (el total de posts de la categoría sale de la instantánea del proceso)
+                Prefetch('post', queryset=Post.objects.select_related('author', 'category').prefetch_related(
+                    'tags'
+                ).defer('search_vector')),
+            )
+        return queryset
     
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy']:
             return [IsAuthorOrModerator()]
+        if self.action == 'export':
+            return [IsModerator()]
         return super().get_permissions()
     
     def get_serializer_context(self):
@@ -31,6 +58,87 @@ class CommentViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
     
+    def get_thread_depth(self):
+        """?depth: niveles de respuestas anidadas; las ramas más profundas llegan colapsadas"""
+        try:
+            depth = int(self.request.query_params.get('depth', DEFAULT_THREAD_DEPTH))
+        except ValueError:
+            return DEFAULT_THREAD_DEPTH
+        return max(0, min(depth, MAX_DEPTH))
+    
+    def tree_data(self, comments):
+        comments = list(comments)
+        return build_tree(comments, self.get_serializer(comments, many=True).data)
+    
+    @action(detail=False, methods=['get'])
+    def threads(self, request):
+        """
+        Hilos de un post (?post=): comentarios raíz paginados, más recientes
+        primero, cada uno con sus respuestas anidadas hasta ?depth niveles.
+        """
+        try:
+            post_id = int(request.query_params.get('post', ''))
+        except ValueError:
+            return Response({'error': 'El parámetro post es requerido'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = self.get_queryset().filter(post_id=post_id)
+        roots = self.paginate_queryset(queryset.filter(depth=0).order_by('-path'))
+        depth = self.get_thread_depth()
+        if roots and depth:
+            # Las raíces de la página son contiguas por path: sus respuestas son un solo rango
+            paths = [root.path for root in roots]
+            replies = queryset.filter(
+                depth__gt=0, depth__lte=depth, **path_range(min(paths), max(paths))
+            ).order_by('path')
+            roots.extend(replies)
+        return self.get_paginated_response(self.tree_data(roots))
+    
+    @action(detail=True, methods=['get'])
+    def thread(self, request, pk=None):
+        """Subárbol de un comentario (para expandir ramas colapsadas), hasta ?depth niveles"""
+        comment = self.get_object()
+        comments = subtree_queryset(self.get_queryset(), comment, self.get_thread_depth())
+        return Response(self.tree_data(comments)[0])
+    
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """
+        Cambios de los comentarios de un post para clientes que sondean (ver comments.sync).
+        
+        ?post=X&updated_after=<cursor>: nuevos, editados y eliminados (el cursor es opaco).
+        ?post=X&after_id=<id>: solo nuevos.
+        Sin cursor devuelve el cursor inicial: pedirlo antes de cargar el listado.
+        """
+        params = request.query_params
+        invalid = Response(
+            {'error': 'Parámetros no válidos: post y after_id son enteros, updated_after es un cursor de sync'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+        try:
+            post_id = int(params.get('post', ''))
+            after_id = int(params['after_id']) if 'after_id' in params else None
+            cursor = parse_cursor(params['updated_after']) if 'updated_after' in params else None
+        except ValueError:
+            return invalid
+        
+        queryset = self.get_queryset()
+        if after_id is not None:
+            changes = comments_after(queryset, post_id, after_id)
+        elif cursor is not None:
+            if cursor_expired(cursor):
+                return Response(
+                    {'error': 'El cursor expiró: recargar los comentarios'},
+                    status=status.HTTP_410_GONE
+                )
+            changes = changes_since(queryset, post_id, cursor)
+        else:
+            changes = {'comments': [], 'deleted': [], 'cursor': initial_cursor(), 'has_more': False}
+        
+        changes['comments'] = self.get_serializer(changes['comments'], many=True).data
+        if 'cursor' in changes:
+            changes['cursor'] = format_cursor(changes['cursor'])
+        return Response(changes)
+    
     def create(self, request, *args, **kwargs):
         """Sobrescribir create para asegurar que el serializer tenga el contexto"""
         serializer = self.get_serializer(data=request.data)
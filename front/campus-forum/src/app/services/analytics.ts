@@ -1,7 +1,12 @@
 import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
-import { Statistics, CategoryStatistics } from '../shared/interfaces/analytics.interface';
+import {
+  Statistics,
+  CategoryStatistics,
+  Timeseries,
+  TimeseriesQuery
+} from '../shared/interfaces/analytics.interface';
 
 import { getApiBaseUrl } from '../core/config/app.config';
 
@@ -22,4 +27,15 @@ export class AnalyticsService {
   getCategoryStatistics(categoryId: number): Observable<CategoryStatistics> {
     return this.http.get<CategoryStatistics>(`${this.apiUrl}/category/${categoryId}/`);
   }
+
+  // Serie de tiempo de una métrica por hora, día o semana
+  getTimeseries(query: TimeseriesQuery): Observable<Timeseries> {
+    let params = new HttpParams();
+    Object.entries(query).forEach(([key, value]) => {
+      if (value !== undefined && value !== null && value !== '') {
+        params = params.set(key, String(value));
+      }
+    });
+    return this.http.get<Timeseries>(`${this.apiUrl}/timeseries/`, { params });
+  }
 }
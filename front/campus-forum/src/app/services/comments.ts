@@ -1,7 +1,7 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable, map } from 'rxjs';
-import { Comment, CreateCommentRequest, UpdateCommentRequest } from '../shared/interfaces/comment.interface';
+import { Comment, CommentSync, CreateCommentRequest, UpdateCommentRequest } from '../shared/interfaces/comment.interface';
 import { PaginatedResponse } from './categories';
 
 import { getApiBaseUrl } from '../core/config/app.config';
@@ -28,6 +28,15 @@ export class CommentsService {
       );
   }
 
+  // Cambios desde el último sondeo (sin cursor devuelve el cursor inicial)
+  syncComments(postId: number, cursor?: string): Observable<CommentSync> {
+    let params = new HttpParams().set('post', postId.toString());
+    if (cursor) {
+      params = params.set('updated_after', cursor);
+    }
+    return this.http.get<CommentSync>(`${this.apiUrl}/sync/`, { params });
+  }
+
   // Obtener comentario por ID
   getComment(id: number): Observable<Comment> {
     return this.http.get<Comment>(`${this.apiUrl}/${id}/`);
@@ -7,7 +7,8 @@ import {
   CreatePostRequest, 
   UpdatePostRequest, 
   PostFilters,
-  PostStatus 
+  PostStatus,
+  PostViewStats
 } from '../shared/interfaces/post.interface';
 import { Tag } from '../shared/interfaces/post.interface';
 
@@ -52,6 +53,13 @@ export class PostsService {
     return this.http.get<Post>(`${this.apiUrl}/posts/${id}/`);
   }
 
+  // Visitas por día y visitantes únicos (autor o moderadores)
+  getPostViews(id: number, days?: number): Observable<PostViewStats> {
+    let params = new HttpParams();
+    if (days) params = params.set('days', days);
+    return this.http.get<PostViewStats>(`${this.apiUrl}/posts/${id}/views/`, { params });
+  }
+
   // Obtener mis posts
   getMyPosts(page?: number, pageSize?: number): Observable<PaginatedResponse<Post>> {
     let params = new HttpParams();
@@ -55,4 +55,30 @@ export interface CategoryStatistics {
   top_posts: TopPost[];
 }
 
+export type TimeseriesMetric = 'posts' | 'comments' | 'signups' | 'reports' | 'views';
+export type TimeseriesBucket = 'hour' | 'day' | 'week';
 
+export interface TimeseriesQuery {
+  metric: TimeseriesMetric;
+  bucket?: TimeseriesBucket;
+  from?: string;
+  to?: string;
+  category?: number;
+  window?: number;
+}
+
+// Arreglos paralelos: una posición por intervalo de `buckets`
+export interface Timeseries {
+  metric: TimeseriesMetric;
+  bucket: TimeseriesBucket;
+  category: number | null;
+  from: string;
+  to: string;
+  window: number;
+  total: number;
+  buckets: string[];
+  counts: number[];
+  moving_average: number[];
+  week_over_week: number[];
+  week_over_week_change: (number | null)[];
+}
@@ -4,15 +4,32 @@ import { Post } from './post.interface';
 export interface Comment {
   id: number;
   content: string;
-  post: Post;
+  post_id: number;
+  // Solo con ?expand=post
+  post?: Post;
+  parent_id: number | null;
+  depth: number;
+  replies_count: number;
+  // Solo en /comments/threads/ y /comments/{id}/thread/
+  replies?: Comment[];
   author: User;
   created_at: string;
   updated_at: string;
 }
 
+// Respuesta de /comments/sync/: cambios desde el último cursor
+export interface CommentSync {
+  comments: Comment[];
+  deleted: number[];
+  cursor?: string;
+  last_id?: number;
+  has_more: boolean;
+}
+
 export interface CreateCommentRequest {
   content: string;
   post_id: number;
+  parent_id?: number | null;
 }
 
 export interface UpdateCommentRequest {
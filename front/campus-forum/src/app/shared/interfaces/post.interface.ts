@@ -21,6 +21,7 @@ export interface Post {
   status: PostStatus;
   tags: Tag[];
   comments_count?: number;
+  views_count?: number;
   created_at: string;
   updated_at: string;
 }
@@ -48,4 +49,17 @@ export interface PostFilters {
   search?: string;
 }
 
+export interface PostDailyViews {
+  day: string;
+  views: number;
+  unique_visitors: number;
+}
 
+export interface PostViewStats {
+  id: number;
+  views_count: number;
+  days: number;
+  views: number;
+  unique_visitors: number;
+  daily: PostDailyViews[];
+}
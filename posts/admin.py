@@ -1,4 +1,5 @@
 from django.contrib import admin
+from campus_forum.rendering import apply_rendered_content
 from .models import Post, Tag
 
 
@@ -9,6 +10,11 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ['title', 'content']
     filter_horizontal = ['tags']
     readonly_fields = ['created_at', 'updated_at']
+    
+    def save_model(self, request, obj, form, change):
+        if not change or 'content' in form.changed_data:
+            apply_rendered_content(obj)
+        super().save_model(request, obj, form, change)
 
 
 @admin.register(Tag)
@@ -0,0 +1,32 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from campus_forum.cache import bump_generation, get_generation
+
+FEED_GENERATION = 'posts-feed'
+
+
+def bump_feed_generation():
+    """Invalidar todas las respuestas cacheadas del feed público"""
+    return bump_generation(FEED_GENERATION)
+
+
+def feed_cache_key(request):
+    """Clave a partir de la generación actual y los parámetros normalizados"""
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+        if value != '' and not (name == 'page' and value == '1')
+    )
+    raw = f'{request.get_host()}|{request.path}|{params}'
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'feed:{get_generation(FEED_GENERATION)}:{digest}'
+
+
+def get_cached_feed(key):
+    return cache.get(key)
+
+
+def set_cached_feed(key, data):
+    cache.set(key, data, timeout=settings.FEED_CACHE_TIMEOUT)
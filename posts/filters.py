@@ -0,0 +1,53 @@
+import django_filters
+from rest_framework import filters
+from .models import Post
+from .search import search_posts
+
+
+class PostOrderingFilter(filters.OrderingFilter):
+    """
+    Ordenar por relevancia cuando hay búsqueda y no se pidió otro orden explícito.
+
+    ?ordering=hot ordena por tendencia (índice status, -hot_score).
+    """
+    ordering_aliases = {
+        'hot': '-hot_score',
+        '-hot': 'hot_score',
+    }
+    
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            fields = [self.ordering_aliases.get(param.strip(), param.strip()) for param in params.split(',')]
+            ordering = self.remove_invalid_fields(queryset, fields, view, request)
+            if ordering:
+                return ordering
+        return self.get_default_ordering(view)
+    
+    def get_default_ordering(self, view):
+        if view.request.query_params.get('search'):
+            return ['-search_rank', '-created_at']
+        return super().get_default_ordering(view)
+
+
+class PostFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de posts, validados y aplicados una sola vez.
+
+    Índices usados: category -> (category, status); status -> (status, -hot_score)
+    o (-created_at, status) según el orden; search -> GIN de search_vector.
+    """
+    category = django_filters.NumberFilter(field_name='category_id')
+    author = django_filters.NumberFilter(field_name='author_id')
+    status = django_filters.ChoiceFilter(choices=Post.Status.choices)
+    tag = django_filters.NumberFilter(field_name='tags__id')
+    search = django_filters.CharFilter(method='filter_search')
+    
+    class Meta:
+        model = Post
+        fields = ['category', 'author', 'status', 'tag', 'search']
+    
+    def filter_search(self, queryset, name, value):
+        # Texto completo con ranking y fragmento resaltado (sin ILIKE)
+        value = value.strip()
+        return search_posts(queryset, value) if value else queryset
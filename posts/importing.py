@@ -0,0 +1,337 @@
+"""
+Importación masiva desde el foro anterior (manage.py import_forum).
+
+Los registros se leen de NDJSON o CSV y se procesan por lotes. Por cada lote,
+las llaves foráneas se resuelven con mapas en memoria (sin consultas por fila),
+se reservan ids de la secuencia y las filas válidas se cargan con COPY en una
+sola transacción, junto con su correspondencia en LegacyRecord.
+
+LegacyRecord hace que la importación sea reanudable: al volver a ejecutarla,
+los registros cuyo id anterior ya está registrado se omiten.
+
+Formato de entrada (un objeto por registro; en CSV, las etiquetas van
+separadas por '|'):
+
+- users:    id, email, first_name, last_name, role, date_joined
+- posts:    id, author, category, title, content, status, tags, created_at, updated_at
+- comments: id, post, author, content, created_at, updated_at
+
+`author` y `post` son ids del foro anterior; `category` y `tags` son nombres.
+El foro anterior no tenía respuestas: los comentarios se importan como raíz.
+"""
+import csv
+import io
+import json
+import multiprocessing
+from datetime import timezone as dt_timezone
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from accounts.models import User
+from campus_forum.rendering import render_content
+from categories.models import Category
+from comments.models import Comment
+from comments.threads import path_segment
+from .models import LegacyRecord, Post, Tag
+from .search import update_search_vectors
+from .trending import event_score
+
+
+EMPTY_RENDER = {'content_html': '', 'excerpt': '', 'reading_time': 0}
+
+
+def read_records(path):
+    """Registros (dict) de un archivo NDJSON o CSV, según la extensión"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if path.endswith('.csv'):
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batched(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def copy_value(value):
+    """
+    Celda CSV para COPY: None como campo vacío sin comillas (el NULL de COPY
+    en CSV) y cualquier otro valor entre comillas, que COPY nunca lee como
+    NULL. Así un texto importado como '' o '\\N' llega tal cual.
+    """
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_rows(cursor, model, columns, rows):
+    """Cargar filas con COPY ... FROM STDIN (formato CSV)"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {model._meta.db_table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+
+def reserve_ids(cursor, model, count):
+    """Tomar `count` ids de la secuencia de la tabla en una sola consulta"""
+    cursor.execute(
+        "SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+        [model._meta.db_table, count]
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def parse_timestamp(value, default):
+    if not value:
+        return default
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f'Fecha no válida: {value}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def legacy_key(value):
+    """Id del foro anterior normalizado como texto ('' si falta)"""
+    return '' if value is None else str(value).strip()
+
+
+def parse_tags(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split('|')
+    return list(dict.fromkeys(name.strip() for name in value if name and name.strip()))
+
+
+class ForumImporter:
+    """Estado de una importación: mapas de ids, errores y contadores"""
+
+    def __init__(self, batch_size=5000, render=True, workers=1, on_error=None):
+        self.batch_size = batch_size
+        self.render = render
+        # El render de markdown es lo más costoso por fila: repartirlo entre procesos
+        self.workers = workers
+        self.pool = multiprocessing.Pool(workers) if render and workers > 1 else None
+        self.on_error = on_error or (lambda kind, legacy_id, message: None)
+        self.ids = {'user': {}, 'post': {}}
+        for kind, legacy_id, object_id in LegacyRecord.objects.filter(kind__in=self.ids).values_list(
+            'kind', 'legacy_id', 'object_id'
+        ).iterator(chunk_size=20000):
+            self.ids[kind][legacy_id] = object_id
+        self.emails = {email.lower(): user_id for email, user_id in User.objects.values_list('email', 'id')}
+        self.categories = dict(Category.objects.values_list('name', 'id'))
+        self.tags = dict(Tag.objects.values_list('name', 'id'))
+        self.stats = {}
+
+    # Utilidades por lote
+
+    def count(self, kind, key, amount=1):
+        self.stats.setdefault(kind, {'imported': 0, 'skipped': 0, 'errors': 0})[key] += amount
+
+    def pending(self, kind, batch):
+        """Registros del lote aún no importados (reanudación) y sin ids repetidos"""
+        records = {}
+        for record in batch:
+            legacy_id = legacy_key(record.get('id'))
+            if not legacy_id:
+                self.reject(kind, None, 'Falta el id del registro')
+            elif legacy_id not in records:
+                records[legacy_id] = record
+        if kind in self.ids:
+            done = {legacy_id for legacy_id in records if legacy_id in self.ids[kind]}
+        else:
+            done = set(LegacyRecord.objects.filter(kind=kind, legacy_id__in=list(records)).values_list(
+                'legacy_id', flat=True
+            ))
+        self.count(kind, 'skipped', len(done))
+        return [(legacy_id, record) for legacy_id, record in records.items() if legacy_id not in done]
+
+    def reject(self, kind, legacy_id, message):
+        self.count(kind, 'errors')
+        self.on_error(kind, legacy_id, message)
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+            self.pool.join()
+
+    def render_many(self, contents):
+        if not self.render:
+            return [EMPTY_RENDER] * len(contents)
+        if self.pool:
+            return self.pool.map(render_content, contents, chunksize=max(1, len(contents) // (self.workers * 4)))
+        return [render_content(content) for content in contents]
+
+    def ensure_names(self, model, names, mapping, **defaults):
+        """Crear en bloque las categorías/etiquetas que falten y actualizar el mapa"""
+        missing = [name for name in names if name not in mapping]
+        if missing:
+            model.objects.bulk_create([model(name=name, **defaults) for name in missing], ignore_conflicts=True)
+            mapping.update(model.objects.filter(name__in=missing).values_list('name', 'id'))
+
+    def save_batch(self, kind, model, columns, rows, legacy_ids, links=None):
+        """COPY de las filas, sus enlaces M2M y su correspondencia, en una transacción"""
+        with transaction.atomic(), connection.cursor() as cursor:
+            if rows:
+                copy_rows(cursor, model, columns, rows)
+            if links:
+                copy_rows(cursor, Post.tags.through, ['post_id', 'tag_id'], links)
+            copy_rows(cursor, LegacyRecord, ['kind', 'legacy_id', 'object_id'], [
+                (kind, legacy_id, object_id) for legacy_id, object_id in legacy_ids
+            ])
+            if model is Post and rows:
+                update_search_vectors(Post.objects.filter(id__in=[row[0] for row in rows]))
+        if kind in self.ids:
+            self.ids[kind].update(legacy_ids)
+        self.count(kind, 'imported', len(rows))
+
+    # Tipos de registro
+
+    def import_users(self, records):
+        now = timezone.now()
+        columns = ['id', 'password', 'is_superuser', 'email', 'first_name', 'last_name', 'role',
+                   'profile_picture', 'is_active', 'is_staff', 'date_joined']
+        for batch in batched(records, self.batch_size):
+            valid, matched = [], []
+            for legacy_id, record in self.pending('user', batch):
+                email = User.objects.normalize_email((record.get('email') or '').strip())
+                role = record.get('role') or User.Role.STUDENT
+                try:
+                    validate_email(email)
+                    if role not in User.Role.values:
+                        raise ValueError(f'Rol no válido: {role}')
+                    date_joined = parse_timestamp(record.get('date_joined'), now)
+                except (ValidationError, ValueError) as exc:
+                    self.reject('user', legacy_id, str(getattr(exc, 'message', exc)))
+                    continue
+                if email.lower() in self.emails:
+                    # Usuario que ya existe (o repetido en el lote): solo se registra la correspondencia
+                    matched.append((legacy_id, email.lower()))
+                    continue
+                self.emails[email.lower()] = None
+                valid.append((legacy_id, email, record, role, date_joined))
+
+            with connection.cursor() as cursor:
+                ids = reserve_ids(cursor, User, len(valid)) if valid else []
+            rows = []
+            for user_id, (legacy_id, email, record, role, date_joined) in zip(ids, valid):
+                self.emails[email.lower()] = user_id
+                rows.append((
+                    user_id, make_password(None), False, email,
+                    (record.get('first_name') or '')[:150], (record.get('last_name') or '')[:150],
+                    role, '', True, False, date_joined,
+                ))
+            legacy_ids = [(legacy_id, user_id) for user_id, (legacy_id, *_) in zip(ids, valid)]
+            legacy_ids += [(legacy_id, self.emails[email]) for legacy_id, email in matched]
+            self.save_batch('user', User, columns, rows, legacy_ids)
+
+    def import_posts(self, records):
+        now = timezone.now()
+        columns = ['id', 'title', 'content', 'category_id', 'author_id', 'status', 'created_at',
+                   'updated_at', 'content_html', 'excerpt', 'reading_time', 'comments_count', 'views_count',
+                   'hot_score']
+        for batch in batched(records, self.batch_size):
+            pending = self.pending('post', batch)
+            self.ensure_names(Category, {
+                name for name in ((r.get('category') or '').strip() for _, r in pending) if 0 < len(name) <= 100
+            }, self.categories)
+            self.ensure_names(Tag, {name[:50] for _, r in pending for name in parse_tags(r.get('tags'))},
+                              self.tags)
+
+            valid = []
+            for legacy_id, record in pending:
+                title = (record.get('title') or '').strip()
+                content = record.get('content') or ''
+                status = record.get('status') or Post.Status.PUBLISHED
+                author_id = self.ids['user'].get(legacy_key(record.get('author')))
+                category_id = self.categories.get((record.get('category') or '').strip())
+                try:
+                    if not 5 <= len(title) <= 200:
+                        raise ValueError('El título debe tener entre 5 y 200 caracteres')
+                    if len(content) < 20:
+                        raise ValueError('El contenido debe tener al menos 20 caracteres')
+                    if status not in Post.Status.values:
+                        raise ValueError(f'Estado no válido: {status}')
+                    if author_id is None:
+                        raise ValueError(f"Autor desconocido: {record.get('author')}")
+                    if category_id is None:
+                        raise ValueError(f"Categoría no válida: {record.get('category')}")
+                    created_at = parse_timestamp(record.get('created_at'), now)
+                    updated_at = parse_timestamp(record.get('updated_at'), created_at)
+                except ValueError as exc:
+                    self.reject('post', legacy_id, str(exc))
+                    continue
+                valid.append((legacy_id, title, content, category_id, author_id, status, created_at,
+                              updated_at, parse_tags(record.get('tags'))))
+
+            with connection.cursor() as cursor:
+                ids = reserve_ids(cursor, Post, len(valid)) if valid else []
+            rows, links, legacy_ids = [], [], []
+            renders = self.render_many([item[2] for item in valid])
+            for post_id, rendered, (legacy_id, title, content, category_id, author_id, status, created_at,
+                                    updated_at, tags) in zip(ids, renders, valid):
+                rows.append((
+                    post_id, title, content, category_id, author_id, status, created_at, updated_at,
+                    rendered['content_html'], rendered['excerpt'], rendered['reading_time'], 0, 0,
+                    event_score('post', created_at),
+                ))
+                links.extend((post_id, tag_id) for tag_id in dict.fromkeys(self.tags[name[:50]] for name in tags))
+                legacy_ids.append((legacy_id, post_id))
+            self.save_batch('post', Post, columns, rows, legacy_ids, links)
+
+    def import_comments(self, records):
+        now = timezone.now()
+        columns = ['id', 'content', 'post_id', 'author_id', 'created_at', 'updated_at',
+                   'content_html', 'excerpt', 'reading_time', 'path', 'depth', 'replies_count']
+        for batch in batched(records, self.batch_size):
+            valid = []
+            for legacy_id, record in self.pending('comment', batch):
+                content = record.get('content') or ''
+                post_id = self.ids['post'].get(legacy_key(record.get('post')))
+                author_id = self.ids['user'].get(legacy_key(record.get('author')))
+                try:
+                    if len(content) < 5:
+                        raise ValueError('El comentario debe tener al menos 5 caracteres')
+                    if post_id is None:
+                        raise ValueError(f"Post desconocido: {record.get('post')}")
+                    if author_id is None:
+                        raise ValueError(f"Autor desconocido: {record.get('author')}")
+                    created_at = parse_timestamp(record.get('created_at'), now)
+                    updated_at = parse_timestamp(record.get('updated_at'), created_at)
+                except ValueError as exc:
+                    self.reject('comment', legacy_id, str(exc))
+                    continue
+                valid.append((legacy_id, content, post_id, author_id, created_at, updated_at))
+
+            with connection.cursor() as cursor:
+                ids = reserve_ids(cursor, Comment, len(valid)) if valid else []
+            rows, legacy_ids = [], []
+            renders = self.render_many([item[1] for item in valid])
+            for comment_id, rendered, (legacy_id, content, post_id, author_id, created_at,
+                                       updated_at) in zip(ids, renders, valid):
+                rows.append((
+                    comment_id, content, post_id, author_id, created_at, updated_at,
+                    rendered['content_html'], rendered['excerpt'], rendered['reading_time'],
+                    path_segment(comment_id), 0, 0,
+                ))
+                legacy_ids.append((legacy_id, comment_id))
+            self.save_batch('comment', Comment, columns, rows, legacy_ids)
@@ -0,0 +1,46 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from posts.models import Post
+from posts.search import search_posts
+
+
+class Command(BaseCommand):
+    help = 'Comparar la búsqueda ILIKE (icontains) con la búsqueda de texto completo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('terms', nargs='*', default=['examen', 'database server', 'beca semestre'])
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=10)
+
+    def run(self, build_queryset, iterations, page_size):
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            queryset = build_queryset()
+            queryset.count()
+            list(queryset[:page_size])
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        page_size = options['page_size']
+        base = Post.objects.filter(status='PUBLISHED')
+        self.stdout.write(f'Posts publicados: {base.count()}')
+
+        for term in options['terms']:
+            icontains = self.run(
+                lambda: base.filter(Q(title__icontains=term) | Q(content__icontains=term)).order_by('-created_at'),
+                iterations, page_size
+            )
+            fulltext = self.run(
+                lambda: search_posts(base, term).order_by('-search_rank', '-created_at'),
+                iterations, page_size
+            )
+            self.stdout.write(
+                f'"{term}": icontains p50={icontains[0]:.1f}ms p95={icontains[1]:.1f}ms | '
+                f'texto completo p50={fulltext[0]:.1f}ms p95={fulltext[1]:.1f}ms'
+            )
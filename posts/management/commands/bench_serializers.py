@@ -0,0 +1,83 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from accounts.models import User
+from accounts.serializers import UserSerializer
+from campus_forum.compiled import CompiledReadMixin
+from categories.models import Category
+from categories.serializers import CategorySerializer
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from posts.models import Post
+from posts.serializers import PostListSerializer, PostSerializer
+from reports.models import Report
+from reports.serializers import ReportSerializer
+
+
+class Command(BaseCommand):
+    help = 'Comparar la serialización compilada con la genérica de DRF (ejecutar antes seed_posts)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500)
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        request = Request(RequestFactory().get('/api/'))
+        context = {'request': request}
+
+        # Se cargan una sola vez: solo se mide la serialización (sin consultas)
+        posts = list(Post.objects.select_related('author', 'category').prefetch_related('tags')
+                     .defer('search_vector')[:rows])
+        for post in posts:
+            post.category.posts_count_annotated = 0
+        comments = list(Comment.objects.select_related('author', 'post__author', 'post__category')
+                        .prefetch_related('post__tags').defer('post__search_vector')[:rows])
+        for comment in comments:
+            comment.post.category.posts_count_annotated = 0
+        reports = list(Report.objects.select_related(
+            'reported_by', 'reviewed_by', 'post__author', 'post__category', 'comment__author',
+            'comment__post__author', 'comment__post__category'
+        ).prefetch_related('post__tags', 'comment__post__tags')[:rows])
+        for report in reports:
+            for post in (report.post, report.comment and report.comment.post):
+                if post:
+                    post.category.posts_count_annotated = 0
+        categories = list(Category.objects.all()[:rows])
+        for category in categories:
+            category.posts_count_annotated = 0
+        users = list(User.objects.all()[:rows])
+
+        cases = [
+            ('PostSerializer', PostSerializer, posts),
+            ('PostListSerializer', PostListSerializer, posts),
+            ('CommentSerializer', CommentSerializer, comments),
+            ('ReportSerializer', ReportSerializer, reports),
+            ('CategorySerializer', CategorySerializer, categories),
+            ('UserSerializer', UserSerializer, users),
+        ]
+        renderer = JSONRenderer()
+        for name, serializer_class, objects in cases:
+            if not objects:
+                self.stdout.write(f'{name}: sin datos')
+                continue
+            results = {}
+            for compiled in (False, True):
+                CompiledReadMixin.compiled_read = compiled
+                timings = []
+                for _ in range(options['iterations']):
+                    start = time.perf_counter()
+                    data = serializer_class(objects, many=True, context=context).data
+                    timings.append((time.perf_counter() - start) * 1000)
+                results[compiled] = (statistics.median(timings), renderer.render(data))
+            CompiledReadMixin.compiled_read = True
+
+            generic, compiled = results[False], results[True]
+            identical = 'idéntica' if generic[1] == compiled[1] else 'DIFERENTE'
+            self.stdout.write(
+                f'{name} ({len(objects)} filas): DRF={generic[0]:.2f}ms compilado={compiled[0]:.2f}ms '
+                f'x{generic[0] / compiled[0]:.1f} salida {identical}'
+            )
@@ -0,0 +1,36 @@
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from posts.models import Post, Tag
+from posts.search import suggest
+
+
+class Command(BaseCommand):
+    help = 'Medir la latencia del autocompletado trigram (ejecutar antes seed_posts)'
+
+    def add_arguments(self, parser):
+        # Prefijos que se envían mientras se escribe y términos con errores de tipeo
+        parser.add_argument('terms', nargs='*', default=[
+            'ex', 'exa', 'exam', 'exman', 'calc', 'calcluo', 'progra', 'porgramacion', 'datbase',
+        ])
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--limit', type=int, default=5)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.filter(status='PUBLISHED')
+        tags = Tag.objects.all()
+        self.stdout.write(f'Posts publicados: {posts.count()}, etiquetas: {tags.count()}')
+
+        for term in options['terms']:
+            timings = []
+            for _ in range(options['iterations']):
+                start = time.perf_counter()
+                found = list(suggest(posts, 'title', term, options['limit']).values_list('title', flat=True))
+                list(suggest(tags, 'name', term, options['limit']).values_list('name', flat=True))
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            best = found[0] if found else '-'
+            self.stdout.write(
+                f'"{term}": p50={statistics.median(timings):.2f}ms p95={p95:.2f}ms mejor="{best}"'
+            )
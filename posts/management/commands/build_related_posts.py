@@ -0,0 +1,78 @@
+import time
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from posts.models import Post, RelatedPost
+from posts.related import feature_matrix, top_neighbours
+
+
+class Command(BaseCommand):
+    help = 'Precalcular posts relacionados (TF-IDF de texto + coocurrencia de etiquetas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=5)
+        parser.add_argument('--since', help='Recalcular solo los posts actualizados desde esta fecha (ISO 8601)')
+        parser.add_argument('--chunk-size', type=int, default=512, help='Filas por bloque de similitud')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Filas por INSERT')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        since = None
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError('--since debe ser una fecha ISO 8601')
+
+        published = Post.objects.filter(status='PUBLISHED').order_by('id')
+        ids, titles, contents = [], [], []
+        for post_id, title, content in published.values_list('id', 'title', 'content').iterator(chunk_size=5000):
+            ids.append(post_id)
+            titles.append(title)
+            contents.append(content)
+        if len(ids) < 2:
+            self.stdout.write('No hay suficientes posts publicados')
+            return
+        ids = np.asarray(ids)
+
+        links = Post.tags.through.objects.filter(post__status='PUBLISHED').values_list('post_id', 'tag_id')
+        tag_posts, tag_ids = [], []
+        for post_id, tag_id in links.iterator(chunk_size=20000):
+            tag_posts.append(post_id)
+            tag_ids.append(tag_id)
+        tag_rows = np.searchsorted(ids, np.asarray(tag_posts, dtype=ids.dtype)).tolist()
+
+        features = feature_matrix(titles, contents, tag_rows, tag_ids)
+        del titles, contents
+        self.stdout.write(
+            f'Matriz {features.shape[0]}x{features.shape[1]} ({features.nnz} no nulos) '
+            f'en {time.perf_counter() - started:.1f}s'
+        )
+
+        if since is None:
+            targets = np.arange(len(ids))
+        else:
+            changed = published.filter(updated_at__gte=since).values_list('id', flat=True)
+            targets = np.searchsorted(ids, np.fromiter(changed, dtype=ids.dtype))
+
+        batch_size = options['batch_size']
+        total = 0
+        with transaction.atomic():
+            if since is None:
+                RelatedPost.objects.all().delete()
+            else:
+                RelatedPost.objects.filter(post_id__in=ids[targets].tolist()).delete()
+            batch = []
+            for row, neighbour, score in top_neighbours(features, targets, options['top_k'], options['chunk_size']):
+                batch.append(RelatedPost(post_id=int(ids[row]), related_id=int(ids[neighbour]), score=score))
+                if len(batch) >= batch_size:
+                    RelatedPost.objects.bulk_create(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                RelatedPost.objects.bulk_create(batch)
+                total += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} relaciones para {len(targets)} posts en {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from comments.models import Comment
+from posts.models import Post, PostDailyViews, Tag
+from posts.trending import compact_scores
+
+
+class Command(BaseCommand):
+    help = 'Recalcular los puntajes de tendencia de posts y etiquetas sobre la ventana deslizante'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            posts, tags = compact_scores(Post, Tag, Comment, views_model=PostDailyViews)
+        self.stdout.write(self.style.SUCCESS(f'Tendencias recalculadas: {posts} posts, {tags} etiquetas'))
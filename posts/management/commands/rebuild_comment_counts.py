@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from comments.models import Comment
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Recalcular los contadores desnormalizados de comentarios de cada post y de respuestas de cada comentario'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Filas por UPDATE (rangos de id, para no bloquear la tabla completa)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        counts = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(
+            total=Count('id')
+        ).values('total')
+
+        last_id = Post.objects.aggregate(last=Max('id'))['last'] or 0
+        updated = 0
+        for start in range(0, last_id + 1, batch_size):
+            with transaction.atomic():
+                updated += Post.objects.filter(id__gte=start, id__lt=start + batch_size).update(
+                    comments_count=Coalesce(Subquery(counts), 0)
+                )
+        self.stdout.write(self.style.SUCCESS(f'Contadores recalculados para {updated} posts'))
+        
+        replies = Comment.objects.filter(parent=OuterRef('pk')).order_by().values('parent').annotate(
+            total=Count('id')
+        ).values('total')
+        last_id = Comment.objects.aggregate(last=Max('id'))['last'] or 0
+        updated = 0
+        for start in range(0, last_id + 1, batch_size):
+            with transaction.atomic():
+                updated += Comment.objects.filter(id__gte=start, id__lt=start + batch_size).update(
+                    replies_count=Coalesce(Subquery(replies), 0)
+                )
+        self.stdout.write(self.style.SUCCESS(f'Respuestas recalculadas para {updated} comentarios'))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from campus_forum.rendering import RENDERED_FIELDS, apply_rendered_content
+from comments.models import Comment
+from posts.caching import bump_feed_generation
+from posts.models import Post
+
+MODELS = {
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+class Command(BaseCommand):
+    help = 'Renderizar (markdown a HTML saneado, extracto y tiempo de lectura) posts y comentarios existentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(MODELS), action='append',
+                            help='Limitar a posts o comentarios (por defecto ambos)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Filas por lote (un bulk_update por lote)')
+        parser.add_argument('--missing', action='store_true',
+                            help='Procesar solo filas sin HTML renderizado')
+
+    def handle(self, *args, **options):
+        for name in options['model'] or sorted(MODELS):
+            total = self.render_model(MODELS[name], options['batch_size'], options['missing'])
+            self.stdout.write(f'{name}: {total} filas renderizadas')
+        # Los listados cacheados contienen los extractos anteriores
+        bump_feed_generation()
+        self.stdout.write(self.style.SUCCESS('Contenido renderizado'))
+
+    def render_model(self, model, batch_size, missing):
+        queryset = model.objects.order_by('id').only('id', 'content')
+        if missing:
+            queryset = queryset.filter(content_html='')
+
+        last_id, total = 0, 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                return total
+            for instance in batch:
+                apply_rendered_content(instance)
+            with transaction.atomic():
+                model.objects.bulk_update(batch, RENDERED_FIELDS)
+            last_id = batch[-1].id
+            total += len(batch)
@@ -0,0 +1,78 @@
+import random
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from accounts.models import User
+from campus_forum.rendering import render_content
+from categories.models import Category
+from posts.models import Post, Tag
+from posts.search import update_search_vectors
+from posts.trending import event_score
+
+VOCABULARY = (
+    'examen parcial tarea proyecto laboratorio biblioteca horario profesor '
+    'calculo algebra fisica quimica programacion redes bases datos servidor '
+    'beca inscripcion semestre cafeteria deportes torneo club asesoria '
+    'exam homework project library schedule lecture calculus physics '
+    'chemistry programming network database server scholarship enrollment '
+    'semester campus sports tournament tutoring deadline grade credits'
+).split()
+
+
+class Command(BaseCommand):
+    help = 'Generar posts sintéticos para pruebas de rendimiento'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000)
+        parser.add_argument('--tags', type=int, default=50, help='Número de etiquetas a usar')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        author, _ = User.objects.get_or_create(
+            email='bench@campusforum.local',
+            defaults={'first_name': 'Bench', 'last_name': 'User'}
+        )
+        category, _ = Category.objects.get_or_create(
+            name='Benchmark',
+            defaults={'description': 'Datos sintéticos', 'created_by': author}
+        )
+        tags = [
+            Tag.objects.get_or_create(name=f'{word}-{i}')[0]
+            for i, word in enumerate(rng.sample(VOCABULARY * 3, options['tags']))
+        ]
+        TagLink = Post.tags.through
+
+        remaining = options['count']
+        batch_size = options['batch_size']
+        while remaining > 0:
+            size = min(batch_size, remaining)
+            with transaction.atomic():
+                posts = []
+                for _ in range(size):
+                    content = ' '.join(rng.choices(VOCABULARY, k=rng.randint(30, 200)))
+                    posts.append(Post(
+                        title=' '.join(rng.choices(VOCABULARY, k=rng.randint(3, 8))).capitalize(),
+                        content=content,
+                        **render_content(content),
+                        hot_score=event_score('post'),
+                        category=category,
+                        author=author,
+                        status=rng.choice(['PUBLISHED'] * 8 + ['DRAFT', 'ARCHIVED']),
+                    ))
+                posts = Post.objects.bulk_create(posts)
+                if tags:
+                    TagLink.objects.bulk_create([
+                        TagLink(post_id=post.id, tag_id=tag.id)
+                        for post in posts
+                        for tag in rng.sample(tags, rng.randint(0, min(3, len(tags))))
+                    ])
+                # bulk_create no dispara señales: recalcular vectores de búsqueda del lote
+                update_search_vectors(Post.objects.filter(id__in=[post.id for post in posts]))
+            remaining -= size
+            self.stdout.write(f'{options["count"] - remaining}/{options["count"]} posts creados')
+
+        # bulk_create tampoco pasa por las señales de estadísticas
+        call_command('rollup_analytics', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Datos sintéticos generados'))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-18 06:58
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# Copia de posts.search al crear la migración: cambiar el módulo no debe
+# cambiar lo que hace una migración ya aplicada en otras bases
+SEARCH_CONFIGS = ('spanish', 'english')
+SEARCH_WEIGHTS = (('title', 'A'), ('content', 'B'))
+
+
+def populate_search_vector(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    vector = None
+    for config in SEARCH_CONFIGS:
+        for field, weight in SEARCH_WEIGHTS:
+            part = SearchVector(field, weight=weight, config=config)
+            vector = part if vector is None else vector + part
+    Post.objects.update(search_vector=vector)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='posts_post_search_gin'),
+        ),
+    ]
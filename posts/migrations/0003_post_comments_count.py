@@ -0,0 +1,31 @@
+# Generated by Django 4.2 on 2026-10-18 07:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_comments_count(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('comments', 'Comment')
+    counts = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(
+        total=Count('id')
+    ).values('total')
+    Post.objects.update(comments_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+        ('posts', '0002_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Comentarios'),
+        ),
+        migrations.RunPython(populate_comments_count, migrations.RunPython.noop),
+    ]
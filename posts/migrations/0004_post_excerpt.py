@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-18 07:02
+
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+EXCERPT_LENGTH = 280
+
+
+def build_excerpt(content):
+    """Copia de posts.models.build_excerpt al crear la migración"""
+    return Truncator(' '.join((content or '').split())).chars(EXCERPT_LENGTH)
+
+
+def populate_excerpt(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    batch = []
+    for post in Post.objects.only('id', 'content').iterator(chunk_size=2000):
+        post.excerpt = build_excerpt(post.content)
+        batch.append(post)
+        if len(batch) >= 2000:
+            Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_comments_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=280, verbose_name='Extracto'),
+        ),
+        migrations.RunPython(populate_excerpt, migrations.RunPython.noop),
+    ]
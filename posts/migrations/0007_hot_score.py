@@ -0,0 +1,86 @@
+# Generated by Django 4.2 on 2026-10-18 07:08
+
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+# Copia de posts.trending (compact_scores) al crear la migración: época, pesos
+# y fórmula quedan fijos aunque el módulo cambie después
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+POST_WEIGHT = 1.0
+COMMENT_WEIGHT = 3.0
+
+
+def populate_hot_score(apps, schema_editor):
+    import numpy as np
+
+    Post = apps.get_model('posts', 'Post')
+    Tag = apps.get_model('posts', 'Tag')
+    Comment = apps.get_model('comments', 'Comment')
+    decay_rate = math.log(2) / timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS).total_seconds()
+    since = timezone.now() - timedelta(days=settings.TRENDING_WINDOW_DAYS)
+
+    posts = list(Post.objects.order_by('id').values_list('id', 'created_at'))
+    if not posts:
+        return
+    post_ids = np.fromiter((post_id for post_id, _ in posts), dtype=np.int64, count=len(posts))
+    created = np.fromiter(
+        ((when - EPOCH).total_seconds() for _, when in posts), dtype=np.float64, count=len(posts)
+    )
+    # Los comentarios de la ventana cuentan para el post y sus etiquetas; la creación solo para el post
+    activity = np.full(len(posts), -np.inf)
+    comments = list(Comment.objects.filter(created_at__gte=since).values_list('post_id', 'created_at'))
+    if comments:
+        rows = np.searchsorted(post_ids, [post_id for post_id, _ in comments])
+        times = np.asarray([(when - EPOCH).total_seconds() for _, when in comments])
+        np.logaddexp.at(activity, rows, math.log(COMMENT_WEIGHT) + decay_rate * times)
+    post_scores = np.logaddexp(math.log(POST_WEIGHT) + decay_rate * created, activity)
+
+    tag_ids = np.asarray(list(Tag.objects.order_by('id').values_list('id', flat=True)), dtype=np.int64)
+    tag_scores = np.zeros(len(tag_ids))
+    links = list(Post.tags.through.objects.values_list('post_id', 'tag_id'))
+    if links and len(tag_ids):
+        tag_scores.fill(-np.inf)
+        post_rows = np.searchsorted(post_ids, [post_id for post_id, _ in links])
+        tag_rows = np.searchsorted(tag_ids, [tag_id for _, tag_id in links])
+        np.logaddexp.at(tag_scores, tag_rows, activity[post_rows])
+        tag_scores[np.isneginf(tag_scores)] = 0.0
+
+    Post.objects.bulk_update([
+        Post(id=int(pk), hot_score=float(score)) for pk, score in zip(post_ids, post_scores)
+    ], ['hot_score'], batch_size=2000)
+    Tag.objects.bulk_update([
+        Tag(id=int(pk), hot_score=float(score)) for pk, score in zip(tag_ids, tag_scores)
+    ], ['hot_score'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0001_initial'),
+        ('posts', '0006_relatedpost'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='hot_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='hot_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-hot_score'], name='posts_post_status_f00f46_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-hot_score'], name='posts_tag_hot_sco_4aa3e2_idx'),
+        ),
+        migrations.RunPython(populate_hot_score, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_rendered_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LegacyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=10, verbose_name='Tipo')),
+                ('legacy_id', models.CharField(max_length=64, verbose_name='Id anterior')),
+                ('object_id', models.BigIntegerField(verbose_name='Id actual')),
+            ],
+            options={
+                'verbose_name': 'Registro importado',
+                'verbose_name_plural': 'Registros importados',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='legacyrecord',
+            constraint=models.UniqueConstraint(fields=('kind', 'legacy_id'), name='posts_legacyrecord_unique'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2 on 2026-10-18 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_legacyrecord'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='posts_post_categor_b4269f_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['category', 'status', '-comments_count'], name='posts_post_categor_af700f_idx'),
+        ),
+    ]
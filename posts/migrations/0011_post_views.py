@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-18 07:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_category_comments_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Visitas'),
+        ),
+        migrations.CreateModel(
+            name='PostDailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Visitas')),
+                ('unique_visitors', models.PositiveIntegerField(default=0, verbose_name='Visitantes únicos')),
+                ('visitors', models.BinaryField(default=bytes, verbose_name='Boceto de visitantes')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='posts.post', verbose_name='Publicación')),
+            ],
+            options={
+                'verbose_name': 'Visitas diarias',
+                'verbose_name_plural': 'Visitas diarias',
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postdailyviews',
+            index=models.Index(fields=['day'], name='posts_postd_day_93aa7c_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='postdailyviews',
+            constraint=models.UniqueConstraint(fields=('post', 'day'), name='posts_postdailyviews_unique'),
+        ),
+    ]
@@ -1,18 +1,49 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinLengthValidator
+from django.utils.text import Truncator
 from accounts.models import User
+from campus_forum.rendering import EXCERPT_LENGTH
 from categories.models import Category
+from .trending import event_score
+
+
+def build_excerpt(content, length=EXCERPT_LENGTH):
+    """Extracto de texto plano con espacios normalizados"""
+    return Truncator(' '.join((content or '').split())).chars(length)
+
+
+def fields_without_counters(instance, counters):
+    """
+    Columnas que escribe un save() sin update_fields sobre una fila existente.
+
+    Los contadores se actualizan con UPDATE ... F() desde otros procesos
+    (comentarios, visitas, tendencias): guardar la copia leída antes los
+    pisaría. Como Django, tampoco se escriben los campos diferidos.
+    """
+    deferred = instance.get_deferred_fields()
+    return [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in counters and field.attname not in deferred
+    ]
 
 
 class Tag(models.Model):
     """Etiquetas opcionales para clasificar posts"""
     name = models.CharField(max_length=50, unique=True, verbose_name='Nombre')
     created_at = models.DateTimeField(auto_now_add=True)
+    # Puntaje de tendencia en espacio logarítmico (ver posts.trending)
+    hot_score = models.FloatField(default=0, editable=False)
     
     class Meta:
         verbose_name = 'Etiqueta'
         verbose_name_plural = 'Etiquetas'
         ordering = ['name']
+        indexes = [
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='posts_tag_name_trgm'),
+            models.Index(fields=['-hot_score']),
+        ]
     
     def __str__(self):
         return self.name
@@ -59,6 +90,21 @@ class Post(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Fecha de creación')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Fecha de actualización')
+    # Render precalculado al escribir (ver campus_forum.rendering)
+    content_html = models.TextField(blank=True, editable=False, verbose_name='Contenido HTML')
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False, verbose_name='Extracto')
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Minutos de lectura')
+    # Contador desnormalizado, se mantiene en comments.signals
+    comments_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Comentarios')
+    # Visitas acumuladas, escritas por lotes desde posts.view_counter
+    views_count = models.PositiveIntegerField(default=0, editable=False, verbose_name='Visitas')
+    # Puntaje de tendencia en espacio logarítmico (ver posts.trending)
+    hot_score = models.FloatField(default=0, editable=False)
+    # Vector de búsqueda de texto completo (título con más peso que el contenido)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    # Fuera de los save() completos; el tsvector lo recalcula posts.signals
+    COUNTER_FIELDS = ('comments_count', 'views_count', 'hot_score', 'search_vector')
     
     class Meta:
         verbose_name = 'Publicación'
@@ -66,12 +112,107 @@ class Post(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['-created_at', 'status']),
-            models.Index(fields=['category', 'status']),
+            # Con -comments_count: los más comentados de una categoría (analytics.category_stats)
+            models.Index(fields=['category', 'status', '-comments_count']),
+            GinIndex(fields=['search_vector'], name='posts_post_search_gin'),
+            GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name='posts_post_title_trgm'),
+            models.Index(fields=['status', '-hot_score']),
         ]
     
     def __str__(self):
         return self.title
     
-    @property
-    def comments_count(self):
-        return self.comments.count()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado y categoría leídos de la BD, para detectar cambios al guardar
+        # (ver posts.signals y analytics.signals)
+        if 'status' in field_names:
+            instance._loaded_status = values[field_names.index('status')]
+        if 'category_id' in field_names:
+            instance._loaded_category_id = values[field_names.index('category_id')]
+        return instance
+    
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.hot_score:
+            # La creación cuenta como primer evento: los posts nuevos arrancan "calientes"
+            self.hot_score = event_score('post')
+        elif not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = fields_without_counters(self, self.COUNTER_FIELDS)
+        super().save(*args, **kwargs)
+        # Las señales post_save ya compararon con lo leído: lo guardado pasa a ser la referencia
+        self._loaded_status = self.status
+        self._loaded_category_id = self.category_id
+
+
+class RelatedPost(models.Model):
+    """Vecinos más similares de cada post, precalculados por build_related_posts"""
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='related_links',
+        verbose_name='Publicación'
+    )
+    related = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Publicación relacionada'
+    )
+    score = models.FloatField(verbose_name='Similitud')
+    
+    class Meta:
+        verbose_name = 'Publicación relacionada'
+        verbose_name_plural = 'Publicaciones relacionadas'
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'related'], name='posts_relatedpost_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.post_id} -> {self.related_id} ({self.score:.3f})"
+
+
+class PostDailyViews(models.Model):
+    """Visitas de un post por día, con el boceto HyperLogLog de sus visitantes (ver posts.view_counter)"""
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='daily_views',
+        verbose_name='Publicación'
+    )
+    day = models.DateField(verbose_name='Día')
+    views = models.PositiveIntegerField(default=0, verbose_name='Visitas')
+    # Estimación guardada al escribir: las lecturas no decodifican el boceto
+    unique_visitors = models.PositiveIntegerField(default=0, verbose_name='Visitantes únicos')
+    visitors = models.BinaryField(default=bytes, verbose_name='Boceto de visitantes')
+    
+    class Meta:
+        verbose_name = 'Visitas diarias'
+        verbose_name_plural = 'Visitas diarias'
+        ordering = ['-day']
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'day'], name='posts_postdailyviews_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+    
+    def __str__(self):
+        return f"{self.post_id} - {self.day}"
+
+
+class LegacyRecord(models.Model):
+    """Correspondencia entre ids del foro anterior e ids actuales (ver import_forum)"""
+    kind = models.CharField(max_length=10, verbose_name='Tipo')
+    legacy_id = models.CharField(max_length=64, verbose_name='Id anterior')
+    object_id = models.BigIntegerField(verbose_name='Id actual')
+    
+    class Meta:
+        verbose_name = 'Registro importado'
+        verbose_name_plural = 'Registros importados'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'legacy_id'], name='posts_legacyrecord_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.legacy_id} -> {self.object_id}"
@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.utils import timezone
+from campus_forum.cache import deferred_generation_bumps
+from campus_forum.events import publish_event
+from analytics.rollups import RollupDelta
+from categories.index import bump_category_generation
+from comments.signals import suspend_comment_counters
+from .caching import bump_feed_generation
+from .models import Post
+from .signals import status_channels
+from .tag_index import bump_tag_generation
+
+BULK_STATUS = {
+    'publish': Post.Status.PUBLISHED,
+    'archive': Post.Status.ARCHIVED,
+}
+
+
+def apply_bulk_action(user, ids, action):
+    """
+    Publicar, archivar o eliminar varios posts en una transacción.
+
+    Los permisos (autor o moderador) se verifican con una sola consulta y el
+    cambio se aplica con un único UPDATE/DELETE sobre los ids permitidos.
+    Devuelve el resultado por id: 'ok', 'not_found' o 'forbidden'.
+    """
+    ids = list(dict.fromkeys(ids))
+    is_moderator = user.role in ['ADMIN', 'PROFESSOR']
+
+    with transaction.atomic(), deferred_generation_bumps():
+        locked = {
+            post.id: post for post in Post.objects.select_for_update().filter(id__in=ids).only(
+                'id', 'author_id', 'category_id', 'status', 'title', 'created_at'
+            )
+        }
+        authors = {post_id: post.author_id for post_id, post in locked.items()}
+        outcomes = {}
+        for post_id in ids:
+            if post_id not in authors:
+                outcomes[post_id] = 'not_found'
+            elif not is_moderator and authors[post_id] != user.id:
+                outcomes[post_id] = 'forbidden'
+            else:
+                outcomes[post_id] = 'ok'
+
+        allowed = [post_id for post_id in ids if outcomes[post_id] == 'ok']
+        if allowed:
+            queryset = Post.objects.filter(id__in=allowed)
+            if action == 'delete':
+                # Los comentarios se van con sus posts: no hay contadores que ajustar
+                with suspend_comment_counters():
+                    queryset.delete()
+            else:
+                status = BULK_STATUS[action]
+                queryset.update(status=status, updated_at=timezone.now())
+                # UPDATE no dispara señales: publicar aquí los cambios de estado
+                # y ajustar los resúmenes de estadísticas
+                transitions = []
+                for post_id in allowed:
+                    post = locked[post_id]
+                    if post.status != status:
+                        publish_event(status_channels(post, post.status, status), 'post.status', {
+                            'id': post.id,
+                            'title': post.title,
+                            'category_id': post.category_id,
+                            'status': status,
+                            'previous_status': post.status,
+                        })
+                        transitions.append((post, post.status, post.category_id))
+                        post.status = status
+                delta = RollupDelta()
+                delta.post_transitions(transitions)
+                delta.apply_on_commit()
+            bump_feed_generation()
+            bump_tag_generation()
+            bump_category_generation()
+
+    return [{'id': post_id, 'result': outcomes[post_id]} for post_id in ids]
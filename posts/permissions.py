@@ -17,5 +17,3 @@ class IsAuthorOrModerator(permissions.BasePermission):
             return True
         
         return False
-
-
@@ -0,0 +1,104 @@
+"""
+Cálculo de posts relacionados (trabajo fuera de línea).
+
+Cada post se representa como la concatenación de dos vectores normalizados:
+TF-IDF de título y contenido, y etiquetas ponderadas por IDF. El producto
+punto de dos filas es entonces una mezcla ponderada de la similitud coseno de
+texto y de etiquetas. La similitud se calcula por bloques de filas con álgebra
+dispersa, sin bucles de Python por par de posts.
+"""
+import re
+import numpy as np
+from scipy import sparse
+
+TOKEN_RE = re.compile(r'\w{3,}', re.UNICODE)
+TITLE_BOOST = 3
+TEXT_WEIGHT = 0.6
+TAGS_WEIGHT = 0.4
+MAX_DF_RATIO = 0.5
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(matrix).tocsr()
+
+
+def _idf(matrix, n_docs):
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    return df, np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+
+def text_matrix(titles, contents):
+    """Matriz TF-IDF (tf sublineal) normalizada por filas"""
+    vocabulary = {}
+    indptr, indices, counts = [0], [], []
+    for title, content in zip(titles, contents):
+        row = {}
+        for weight, text in ((TITLE_BOOST, title), (1, content)):
+            for token in TOKEN_RE.findall((text or '').lower()):
+                column = vocabulary.setdefault(token, len(vocabulary))
+                row[column] = row.get(column, 0) + weight
+        indices.extend(row.keys())
+        counts.extend(row.values())
+        indptr.append(len(indices))
+
+    n_docs = len(indptr) - 1
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr)),
+        shape=(n_docs, len(vocabulary))
+    )
+    df, idf = _idf(matrix, n_docs)
+    # Descartar términos únicos (no relacionan nada) y demasiado comunes
+    keep = np.flatnonzero((df >= 2) & (df <= max(2, MAX_DF_RATIO * n_docs)))
+    matrix = matrix[:, keep]
+    matrix.data = 1.0 + np.log(matrix.data)
+    matrix = matrix.dot(sparse.diags(idf[keep].astype(np.float32)))
+    return _normalize_rows(matrix)
+
+
+def tag_matrix(n_docs, rows, columns):
+    """Matriz posts x etiquetas binaria ponderada por IDF, normalizada por filas"""
+    if not rows:
+        return sparse.csr_matrix((n_docs, 0), dtype=np.float32)
+    _, tag_ids = np.unique(np.asarray(columns), return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.asarray(rows), tag_ids)),
+        shape=(n_docs, tag_ids.max() + 1)
+    )
+    _, idf = _idf(matrix, n_docs)
+    return _normalize_rows(matrix.dot(sparse.diags(idf.astype(np.float32))))
+
+
+def feature_matrix(titles, contents, tag_rows, tag_columns):
+    n_docs = len(titles)
+    return sparse.hstack([
+        np.sqrt(TEXT_WEIGHT) * text_matrix(titles, contents),
+        np.sqrt(TAGS_WEIGHT) * tag_matrix(n_docs, tag_rows, tag_columns),
+    ]).tocsr().astype(np.float32)
+
+
+def top_neighbours(features, rows, top_k, chunk_size=512):
+    """
+    Para cada fila en `rows`, los `top_k` vecinos más similares (excluyendo la propia).
+
+    Genera tuplas (fila, vecino, puntuación) con puntuación > 0.
+    """
+    transposed = features.T.tocsc()
+    rows = np.asarray(rows)
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        scores = (features[chunk] @ transposed).toarray()
+        scores[np.arange(len(chunk)), chunk] = 0.0
+        k = min(top_k, scores.shape[1] - 1)
+        if k <= 0:
+            return
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = np.take_along_axis(scores, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        for row, neighbours, values in zip(chunk, best, best_scores):
+            for neighbour, score in zip(neighbours, values):
+                if score > 0:
+                    yield int(row), int(neighbour), float(score)
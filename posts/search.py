@@ -0,0 +1,92 @@
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db.models import Case, F, When
+from django.utils.html import escape
+
+# Configuraciones de texto usadas para indexar y buscar (el foro es bilingüe)
+SEARCH_CONFIGS = ('spanish', 'english')
+
+# Pesos: el título pesa más que el contenido
+SEARCH_WEIGHTS = (('title', 'A'), ('content', 'B'))
+
+# Marcadores neutros del fragmento: ts_headline trabaja sobre el contenido sin
+# escapar, así que el HTML (<mark>) se arma en highlight_headline tras escaparlo
+HEADLINE_START = '\x02'
+HEADLINE_STOP = '\x03'
+
+
+def build_search_vector():
+    """Expresión tsvector ponderada de título y contenido en todas las configuraciones"""
+    vector = None
+    for config in SEARCH_CONFIGS:
+        for field, weight in SEARCH_WEIGHTS:
+            part = SearchVector(field, weight=weight, config=config)
+            vector = part if vector is None else vector + part
+    return vector
+
+
+def build_search_query(text):
+    """Consulta tsquery que acepta sintaxis tipo buscador web en ambos idiomas"""
+    query = None
+    for config in SEARCH_CONFIGS:
+        part = SearchQuery(text, config=config, search_type='websearch')
+        query = part if query is None else query | part
+    return query
+
+
+def update_search_vectors(queryset):
+    """Recalcular search_vector para las filas del queryset en un solo UPDATE"""
+    return queryset.update(search_vector=build_search_vector())
+
+
+def highlight_headline(headline):
+    """Fragmento de search_posts como HTML seguro: contenido escapado y coincidencias en <mark>"""
+    if headline is None:
+        return None
+    return escape(headline).replace(HEADLINE_START, '<mark>').replace(HEADLINE_STOP, '</mark>')
+
+
+def search_posts(queryset, text):
+    """
+    Filtrar por búsqueda de texto completo y anotar ranking y fragmento resaltado.
+
+    El fragmento se calcula en cada configuración con su propia consulta y se usa
+    el primero que resalta algo. `search_headline` trae marcadores neutros: pasarlo
+    por highlight_headline antes de entregarlo como HTML.
+    """
+    query = build_search_query(text)
+    queryset = queryset.filter(search_vector=query).annotate(search_rank=SearchRank(F('search_vector'), query))
+    headlines = []
+    for config in SEARCH_CONFIGS:
+        name = f'search_headline_{config}'
+        queryset = queryset.annotate(**{name: SearchHeadline(
+            'content',
+            SearchQuery(text, config=config, search_type='websearch'),
+            config=config,
+            start_sel=HEADLINE_START,
+            stop_sel=HEADLINE_STOP,
+            max_words=35,
+            min_words=15,
+        )})
+        headlines.append(name)
+    return queryset.annotate(search_headline=Case(
+        *[When(**{f'{name}__contains': HEADLINE_START, 'then': F(name)}) for name in headlines[:-1]],
+        default=F(headlines[-1]),
+    ))
+
+
+def suggest(queryset, field, text, limit):
+    """
+    Coincidencias aproximadas (tolerantes a errores de tipeo) para autocompletar.
+
+    Usa similitud de palabra de pg_trgm (operador <%), que aprovecha el índice
+    GIN trigram del campo y funciona con prefijos cortos mientras se escribe.
+    """
+    return queryset.filter(**{f'{field}__trigram_word_similar': text}).annotate(
+        similarity=TrigramWordSimilarity(text, field)
+    ).order_by('-similarity', field)[:limit]
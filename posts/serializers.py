@@ -1,53 +1,90 @@
 from rest_framework import serializers
 from django.core.validators import MinLengthValidator
 from .models import Post, Tag
+from .search import highlight_headline
+from categories.models import Category
 from categories.serializers import CategorySerializer
 from accounts.serializers import UserSerializer
+from campus_forum.compiled import CompiledReadMixin
+from campus_forum.serializers import RenderedContentMixin, SparseFieldsetMixin
 
 
-class TagSerializer(serializers.ModelSerializer):
+def add_search_fields(instance, data):
+    """Resultados de búsqueda: incluir relevancia y fragmento resaltado"""
+    if hasattr(instance, 'search_headline'):
+        data['search_rank'] = instance.search_rank
+        data['search_headline'] = highlight_headline(instance.search_headline)
+    return data
+
+
+class TagIdsField(serializers.ListField):
+    """Ids de etiquetas validados contra el índice en memoria (sin consulta por escritura)"""
+    child = serializers.IntegerField(min_value=1)
+    
+    def to_internal_value(self, data):
+        from .tag_index import get_tag_index
+        ids = list(dict.fromkeys(super().to_internal_value(data)))
+        missing = get_tag_index().missing(ids)
+        if missing:
+            # Puede ser una etiqueta recién creada en otro proceso: confirmar en la BD
+            existing = set(Tag.objects.filter(id__in=missing).values_list('id', flat=True))
+            missing = [tag_id for tag_id in missing if tag_id not in existing]
+        if missing:
+            raise serializers.ValidationError(
+                f"Etiquetas no válidas: {', '.join(str(tag_id) for tag_id in missing)}"
+            )
+        return ids
+
+
+class ActiveCategoryField(serializers.PrimaryKeyRelatedField):
+    """Categoría activa resuelta desde la instantánea en memoria (sin consulta por escritura)"""
+    
+    def to_internal_value(self, data):
+        from categories.index import get_category_index
+        try:
+            category = get_category_index().get(int(data), status=Category.Status.ACTIVE)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if category is None:
+            # Puede ser una categoría recién creada o activada en otro proceso: confirmar en la BD
+            return super().to_internal_value(data)
+        return category
+
+
+class TagSerializer(CompiledReadMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ['id', 'name']
         read_only_fields = ['id']
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsetMixin, RenderedContentMixin, CompiledReadMixin, serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagSerializer(many=True, read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    # Campos de escritura declarados una sola vez (no se reconstruyen por instancia)
+    category_id = ActiveCategoryField(
+        queryset=Category.objects.filter(status='ACTIVE'),
+        write_only=True,
+        source='category',
+        required=True
+    )
+    tag_ids = TagIdsField(
+        write_only=True,
+        source='tags',
+        required=False
+    )
     
     class Meta:
         model = Post
-        fields = ['id', 'title', 'content', 'category', 'author', 'status', 
-                 'tags', 'comments_count', 'created_at', 'updated_at']
-        read_only_fields = ['author', 'created_at', 'updated_at']
+        fields = ['id', 'title', 'content', 'content_html', 'excerpt', 'reading_time', 'category',
+                 'author', 'status', 'tags', 'comments_count', 'views_count', 'created_at',
+                 'updated_at', 'category_id', 'tag_ids']
+        read_only_fields = ['author', 'content_html', 'excerpt', 'reading_time', 'comments_count',
+                            'views_count', 'created_at', 'updated_at']
     
-    def get_comments_count(self, obj):
-        # Usar el valor annotado si existe, sino usar la propiedad del modelo
-        return getattr(obj, 'comments_count_annotated', getattr(obj, 'comments_count', obj.comments.count()))
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        from categories.models import Category
-        
-        # Agregar category_id como campo write-only
-        self.fields['category_id'] = serializers.PrimaryKeyRelatedField(
-            queryset=Category.objects.filter(status='ACTIVE'),
-            write_only=True,
-            source='category',
-            required=True
-        )
-        
-        # Agregar tag_ids como campo write-only
-        self.fields['tag_ids'] = serializers.PrimaryKeyRelatedField(
-            queryset=Tag.objects.all(),
-            many=True,
-            write_only=True,
-            source='tags',
-            required=False
-        )
+    def finalize_representation(self, instance, data):
+        return add_search_fields(instance, data)
     
     def validate_title(self, value):
         if len(value) < 5:
@@ -64,5 +101,31 @@ class PostSerializer(serializers.ModelSerializer):
         if 'category' not in validated_data:
             raise serializers.ValidationError({'category_id': 'La categoría es obligatoria'})
         return super().create(validated_data)
+
+
+class PostListSerializer(SparseFieldsetMixin, CompiledReadMixin, serializers.ModelSerializer):
+    """Representación ligera para listados: extracto en lugar del contenido y relaciones como id"""
+    tags = TagSerializer(many=True, read_only=True)
     
+    class Meta:
+        model = Post
+        fields = ['id', 'title', 'excerpt', 'reading_time', 'category', 'author', 'status',
+                 'tags', 'comments_count', 'views_count', 'created_at', 'updated_at']
+        read_only_fields = fields
+        expandable_fields = {
+            'author': UserSerializer,
+            'category': CategorySerializer,
+        }
+    
+    def finalize_representation(self, instance, data):
+        return add_search_fields(instance, data)
+
 
+class BulkPostActionSerializer(serializers.Serializer):
+    """Entrada de la moderación por lote"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
+    action = serializers.ChoiceField(choices=['publish', 'archive', 'delete'])
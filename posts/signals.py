@@ -0,0 +1,72 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from campus_forum.events import category_channel, post_channel, publish_event
+from categories.index import bump_category_generation
+from .caching import bump_feed_generation
+from .models import Post, Tag
+from .search import update_search_vectors
+from .tag_index import bump_tag_generation
+
+
+@receiver(post_save, sender=Post)
+def refresh_post_search_vector(sender, instance, update_fields=None, **kwargs):
+    """Mantener el tsvector al día cuando cambia el título o el contenido"""
+    if update_fields is not None and not {'title', 'content'} & set(update_fields):
+        return
+    update_search_vectors(Post.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_feed_on_post_change(sender, instance, **kwargs):
+    """Crear, editar, publicar, archivar o eliminar un post invalida el feed cacheado"""
+    bump_feed_generation()
+    # El uso de etiquetas y los totales por categoría cuentan solo posts publicados
+    bump_tag_generation()
+    bump_category_generation()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_feed_on_post_tags_change(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_feed_generation()
+        bump_tag_generation()
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_index(sender, instance, **kwargs):
+    bump_tag_generation()
+
+
+def status_channels(post, *statuses):
+    """El stream de la categoría solo ve lo que afecta a posts publicados"""
+    channels = [post_channel(post.pk)]
+    if Post.Status.PUBLISHED in statuses:
+        channels.append(category_channel(post.category_id))
+    return channels
+
+
+@receiver(post_save, sender=Post)
+def publish_post_status_change(sender, instance, created, **kwargs):
+    """Publicar en los streams los cambios de estado (ver campus_forum.events)"""
+    if not created and not hasattr(instance, '_loaded_status'):
+        return
+    previous = None if created else instance._loaded_status
+    if previous == instance.status or (created and instance.status != Post.Status.PUBLISHED):
+        return
+    publish_event(status_channels(instance, previous, instance.status), 'post.status', {
+        'id': instance.pk,
+        'title': instance.title,
+        'category_id': instance.category_id,
+        'status': instance.status,
+        'previous_status': previous,
+    })
+
+
+@receiver(post_delete, sender=Post)
+def publish_post_deleted(sender, instance, **kwargs):
+    publish_event(status_channels(instance, instance.status), 'post.deleted', {
+        'id': instance.pk,
+        'category_id': instance.category_id,
+    })
@@ -0,0 +1,71 @@
+import threading
+from bisect import bisect_left
+from django.db.models import Count, Q
+from campus_forum.cache import bump_generation, get_generation
+
+TAG_GENERATION = 'tags'
+
+
+def bump_tag_generation():
+    """Marcar el índice de etiquetas como desactualizado en todos los procesos"""
+    return bump_generation(TAG_GENERATION)
+
+
+class TagIndex:
+    """
+    Instantánea en memoria de las etiquetas y su uso en posts publicados.
+
+    Los nombres se guardan ordenados para resolver prefijos con búsqueda binaria;
+    el ranking por popularidad y el mapa por id se calculan una sola vez al construir.
+    """
+
+    def __init__(self, rows):
+        entries = [{'id': tag_id, 'name': name, 'posts_count': count} for tag_id, name, count in rows]
+        self.by_id = {entry['id']: entry for entry in entries}
+        self.by_name = sorted(entries, key=lambda entry: entry['name'].lower())
+        self.keys = [entry['name'].lower() for entry in self.by_name]
+        self.popular = sorted(entries, key=lambda entry: (-entry['posts_count'], entry['name'].lower()))
+
+    @classmethod
+    def build(cls):
+        from .models import Tag
+        rows = Tag.objects.annotate(
+            posts_count=Count('posts', filter=Q(posts__status='PUBLISHED'))
+        ).values_list('id', 'name', 'posts_count')
+        return cls(rows)
+
+    def all(self):
+        return self.by_name
+
+    def top(self, limit):
+        return self.popular[:limit]
+
+    def prefix(self, prefix, limit=None):
+        """Etiquetas que empiezan por `prefix`, las más usadas primero"""
+        prefix = prefix.lower()
+        start = bisect_left(self.keys, prefix)
+        matches = []
+        for position in range(start, len(self.keys)):
+            if not self.keys[position].startswith(prefix):
+                break
+            matches.append(self.by_name[position])
+        matches.sort(key=lambda entry: -entry['posts_count'])
+        return matches[:limit] if limit else matches
+
+    def missing(self, ids):
+        return [tag_id for tag_id in ids if tag_id not in self.by_id]
+
+
+_lock = threading.Lock()
+_state = {'generation': None, 'index': None}
+
+
+def get_tag_index():
+    """Índice del proceso, reconstruido de forma perezosa cuando cambia la generación"""
+    generation = get_generation(TAG_GENERATION)
+    if _state['index'] is None or _state['generation'] != generation:
+        with _lock:
+            if _state['index'] is None or _state['generation'] != generation:
+                _state['index'] = TagIndex.build()
+                _state['generation'] = generation
+    return _state['index']
@@ -1,3 +1,786 @@
-from django.test import TestCase
+import base64
+import json
+import math
+import os
+import tempfile
+import warnings
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.test import AsyncClient, TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import User
+from accounts.serializers import UserSerializer
+from analytics.models import DailyStats
+from campus_forum.cache import get_generation
+from campus_forum.compiled import CompiledReadMixin
+from campus_forum.export import ExportResponse
+from campus_forum.pagination import planner_estimate
+from categories.models import Category
+from categories.serializers import CategorySerializer
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from reports.models import Report
+from reports.serializers import ReportSerializer
+from .caching import FEED_GENERATION
+from .serializers import PostListSerializer, PostSerializer
+from .models import LegacyRecord, Post, PostDailyViews, RelatedPost, Tag
+from .trending import DECAY_RATE, EPOCH, WEIGHTS, compact_scores, snapshot_rows
+from .view_counter import ViewBuffer
 
-# Create your tests here.
+
+class PostTestMixin:
+    """Usuarios, categoría y posts mínimos para las pruebas de la API"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            email='admin@campus.edu', password='clave-segura', first_name='Ana', last_name='Admin', role='ADMIN'
+        )
+        self.student = User.objects.create_user(
+            email='estudiante@campus.edu', password='clave-segura', first_name='Eva', last_name='Estudiante'
+        )
+        self.category = Category.objects.create(name='General', created_by=self.admin)
+
+    def create_post(self, **fields):
+        fields.setdefault('title', 'Post de prueba')
+        fields.setdefault('content', 'Contenido de prueba con suficiente longitud.')
+        fields.setdefault('category', self.category)
+        fields.setdefault('author', self.student)
+        fields.setdefault('status', Post.Status.PUBLISHED)
+        return Post.objects.create(**fields)
+
+
+class ConditionalRetrieveTests(PostTestMixin, TestCase):
+    def test_malformed_id_is_not_found(self):
+        self.assertEqual(self.client.get('/api/posts/posts/abc/').status_code, 404)
+        self.client.force_authenticate(self.student)
+        self.assertEqual(self.client.get('/api/comments/abc/').status_code, 404)
+
+    def test_counter_in_version_disables_last_modified(self):
+        post = self.create_post()
+        response = self.client.get(f'/api/posts/posts/{post.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+        # Un comentario nuevo cambia comments_count pero no updated_at
+        Post.objects.filter(pk=post.pk).update(comments_count=1)
+        response = self.client.get(
+            f'/api/posts/posts/{post.pk}/', HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['comments_count'], 1)
+
+        response = self.client.get(f'/api/posts/posts/{post.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class CounterPreservationTests(PostTestMixin, TestCase):
+    """Guardar una copia leída antes no debe pisar los contadores escritos con F()"""
+
+    def test_saves_keep_counters(self):
+        post = self.create_post(status=Post.Status.DRAFT)
+        self.client.force_authenticate(self.admin)
+        stale = Post.objects.get(pk=post.pk)
+        Post.objects.filter(pk=post.pk).update(comments_count=3, views_count=40, hot_score=7.5)
+
+        stale.title = 'Título editado con save()'
+        stale.save()
+        response = self.client.patch(f'/api/posts/posts/{post.pk}/', {'content': 'Contenido editado por la API.'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.patch(f'/api/posts/posts/{post.pk}/publish/').status_code, 200)
+        self.assertEqual(self.client.patch(f'/api/posts/posts/{post.pk}/archive/').status_code, 200)
+
+        post.refresh_from_db()
+        self.assertEqual((post.comments_count, post.views_count, post.hot_score), (3, 40, 7.5))
+        self.assertEqual(post.title, 'Título editado con save()')
+        self.assertEqual(post.content, 'Contenido editado por la API.')
+        self.assertEqual(post.status, Post.Status.ARCHIVED)
+
+    def test_comment_edit_keeps_replies_count(self):
+        post = self.create_post()
+        root = Comment.objects.create(post=post, author=self.student, content='Comentario raíz')
+        Comment.objects.create(post=post, author=self.admin, parent=root, content='Una respuesta')
+
+        # `root` se leyó antes de la respuesta: su replies_count en memoria es 0
+        root.content = 'Comentario raíz editado'
+        root.save()
+        root.refresh_from_db()
+        self.assertEqual(root.replies_count, 1)
+        self.assertEqual(root.content, 'Comentario raíz editado')
+        self.assertEqual(Post.objects.get(pk=post.pk).comments_count, 2)
+
+class FeedCacheTests(PostTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.anonymous = APIClient()
+
+    def feed_titles(self):
+        response = self.anonymous.get('/api/posts/posts/')
+        self.assertEqual(response.status_code, 200)
+        return [post['title'] for post in response.data['results']]
+
+    def test_hit_and_invalidation(self):
+        post = self.create_post(title='Post original')
+        self.assertEqual(self.feed_titles(), ['Post original'])
+
+        # Un update() no dispara señales: la segunda lectura sale de la caché
+        Post.objects.filter(pk=post.pk).update(title='Cambio sin señal')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.feed_titles(), ['Post original'])
+
+        draft = self.create_post(title='Borrador', status=Post.Status.DRAFT)
+        self.assertEqual(self.feed_titles(), ['Cambio sin señal'])
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.patch(f'/api/posts/posts/{draft.pk}/publish/').status_code, 200)
+        self.assertEqual(self.feed_titles(), ['Borrador', 'Cambio sin señal'])
+
+        self.assertEqual(self.client.delete(f'/api/posts/posts/{post.pk}/').status_code, 204)
+        self.assertEqual(self.feed_titles(), ['Borrador'])
+
+    def test_query_params_share_normalized_key(self):
+        self.create_post(title='Post original')
+        self.assertEqual(self.feed_titles(), ['Post original'])
+        Post.objects.update(title='Cambio sin señal')
+        with self.assertNumQueries(0):
+            response = self.anonymous.get('/api/posts/posts/', {'page': 1, 'search': ''})
+        self.assertEqual([post['title'] for post in response.data['results']], ['Post original'])
+
+        # Los moderadores no leen ni escriben la caché
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/posts/posts/')
+        self.assertEqual([post['title'] for post in response.data['results']], ['Cambio sin señal'])
+
+
+class SparseFieldsetTests(PostTestMixin, TestCase):
+    def test_fields_only_trim_reads(self):
+        post = self.create_post()
+        self.client.force_authenticate(self.student)
+        response = self.client.get(f'/api/posts/posts/{post.pk}/', {'fields': 'id,title'})
+        self.assertEqual(set(response.data), {'id', 'title'})
+
+        # En una escritura ?fields= no descarta los campos enviados
+        response = self.client.patch(
+            f'/api/posts/posts/{post.pk}/?fields=id', {'content': 'Contenido nuevo enviado con fields.'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Post.objects.get(pk=post.pk).content, 'Contenido nuevo enviado con fields.')
+
+class StreamingExportTests(PostTestMixin, TestCase):
+    async def test_asgi_response_is_not_buffered(self):
+        pulled = []
+
+        def chunks():
+            for number in range(3):
+                pulled.append(number)
+                yield f'{number}\n'
+
+        parts = ExportResponse(chunks()).__aiter__()
+        self.assertEqual(await parts.__anext__(), b'0\n')
+        # Solo se leyó el primer bloque: el resto sigue en el cursor
+        self.assertEqual(pulled, [0])
+        self.assertEqual([part async for part in parts], [b'1\n', b'2\n'])
+
+    async def test_export_over_asgi(self):
+        def create():
+            for number in range(3):
+                self.create_post(title=f'Post exportado {number}')
+            return str(RefreshToken.for_user(self.admin).access_token)
+
+        token = await sync_to_async(create)()
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            response = await AsyncClient().get(
+                '/api/posts/posts/export/', headers={'Authorization': f'Bearer {token}'}
+            )
+            content = b''.join([part async for part in response])
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(sorted(row['title'] for row in rows), [f'Post exportado {number}' for number in range(3)])
+
+class SearchHeadlineTests(PostTestMixin, TestCase):
+    def search(self, text):
+        response = self.client.get('/api/posts/posts/', {'search': text})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_headline_is_escaped(self):
+        self.create_post(
+            title='Horario de tutorías',
+            content='Las tutorías <script>alert(1)</script> son los martes <img src=x onerror=alert(1)>',
+        )
+        headline = self.search('tutorías')[0]['search_headline']
+        self.assertIn('<mark>tutorías</mark>', headline)
+        self.assertIn('&lt;img src=x onerror=alert(1)&gt;', headline)
+        self.assertNotIn('<script', headline)
+        self.assertNotIn('<img', headline)
+
+    def test_headline_uses_matching_config(self):
+        self.create_post(title='Club de atletismo', content='The club goes running every morning before class.')
+        # "runs" solo coincide con la configuración en inglés (run)
+        results = self.search('runs')
+        self.assertEqual(len(results), 1)
+        self.assertIn('<mark>running</mark>', results[0]['search_headline'])
+
+class SuggestTests(PostTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_post(title='Introducción a la programación')
+        self.create_post(title='Programación funcional avanzada')
+        self.create_post(title='Recetas de cocina')
+        self.create_post(title='Programación en borrador', status=Post.Status.DRAFT)
+        Tag.objects.create(name='programacion')
+        Tag.objects.create(name='cocina')
+
+    def suggest(self, **params):
+        response = self.client.get('/api/posts/suggest/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_tolerates_typos(self):
+        data = self.suggest(q='programacon')
+        titles = [post['title'] for post in data['posts']]
+        self.assertEqual(
+            sorted(titles), ['Introducción a la programación', 'Programación funcional avanzada']
+        )
+        # Los borradores no se sugieren
+        self.assertNotIn('Programación en borrador', titles)
+        self.assertEqual([tag['name'] for tag in data['tags']], ['programacion'])
+        similarities = [post['similarity'] for post in data['posts']]
+        self.assertEqual(similarities, sorted(similarities, reverse=True))
+
+    def test_prefix_and_limits(self):
+        data = self.suggest(q='cocin')
+        self.assertEqual([post['title'] for post in data['posts']], ['Recetas de cocina'])
+        self.assertEqual([tag['name'] for tag in data['tags']], ['cocina'])
+        self.assertEqual(len(self.suggest(q='programacion', limit=1)['posts']), 1)
+        self.assertEqual(self.suggest(q='p'), {'posts': [], 'tags': []})
+        self.assertEqual(self.suggest(q='zzzzzz'), {'posts': [], 'tags': []})
+
+
+class TagIndexTests(PostTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.python, self.pandas, self.django = [
+            Tag.objects.create(name=name) for name in ('Python', 'pandas', 'Django')
+        ]
+        self.first = self.create_post(title='Primer post')
+        self.second = self.create_post(title='Segundo post')
+        self.first.tags.set([self.python, self.django])
+        self.second.tags.set([self.python])
+
+    def lookup(self, **params):
+        response = self.client.get('/api/posts/tags/', params)
+        self.assertEqual(response.status_code, 200)
+        tags = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [(tag['name'], tag['posts_count']) for tag in tags]
+
+    def test_prefix_lookup(self):
+        # Sin distinguir mayúsculas; las más usadas primero
+        self.assertEqual(self.lookup(prefix='P'), [('Python', 2), ('pandas', 0)])
+        self.assertEqual(self.lookup(prefix='pyt'), [('Python', 2)])
+        self.assertEqual(self.lookup(prefix='ruby'), [])
+        self.assertEqual(self.lookup(), [('Django', 1), ('pandas', 0), ('Python', 2)])
+
+    def test_counts_follow_tag_changes(self):
+        self.assertEqual(self.lookup(prefix='p'), [('Python', 2), ('pandas', 0)])
+
+        self.client.force_authenticate(self.student)
+        response = self.client.patch(
+            f'/api/posts/posts/{self.first.pk}/', {'tag_ids': [self.pandas.pk]}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+        self.second.tags.add(self.pandas)
+        self.assertEqual(self.lookup(prefix='p'), [('pandas', 2), ('Python', 1)])
+        self.assertEqual(self.lookup(prefix='d'), [('Django', 0)])
+
+        # Solo cuentan los posts publicados
+        self.second.status = Post.Status.ARCHIVED
+        self.second.save()
+        Tag.objects.create(name='pygame')
+        self.assertEqual(self.lookup(prefix='p'), [('pandas', 1), ('pygame', 0), ('Python', 0)])
+        self.first.delete()
+        self.assertEqual(self.lookup(prefix='p'), [('pandas', 0), ('pygame', 0), ('Python', 0)])
+
+
+class RenderedContentTests(PostTestMixin, TestCase):
+    def test_rendered_html_is_sanitized(self):
+        content = (
+            '# Título\n\n'
+            'Texto con **negrita** y un [enlace](https://campus.edu/guia).\n\n'
+            '<script>alert("xss")</script>\n\n'
+            '[Pulsa aquí](javascript:alert(1)) y <a href="JavaScript:alert(2)">otro</a>\n\n'
+            '<img src="https://campus.edu/logo.png" onerror="alert(3)">'
+        )
+        self.client.force_authenticate(self.student)
+        response = self.client.post('/api/posts/posts/', {
+            'title': 'Post con HTML peligroso', 'content': content, 'category_id': self.category.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+
+        post = Post.objects.get(pk=response.data['id'])
+        rendered = post.content_html.lower()
+        for fragment in ('<script', 'javascript:', 'onerror', 'alert(3)'):
+            self.assertNotIn(fragment, rendered)
+        self.assertIn('<h1>Título</h1>', post.content_html)
+        self.assertIn('<strong>negrita</strong>', post.content_html)
+        self.assertIn(
+            '<a href="https://campus.edu/guia" rel="nofollow noopener noreferrer">enlace</a>', post.content_html
+        )
+        self.assertIn('<img src="https://campus.edu/logo.png">', post.content_html)
+        self.assertTrue(post.excerpt.startswith('Título Texto con negrita'))
+        self.assertNotIn('<', post.excerpt)
+        self.assertNotIn('xss', post.excerpt)
+
+
+class BulkActionTests(PostTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def bulk(self, ids, action):
+        return self.client.post('/api/posts/posts/bulk/', {'ids': ids, 'action': action}, format='json')
+
+    def test_outcomes_and_permissions(self):
+        own = self.create_post(title='Post propio')
+        other = self.create_post(title='Post de otra persona', author=self.admin)
+        self.assertEqual(self.bulk([own.pk], 'archive').status_code, 401)
+
+        self.client.force_authenticate(self.student)
+        response = self.bulk([own.pk, other.pk, 999999, own.pk], 'archive')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['processed'], 1)
+        self.assertEqual(response.data['results'], [
+            {'id': own.pk, 'result': 'ok'},
+            {'id': other.pk, 'result': 'forbidden'},
+            {'id': 999999, 'result': 'not_found'},
+        ])
+        self.assertEqual(Post.objects.get(pk=own.pk).status, Post.Status.ARCHIVED)
+        self.assertEqual(Post.objects.get(pk=other.pk).status, Post.Status.PUBLISHED)
+        self.assertEqual(self.bulk([own.pk], 'borrar').status_code, 400)
+
+        # Moderadores: cualquier post
+        self.client.force_authenticate(self.admin)
+        response = self.bulk([own.pk, other.pk], 'delete')
+        self.assertEqual(response.data['processed'], 2)
+        self.assertFalse(Post.objects.exists())
+
+    def test_feed_invalidated_after_commit(self):
+        post = self.create_post(title='Post del feed')
+        self.assertEqual(len(self.client.get('/api/posts/posts/').data['results']), 1)
+        generation = get_generation(FEED_GENERATION)
+
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(self.bulk([post.pk], 'archive').data['processed'], 1)
+            # Hasta confirmar, la generación no cambia
+            self.assertEqual(get_generation(FEED_GENERATION), generation)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_generation(FEED_GENERATION), generation)
+
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/posts/posts/').data['results'], [])
+
+class TrendingCompactionTests(PostTestMixin, TestCase):
+    def seconds(self, when):
+        return (when - EPOCH).total_seconds()
+
+    def test_compaction_scores(self):
+        tag = Tag.objects.create(name='tutorías')
+        post = self.create_post()
+        post.tags.add(tag)
+        quiet = self.create_post(title='Post sin actividad')
+        comment = Comment.objects.create(post=post, author=self.admin, content='Un comentario')
+        Post.objects.update(hot_score=0)
+
+        now = timezone.now()
+        self.assertEqual(compact_scores(Post, Tag, Comment, now=now), (2, 1))
+        post.refresh_from_db()
+        quiet.refresh_from_db()
+        comment_score = math.log(WEIGHTS['comment']) + DECAY_RATE * self.seconds(comment.created_at)
+        self.assertAlmostEqual(
+            post.hot_score, float(np.logaddexp(DECAY_RATE * self.seconds(post.created_at), comment_score))
+        )
+        self.assertAlmostEqual(quiet.hot_score, DECAY_RATE * self.seconds(quiet.created_at))
+        self.assertAlmostEqual(Tag.objects.get().hot_score, comment_score)
+
+        # Sin cambios no se reescribe ninguna fila
+        with CaptureQueriesContext(connection) as queries:
+            compact_scores(Post, Tag, Comment, now=now)
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE')])
+
+    def test_snapshot_rows_skip_unknown_ids(self):
+        rows, found = snapshot_rows(np.array([2, 5, 9]), [5, 3, 9, 12, 2])
+        self.assertEqual(found.tolist(), [True, False, True, False, True])
+        self.assertEqual(rows[found].tolist(), [1, 2, 0])
+
+class CompiledSerializerTests(PostTestMixin, TestCase):
+    """La ruta compilada debe producir exactamente el JSON de la ruta genérica de DRF"""
+
+    def render(self, serializer_class, instances, compiled):
+        request = Request(APIRequestFactory().get('/api/', {'expand': 'author,category'}))
+        with mock.patch.object(CompiledReadMixin, 'compiled_read', compiled):
+            data = serializer_class(instances, many=True, context={'request': request}).data
+        return JSONRenderer().render(data)
+
+    def assertSameOutput(self, serializer_class, instances):
+        self.assertEqual(
+            self.render(serializer_class, instances, compiled=True),
+            self.render(serializer_class, instances, compiled=False)
+        )
+
+    def test_compiled_output_matches_drf(self):
+        self.student.profile_picture = 'profiles/eva.png'
+        self.student.save()
+        empty = Category.objects.create(name='Sin descripción', description='', created_by=self.student)
+        tag = Tag.objects.create(name='ñandú')
+        post = self.create_post(title='Post con <html> & "comillas"')
+        post.tags.add(tag)
+        self.create_post(title='Borrador', status=Post.Status.DRAFT, category=empty, author=self.admin)
+        root = Comment.objects.create(post=post, author=self.admin, content='Comentario raíz')
+        reply = Comment.objects.create(post=post, author=self.student, parent=root, content='Respuesta anidada')
+        Report.objects.create(type=Report.Type.POST, reported_by=self.student, post=post, reason='Spam')
+        Report.objects.create(
+            type=Report.Type.COMMENT, reported_by=self.admin, comment=reply, reason='Ofensivo',
+            status=Report.Status.RESOLVED, reviewed_by=self.admin, action_taken='', reviewed_at=timezone.now()
+        )
+
+        self.assertSameOutput(UserSerializer, User.objects.order_by('id'))
+        self.assertSameOutput(CategorySerializer, Category.objects.order_by('id'))
+        posts = Post.objects.order_by('id')
+        self.assertSameOutput(PostSerializer, posts)
+        self.assertSameOutput(PostListSerializer, posts)
+        self.assertSameOutput(CommentSerializer, Comment.objects.order_by('id'))
+        self.assertSameOutput(ReportSerializer, Report.objects.order_by('id'))
+
+class RelatedPostsTests(PostTestMixin, TestCase):
+    def test_related_respects_visibility(self):
+        post = self.create_post(title='Post visible')
+        draft = self.create_post(title='Borrador', status=Post.Status.DRAFT)
+        neighbour = self.create_post(title='Vecino publicado')
+        RelatedPost.objects.create(post=post, related=neighbour, score=0.8)
+        RelatedPost.objects.create(post=post, related=draft, score=0.9)
+        RelatedPost.objects.create(post=draft, related=neighbour, score=0.7)
+
+        response = self.client.get(f'/api/posts/posts/{post.pk}/related/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([link['id'] for link in response.data], [neighbour.pk])
+        self.assertEqual(self.client.get('/api/posts/posts/abc/related/').status_code, 404)
+        self.assertEqual(self.client.get('/api/posts/posts/999999/related/').status_code, 404)
+        # Los vecinos de un borrador no se filtran a quien no puede verlo
+        self.assertEqual(self.client.get(f'/api/posts/posts/{draft.pk}/related/').status_code, 404)
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get(f'/api/posts/posts/{draft.pk}/related/').status_code, 200)
+
+@override_settings(DEBUG=True)
+class QueryExplainTests(PostTestMixin, TestCase):
+    def test_explain_requires_admin(self):
+        self.create_post()
+        for user in (None, self.student):
+            self.client.force_authenticate(user)
+            response = self.client.get('/api/posts/posts/', {'explain': '1'})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('plan', response.data)
+            self.assertEqual(len(response.data['results']), 1)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/posts/posts/', {'explain': '1'})
+        self.assertIn('SELECT', response.data['sql'])
+        self.assertTrue(response.data['plan'])
+
+class EstimatedCountPaginationTests(PostTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client.force_authenticate(self.admin)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Post._meta.db_table}')
+
+    def test_planner_estimate(self):
+        for number in range(25):
+            self.create_post(title=f'Post de prueba {number}')
+        self.analyze()
+        # Sin filtros: reltuples de pg_class; con filtros: EXPLAIN
+        self.assertEqual(planner_estimate(Post.objects.all()), 25)
+        self.assertEqual(planner_estimate(Post.objects.filter(status=Post.Status.PUBLISHED)), 25)
+
+    @override_settings(PAGINATION_ESTIMATE_THRESHOLD=1)
+    def test_overestimated_count_does_not_add_pages(self):
+        posts = [self.create_post(title=f'Post de prueba {number}') for number in range(25)]
+        self.analyze()
+        Post.objects.filter(pk__in=[post.pk for post in posts[10:]]).delete()
+
+        response = self.client.get('/api/posts/posts/', {'page_size': 10})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['count_is_estimate'])
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(self.client.get('/api/posts/posts/', {'page_size': 10, 'page': 2}).status_code, 404)
+
+    def test_stale_cached_count_does_not_hide_pages(self):
+        for number in range(5):
+            self.create_post(title=f'Post de prueba {number}')
+        response = self.client.get('/api/posts/posts/', {'page_size': 5})
+        self.assertEqual(response.data['count'], 5)
+        self.assertIsNone(response.data['next'])
+
+        for number in range(5, 12):
+            self.create_post(title=f'Post de prueba {number}')
+        # El total sigue cacheado (5), pero las páginas siguientes existen
+        response = self.client.get('/api/posts/posts/', {'page_size': 5})
+        self.assertEqual(response.data['count'], 5)
+        self.assertIsNotNone(response.data['next'])
+        response = self.client.get('/api/posts/posts/', {'page_size': 5, 'page': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNone(response.data['next'])
+        response = self.client.get('/api/posts/posts/', {'page_size': 5, 'page': 'last'})
+        self.assertEqual(len(response.data['results']), 2)
+
+
+class KeysetPaginationTests(PostTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.student)
+        moment = timezone.now()
+        posts = [self.create_post(title=f'Post de prueba {number}') for number in range(8)]
+        # Seis posts empatan en created_at: el orden lo decide el id
+        Post.objects.filter(pk__in=[post.pk for post in posts[1:7]]).update(created_at=moment)
+        Post.objects.filter(pk=posts[0].pk).update(created_at=moment + timedelta(minutes=1))
+        Post.objects.filter(pk=posts[7].pk).update(created_at=moment - timedelta(minutes=1))
+        self.expected = list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+    def page(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_forward_and_back(self):
+        data = self.page('/api/posts/posts/', {'pagination': 'cursor', 'page_size': 3})
+        self.assertIsNone(data['previous'])
+        pages = [[post['id'] for post in data['results']]]
+        while data['next']:
+            data = self.page(data['next'])
+            pages.append([post['id'] for post in data['results']])
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 2])
+
+        # Retroceder desde la última página devuelve las mismas páginas
+        back = [pages[-1]]
+        while data['previous']:
+            data = self.page(data['previous'])
+            back.insert(0, [post['id'] for post in data['results']])
+        self.assertEqual(back, pages)
+        self.assertIsNotNone(data['next'])
+
+    def test_invalid_cursor(self):
+        def token(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        for cursor in (
+            token({'r': 0, 'v': ['not-a-date', 1]}),
+            token({'r': 0, 'v': [timezone.now().isoformat(), 'x']}),
+            token({'r': 0, 'v': [None, 1]}),
+            token({'r': 1, 'v': [[], {}]}),
+            token({'r': 0, 'v': [1]}),
+            'no-es-base64!',
+        ):
+            response = self.client.get('/api/posts/posts/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class ImportForumTests(TestCase):
+    """import_forum sobre PostgreSQL: COPY, ids reservados con nextval y reanudación con LegacyRecord"""
+
+    users = [
+        {'id': 1, 'email': 'ana@campus.edu', 'first_name': 'Ana', 'last_name': 'Pérez', 'role': 'PROFESSOR',
+         'date_joined': '2024-01-10T09:00:00Z'},
+        {'id': 2, 'email': 'luis@campus.edu', 'first_name': 'Luis', 'last_name': 'Gómez'},
+        {'id': 3, 'email': 'no-es-un-correo'},
+    ]
+    posts = [
+        {'id': 'p1', 'author': 1, 'category': 'Avisos', 'title': 'Bienvenida al foro',
+         'content': 'Primer **post** importado del foro anterior.', 'tags': ['inicio', 'avisos'],
+         'created_at': '2024-02-01T10:00:00Z'},
+        {'id': 'p2', 'author': 2, 'category': 'Dudas', 'title': 'Horario de tutorías',
+         'content': '¿Alguien sabe el horario de tutorías de este semestre?', 'tags': 'dudas|inicio',
+         'status': 'DRAFT', 'created_at': '2024-02-02T10:00:00Z'},
+        {'id': 'p3', 'author': 99, 'category': 'Dudas', 'title': 'Autor desconocido',
+         'content': 'Este post no tiene un autor que exista en el archivo.'},
+    ]
+    comments = [
+        {'id': 'c1', 'post': 'p1', 'author': 2, 'content': 'Gracias por la bienvenida',
+         'created_at': '2024-02-01T11:00:00Z'},
+        {'id': 'c2', 'post': 'p1', 'author': 1, 'content': 'Con gusto, bienvenidos todos',
+         'created_at': '2024-02-01T12:00:00Z'},
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, records):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as handle:
+            for record in records:
+                handle.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return path
+
+    def run_import(self, users, posts, comments):
+        output = StringIO()
+        call_command(
+            'import_forum',
+            users=self.write('users.ndjson', users),
+            posts=self.write('posts.ndjson', posts),
+            comments=self.write('comments.ndjson', comments),
+            batch_size=2,
+            stdout=output,
+        )
+        return output.getvalue()
+
+    def test_import_and_resume(self):
+        output = self.run_import(self.users, self.posts, self.comments)
+        self.assertIn('users: 2 importados, 0 ya existentes, 1 rechazados', output)
+        self.assertIn('posts: 2 importados, 0 ya existentes, 1 rechazados', output)
+        self.assertIn('comments: 2 importados, 0 ya existentes, 0 rechazados', output)
+
+        ana = User.objects.get(email='ana@campus.edu')
+        self.assertEqual(ana.role, 'PROFESSOR')
+        self.assertFalse(ana.has_usable_password())
+        welcome = Post.objects.get(title='Bienvenida al foro')
+        self.assertEqual(welcome.author, ana)
+        self.assertEqual(welcome.category.name, 'Avisos')
+        self.assertEqual(set(welcome.tags.values_list('name', flat=True)), {'inicio', 'avisos'})
+        self.assertIn('<strong>post</strong>', welcome.content_html)
+        self.assertIsNotNone(welcome.search_vector)
+        self.assertEqual(welcome.comments_count, 2)
+        self.assertEqual(Post.objects.get(title='Horario de tutorías').status, 'DRAFT')
+        self.assertEqual(list(welcome.comments.order_by('created_at').values_list('depth', flat=True)), [0, 0])
+        self.assertEqual(LegacyRecord.objects.filter(object_id=welcome.pk, kind='post').get().legacy_id, 'p1')
+        self.assertEqual(DailyStats.objects.get(day='2024-02-01').published_posts, 1)
+
+        # Reanudación: solo entra lo nuevo y los ids de la secuencia siguen siendo válidos
+        output = self.run_import(
+            self.users + [{'id': 4, 'email': 'sara@campus.edu', 'first_name': 'Sara', 'last_name': 'Ruiz'}],
+            self.posts + [{'id': 'p4', 'author': 4, 'category': 'Dudas', 'title': 'Nuevo post importado',
+                           'content': 'Contenido del post que faltaba en la primera corrida.'}],
+            self.comments + [{'id': 'c3', 'post': 'p4', 'author': 1, 'content': 'Respuesta nueva'}],
+        )
+        self.assertIn('users: 1 importados, 2 ya existentes, 1 rechazados', output)
+        self.assertIn('posts: 1 importados, 2 ya existentes, 1 rechazados', output)
+        self.assertIn('comments: 1 importados, 2 ya existentes, 0 rechazados', output)
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(Comment.objects.count(), 3)
+        self.assertEqual(Tag.objects.filter(name='inicio').count(), 1)
+        self.assertEqual(Post.objects.get(title='Nuevo post importado').comments_count, 1)
+
+        category = Category.objects.get(name='Dudas')
+        created = Post.objects.create(
+            title='Creado después de importar', content='Contenido creado con el ORM después.',
+            category=category, author=ana, status='PUBLISHED'
+        )
+        imported = LegacyRecord.objects.filter(kind='post').values_list('object_id', flat=True)
+        self.assertGreater(created.pk, max(imported))
+
+
+    def test_copy_keeps_literal_values(self):
+        users = [{'id': 1, 'email': 'ana@campus.edu', 'first_name': '\\N', 'last_name': ''}]
+        posts = [{'id': 'p1', 'author': 1, 'category': 'Avisos', 'title': 'Comillas "dobles", comas y \\N',
+                  'content': 'Línea uno\n\\N\n\\.\nLínea "cuatro", con coma.'}]
+        comments = [{'id': 'c1', 'post': 'p1', 'author': 1, 'content': 'Ruta C:\\New\\N'}]
+        output = self.run_import(users, posts, comments)
+        self.assertIn('comments: 1 importados, 0 ya existentes, 0 rechazados', output)
+
+        # Ni '\\N' ni '' se leen como NULL: COPY solo toma como NULL los campos vacíos sin comillas
+        user = User.objects.get(email='ana@campus.edu')
+        self.assertEqual((user.first_name, user.last_name), ('\\N', ''))
+        post = Post.objects.get()
+        self.assertEqual(post.title, 'Comillas "dobles", comas y \\N')
+        self.assertEqual(post.content, 'Línea uno\n\\N\n\\.\nLínea "cuatro", con coma.')
+        self.assertEqual(Comment.objects.get().content, 'Ruta C:\\New\\N')
+
+
+@override_settings(VIEW_FLUSH_SECONDS=0)
+class ViewBufferTests(PostTestMixin, TestCase):
+    """Las visitas quedan en el buffer del proceso y se escriben por lotes con flush()"""
+
+    def setUp(self):
+        super().setUp()
+        self.buffer = ViewBuffer()
+        patcher = mock.patch('posts.views.view_buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def visit(self, post, user=None, address='10.0.0.1'):
+        self.client.force_authenticate(user)
+        response = self.client.get(f'/api/posts/posts/{post.pk}/', REMOTE_ADDR=address)
+        self.assertEqual(response.status_code, 200)
+
+    def test_flush_writes_views_and_visitors(self):
+        post = self.create_post()
+        hot_score = Post.objects.get(pk=post.pk).hot_score
+        self.visit(post, self.student)
+        self.visit(post, self.student)
+        self.visit(post, self.admin)
+        self.visit(post)
+        self.visit(post, address='10.0.0.2')
+        # Leer no escribe en la BD hasta el flush
+        self.assertEqual(Post.objects.get(pk=post.pk).views_count, 0)
+        self.assertFalse(PostDailyViews.objects.exists())
+
+        self.assertEqual(self.buffer.flush(), 5)
+        post.refresh_from_db()
+        self.assertEqual(post.views_count, 5)
+        self.assertGreater(post.hot_score, hot_score)
+        row = PostDailyViews.objects.get(post=post)
+        self.assertEqual((row.views, row.unique_visitors), (5, 4))
+
+        # Un segundo flush combina el boceto existente con las visitas nuevas
+        self.visit(post, self.student)
+        self.visit(post, address='10.0.0.3')
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(self.buffer.flush(), 0)
+        row.refresh_from_db()
+        self.assertEqual((row.views, row.unique_visitors), (7, 5))
+
+        self.client.force_authenticate(self.student)
+        response = self.client.get(f'/api/posts/posts/{post.pk}/views/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['views'], response.data['unique_visitors']), (7, 5))
+        self.assertEqual(response.data['views_count'], 7)
+
+    def test_failed_flush_keeps_pending_views(self):
+        post = self.create_post()
+        removed = self.create_post(title='Post que se borra')
+        self.visit(post, self.student)
+        self.visit(removed, self.student)
+        with mock.patch('posts.view_counter.write_views', side_effect=RuntimeError('sin conexión')), \
+                self.assertLogs('posts.view_counter', 'ERROR'):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertFalse(PostDailyViews.objects.exists())
+
+        # Lo pendiente se reintenta; las visitas de posts borrados se descartan
+        removed.delete()
+        self.visit(post, self.admin)
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(Post.objects.get(pk=post.pk).views_count, 2)
+        self.assertEqual(PostDailyViews.objects.get().unique_visitors, 2)
+        self.buffer.shutdown()
+        self.assertIsNone(self.buffer.thread)
@@ -0,0 +1,197 @@
+"""
+Puntuación "hot" con decaimiento exponencial.
+
+Cada evento (publicación, comentario, visita) aporta w * 2^-(edad / vida media).
+Como todos los puntajes decaen al mismo ritmo, se guarda el valor en espacio
+logarítmico referido a una época fija:
+
+    hot_score = ln( sum(w_i * e^(λ * t_i)) ),  λ = ln 2 / vida media
+
+Así el orden por hot_score coincide siempre con el orden por puntaje decaído,
+se puede servir desde un índice y cada evento es un UPDATE atómico
+(log-add-exp) sin reescribir las demás filas.
+"""
+import math
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, IntegerField, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+HALF_LIFE = timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+WINDOW = timedelta(days=settings.TRENDING_WINDOW_DAYS)
+DECAY_RATE = math.log(2) / HALF_LIFE.total_seconds()
+
+# Peso de cada tipo de evento
+WEIGHTS = {
+    'post': 1.0,
+    'comment': 3.0,
+    'view': 0.2,
+}
+
+
+def event_score(kind, when=None, count=1):
+    """Aporte de `count` eventos en espacio logarítmico"""
+    when = when or timezone.now()
+    return math.log(WEIGHTS[kind] * count) + DECAY_RATE * (when - EPOCH).total_seconds()
+
+
+def add_event_expression(score, field='hot_score'):
+    """SQL de log-add-exp: ln(e^campo + e^score), estable numéricamente"""
+    value = Value(score)
+    return Greatest(F(field), value) + Ln(Value(1.0) + Exp(-Abs(F(field) - value)))
+
+
+def decayed(score, now=None):
+    """Puntaje actual a partir del valor almacenado"""
+    now = now or timezone.now()
+    return math.exp(score - DECAY_RATE * (now - EPOCH).total_seconds())
+
+
+def record_event(post_id, kind, count=1, when=None):
+    """Sumar un evento al post y a sus etiquetas (dos UPDATE atómicos)"""
+    from .models import Post, Tag
+    score = event_score(kind, when, count)
+    Post.objects.filter(pk=post_id).update(hot_score=add_event_expression(score))
+    Tag.objects.filter(posts__id=post_id).update(hot_score=add_event_expression(score))
+
+
+def record_events(kind, counts, when=None, counter=None):
+    """
+    Sumar eventos de varios posts ({post_id: n}) con un UPDATE por tabla.
+
+    Cada etiqueta recibe los eventos de todos sus posts, como con record_event.
+    `counter` es un campo del post que además se incrementa en n (p. ej. views_count).
+    """
+    from .models import Post, Tag
+    counts = {post_id: count for post_id, count in counts.items() if count}
+    if not counts:
+        return
+    post_ids = sorted(counts)
+    updates = {'hot_score': Case(*[
+        When(pk=post_id, then=add_event_expression(event_score(kind, when, counts[post_id])))
+        for post_id in post_ids
+    ], output_field=FloatField())}
+    if counter:
+        updates[counter] = F(counter) + Case(*[
+            When(pk=post_id, then=Value(counts[post_id])) for post_id in post_ids
+        ], output_field=IntegerField())
+    Post.objects.filter(pk__in=post_ids).update(**updates)
+
+    tag_counts = Counter()
+    for post_id, tag_id in Post.tags.through.objects.filter(post_id__in=post_ids).values_list('post_id', 'tag_id'):
+        tag_counts[tag_id] += counts[post_id]
+    if tag_counts:
+        tag_ids = sorted(tag_counts)
+        Tag.objects.filter(pk__in=tag_ids).update(hot_score=Case(*[
+            When(pk=tag_id, then=add_event_expression(event_score(kind, when, tag_counts[tag_id])))
+            for tag_id in tag_ids
+        ], output_field=FloatField()))
+
+
+def snapshot_rows(snapshot_ids, ids):
+    """
+    Posición de cada id en el arreglo ordenado `snapshot_ids` y máscara de los encontrados.
+
+    Filas creadas o eliminadas después de leer la instantánea no están en ella:
+    sin la máscara, searchsorted las cargaría al id vecino (o fuera del arreglo).
+    """
+    import numpy as np
+
+    ids = np.asarray(ids, dtype=np.int64)
+    rows = np.searchsorted(snapshot_ids, ids)
+    found = rows < len(snapshot_ids)
+    found[found] = snapshot_ids[rows[found]] == ids[found]
+    return rows, found
+
+
+def compact_scores(post_model, tag_model, comment_model, now=None, views_model=None):
+    """
+    Recalcular todos los puntajes desde los eventos de la ventana deslizante.
+
+    Los eventos más antiguos que TRENDING_WINDOW_DAYS dejan de contar (salvo la
+    creación del post) y se corrige cualquier deriva de las actualizaciones
+    incrementales. Trabaja con arreglos de NumPy; recibe los modelos para poder
+    usarse también desde migraciones. Con `views_model` (PostDailyViews) cuentan
+    también las visitas, fechadas al mediodía de su día.
+
+    Posts y etiquetas se bloquean al leerlos: un evento concurrente (record_events)
+    espera a que termine la compactación y se suma sobre el valor recalculado, en
+    vez de perderse con la escritura final. Solo se escriben las filas que cambian.
+    """
+    import numpy as np
+
+    now = now or timezone.now()
+    since = now - WINDOW
+
+    with transaction.atomic():
+        posts = list(post_model.objects.select_for_update().order_by('id').values_list(
+            'id', 'created_at', 'hot_score'
+        ))
+        tags = list(tag_model.objects.select_for_update().order_by('id').values_list('id', 'hot_score'))
+        if not posts:
+            return 0, 0
+        post_ids = np.fromiter((post_id for post_id, _, _ in posts), dtype=np.int64, count=len(posts))
+        created = np.fromiter(
+            ((when - EPOCH).total_seconds() for _, when, _ in posts), dtype=np.float64, count=len(posts)
+        )
+        # Actividad (comentarios, visitas) por post; la creación solo cuenta para el post
+        activity = np.full(len(posts), -np.inf)
+
+        comments = comment_model.objects.filter(created_at__gte=since).values_list('post_id', 'created_at')
+        comment_posts, comment_times = [], []
+        for post_id, when in comments.iterator(chunk_size=20000):
+            comment_posts.append(post_id)
+            comment_times.append((when - EPOCH).total_seconds())
+        if comment_posts:
+            rows, found = snapshot_rows(post_ids, comment_posts)
+            values = math.log(WEIGHTS['comment']) + DECAY_RATE * np.asarray(comment_times)
+            np.logaddexp.at(activity, rows[found], values[found])
+
+        if views_model is not None:
+            daily = views_model.objects.filter(day__gte=timezone.localdate(since), views__gt=0).values_list(
+                'post_id', 'day', 'views'
+            )
+            view_posts, view_times, view_counts = [], [], []
+            for post_id, day, views in daily.iterator(chunk_size=20000):
+                middle = timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(hours=12)
+                view_posts.append(post_id)
+                view_times.append((min(middle, now) - EPOCH).total_seconds())
+                view_counts.append(views)
+            if view_posts:
+                rows, found = snapshot_rows(post_ids, view_posts)
+                values = (np.log(WEIGHTS['view'] * np.asarray(view_counts, dtype=np.float64))
+                          + DECAY_RATE * np.asarray(view_times))
+                np.logaddexp.at(activity, rows[found], values[found])
+        post_scores = np.logaddexp(math.log(WEIGHTS['post']) + DECAY_RATE * created, activity)
+
+        tag_ids = np.fromiter((tag_id for tag_id, _ in tags), dtype=np.int64, count=len(tags))
+        tag_scores = np.zeros(len(tags))
+        links = post_model.tags.through.objects.values_list('post_id', 'tag_id')
+        link_posts, link_tags = [], []
+        for post_id, tag_id in links.iterator(chunk_size=20000):
+            link_posts.append(post_id)
+            link_tags.append(tag_id)
+        if link_posts and len(tags):
+            tag_scores.fill(-np.inf)
+            post_rows, post_found = snapshot_rows(post_ids, link_posts)
+            tag_rows, tag_found = snapshot_rows(tag_ids, link_tags)
+            found = post_found & tag_found
+            np.logaddexp.at(tag_scores, tag_rows[found], activity[post_rows[found]])
+            tag_scores[np.isneginf(tag_scores)] = 0.0
+
+        stored_posts = np.fromiter((score for _, _, score in posts), dtype=np.float64, count=len(posts))
+        stored_tags = np.fromiter((score for _, score in tags), dtype=np.float64, count=len(tags))
+        post_model.objects.bulk_update([
+            post_model(id=int(pk), hot_score=float(score))
+            for pk, score, stored in zip(post_ids, post_scores, stored_posts) if score != stored
+        ], ['hot_score'], batch_size=2000)
+        tag_model.objects.bulk_update([
+            tag_model(id=int(pk), hot_score=float(score))
+            for pk, score, stored in zip(tag_ids, tag_scores, stored_tags) if score != stored
+        ], ['hot_score'], batch_size=2000)
+    return len(posts), len(tags)
@@ -1,12 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PostViewSet, TagViewSet
+from .views import PostViewSet, TagViewSet, suggest_view
 
 router = DefaultRouter()
 router.register(r'posts', PostViewSet, basename='post')
 router.register(r'tags', TagViewSet, basename='tag')
 
 urlpatterns = [
+    path('suggest/', suggest_view, name='post-suggest'),
     path('', include(router.urls)),
 ]
 
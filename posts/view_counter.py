@@ -0,0 +1,181 @@
+"""
+Contador de visitas de posts con buffer por proceso.
+
+Cada GET de un post suma en memoria: visitas por (post, día) y un boceto
+HyperLogLog de visitantes (campus_forum.hyperloglog). Un hilo del proceso
+escribe lo acumulado cada VIEW_FLUSH_SECONDS (antes si hay más de
+VIEW_BUFFER_MAX_KEYS pares pendientes) y al terminar el proceso, en una sola
+transacción con un número fijo de sentencias:
+
+- PostDailyViews: se crean las filas que faltan (ON CONFLICT DO NOTHING), se
+  bloquean en orden, se combinan los bocetos (máximo por registro, que SQL no
+  sabe hacer) y se escriben con un UPDATE por lote.
+- Post.views_count y hot_score (evento 'view' de posts.trending), y el
+  hot_score de sus etiquetas: un UPDATE por tabla.
+
+Leer un post no escribe en la BD. Si el proceso muere sin salir normalmente
+(SIGKILL) se pierden a lo sumo los últimos segundos de visitas; si la escritura
+falla, lo pendiente vuelve al buffer y se reintenta en la siguiente. Con
+VIEW_FLUSH_SECONDS = 0 no hay hilo: solo se escribe al salir o con flush().
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from campus_forum.hyperloglog import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+WRITE_BATCH_SIZE = 500
+
+
+def visitor_key(request):
+    """Identidad del visitante para el boceto: el usuario o, anónimo, IP y navegador"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    meta = request.META
+    return f"anon:{meta.get('REMOTE_ADDR', '')}|{meta.get('HTTP_USER_AGENT', '')}"
+
+
+def write_views(views, sketches, when=None):
+    """
+    Escribir visitas acumuladas ({(post_id, día): n}) y sus bocetos.
+
+    Se descartan los posts que ya no existen. Devuelve cuántas visitas se escribieron.
+    """
+    from .models import Post, PostDailyViews
+    from .trending import record_events
+
+    existing = set(Post.objects.filter(
+        pk__in={post_id for post_id, _ in views}
+    ).values_list('pk', flat=True).order_by())
+    keys = sorted(key for key in views if key[0] in existing)
+    if not keys:
+        return 0
+
+    with transaction.atomic():
+        PostDailyViews.objects.bulk_create(
+            [PostDailyViews(post_id=post_id, day=day) for post_id, day in keys],
+            ignore_conflicts=True, batch_size=WRITE_BATCH_SIZE
+        )
+        wanted = set(keys)
+        rows = PostDailyViews.objects.select_for_update().filter(
+            post_id__in={post_id for post_id, _ in keys}, day__in={day for _, day in keys}
+        ).order_by('post_id', 'day')
+        updated = []
+        for row in rows:
+            key = (row.post_id, row.day)
+            if key not in wanted:
+                continue
+            sketch = HyperLogLog(row.visitors or None).merge(sketches[key])
+            row.views += views[key]
+            row.visitors = bytes(sketch)
+            row.unique_visitors = sketch.count()
+            updated.append(row)
+        PostDailyViews.objects.bulk_update(
+            updated, ['views', 'visitors', 'unique_visitors'], batch_size=WRITE_BATCH_SIZE
+        )
+
+        per_post = Counter()
+        for post_id, day in keys:
+            per_post[post_id] += views[(post_id, day)]
+        record_events('view', per_post, when=when, counter='views_count')
+    return sum(per_post.values())
+
+
+class ViewBuffer:
+    """Visitas pendientes del proceso; `record` es seguro entre hilos y no toca la BD"""
+
+    def __init__(self):
+        self.pid = None
+        self.start_lock = threading.Lock()
+
+    def start(self):
+        """Estado nuevo en cada proceso: tras un fork, lo heredado es del proceso padre"""
+        with self.start_lock:
+            if self.pid == os.getpid():
+                return
+            self.lock = threading.Lock()
+            self.views = Counter()
+            self.sketches = {}
+            self.wakeup = threading.Event()
+            self.stopping = False
+            self.thread = None
+            if settings.VIEW_FLUSH_SECONDS > 0:
+                self.thread = threading.Thread(target=self.run, name='view-counter', daemon=True)
+                self.thread.start()
+            if self.pid is None:
+                atexit.register(self.shutdown)
+            self.pid = os.getpid()
+
+    def record(self, post_id, visitor, day=None):
+        if self.pid != os.getpid():
+            self.start()
+        key = (post_id, day or timezone.localdate())
+        with self.lock:
+            self.views[key] += 1
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = HyperLogLog()
+            sketch.add(visitor)
+            pending = len(self.views)
+        if pending >= settings.VIEW_BUFFER_MAX_KEYS:
+            self.wakeup.set()
+
+    def drain(self):
+        with self.lock:
+            views, sketches = self.views, self.sketches
+            self.views, self.sketches = Counter(), {}
+        return views, sketches
+
+    def restore(self, views, sketches):
+        """Devolver al buffer lo que no se pudo escribir"""
+        with self.lock:
+            self.views.update(views)
+            for key, sketch in sketches.items():
+                if key in self.sketches:
+                    self.sketches[key].merge(sketch)
+                else:
+                    self.sketches[key] = sketch
+
+    def flush(self):
+        """Escribir lo pendiente; devuelve cuántas visitas se escribieron"""
+        if self.pid != os.getpid():
+            return 0
+        views, sketches = self.drain()
+        if not views:
+            return 0
+        try:
+            return write_views(views, sketches)
+        except Exception:
+            logger.exception('No se pudieron escribir %d visitas pendientes', sum(views.values()))
+            self.restore(views, sketches)
+            return 0
+
+    def run(self):
+        while not self.stopping:
+            self.wakeup.wait(settings.VIEW_FLUSH_SECONDS)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                # La conexión del hilo no pasa por el ciclo de requests de Django
+                connection.close()
+
+    def shutdown(self):
+        """Al terminar el proceso: detener el hilo y escribir lo que quede"""
+        if self.pid != os.getpid():
+            return
+        self.stopping = True
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout=settings.VIEW_FLUSH_SECONDS)
+        self.flush()
+
+
+view_buffer = ViewBuffer()
@@ -1,65 +1,130 @@
-from rest_framework import viewsets, status, filters
-from rest_framework.decorators import action
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework import viewsets, status
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.db.models import Count, Q
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Post, Tag
-from .serializers import PostSerializer, TagSerializer
+from campus_forum.export import StreamingExportMixin
+from campus_forum.hyperloglog import HyperLogLog
+from campus_forum.mixins import ConditionalRetrieveMixin, QueryExplainMixin
+from campus_forum.pagination import KeysetPagination
+from campus_forum.serializers import parse_field_list
+from reports.permissions import IsModerator
+from .models import Post, PostDailyViews, RelatedPost, Tag
+from .serializers import PostSerializer, PostListSerializer, TagSerializer, BulkPostActionSerializer
+from .moderation import apply_bulk_action
 from .permissions import IsAuthorOrModerator
+from .caching import feed_cache_key, get_cached_feed, set_cached_feed
+from .filters import PostFilter, PostOrderingFilter
+from .search import suggest
+from .tag_index import get_tag_index
+from .trending import decayed
+from .view_counter import view_buffer, visitor_key
 
+# Días que abarca por defecto (y como máximo) /posts/<id>/views/
+VIEW_STATS_DAYS = 30
+MAX_VIEW_STATS_DAYS = 366
 
-class PostViewSet(viewsets.ModelViewSet):
+
+class PostViewSet(StreamingExportMixin, QueryExplainMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet):
     serializer_class = PostSerializer
+    # Versión de la representación para ETag / Last-Modified (views_count no la
+    # cambia: un 304 puede llevar un contador de visitas atrasado)
+    conditional_fields = ('updated_at', 'comments_count')
     # Por defecto, permitir acceso público (se sobrescribe en get_permissions para acciones protegidas)
     permission_classes = [AllowAny]
+    export_fields = ('id', 'title', 'content', 'excerpt', 'status', 'category_id', 'author_id',
+                     'comments_count', 'views_count', 'reading_time', 'created_at', 'updated_at')
     
     def get_permissions(self):
         # Permitir acceso público para listar y ver posts publicados
         action = getattr(self, 'action', None)
-        if action in ['list', 'retrieve']:
+        if action in ['list', 'retrieve', 'related']:
             return [AllowAny()]
         # Para actualizar/eliminar, verificar autor o moderador
         if action in ['update', 'partial_update', 'destroy']:
             return [IsAuthorOrModerator()]
+        # Exportación completa: solo moderadores
+        if action == 'export':
+            return [IsModerator()]
         # Para otras acciones (create, publish, archive, etc), requiere autenticación
         return [IsAuthenticated()]
     
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['category', 'status', 'author']
-    search_fields = ['title', 'content']
-    ordering_fields = ['created_at', 'title']
+    # Todos los parámetros de filtrado (incluida la búsqueda de texto completo) se
+    # validan y aplican una sola vez en PostFilter
+    filter_backends = [DjangoFilterBackend, PostOrderingFilter]
+    filterset_class = PostFilter
+    ordering_fields = ['created_at', 'title', 'hot_score']
     ordering = ['-created_at']
     
+    @property
+    def paginator(self):
+        # Paginación por cursor opcional: ?pagination=cursor (orden fijo por -created_at, -id)
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if params.get('pagination') == 'cursor' or KeysetPagination.cursor_query_param in params:
+                self._paginator = KeysetPagination()
+        return super().paginator
+    
+    def is_compact_list(self):
+        """Modo de listado ligero: ?view=compact en list y my-posts"""
+        return self.action in ['list', 'my_posts'] and self.request.query_params.get('view') == 'compact'
+    
+    def get_serializer_class(self):
+        if self.is_compact_list():
+            return PostListSerializer
+        return super().get_serializer_class()
+    
     def get_queryset(self):
-        queryset = Post.objects.select_related('author', 'category').prefetch_related('tags').annotate(
-            comments_count_annotated=Count('comments')
-        )
-        
-        # Filtro por categoría
-        category_filter = self.request.query_params.get('category')
-        if category_filter:
-            queryset = queryset.filter(category_id=category_filter)
+        if self.is_compact_list():
+            # El contenido no viaja desde la BD; solo se cargan las relaciones expandidas
+            expandable = PostListSerializer.Meta.expandable_fields
+            expand = parse_field_list(self.request.query_params.get('expand')) & set(expandable)
+            queryset = Post.objects.prefetch_related('tags').defer('content', 'content_html', 'search_vector')
+            if expand:
+                queryset = queryset.select_related(*expand)
+        else:
+            queryset = Post.objects.select_related('author', 'category').prefetch_related('tags').defer(
+                'search_vector'
+            )
         
-        # Filtro por estado (por defecto solo publicados para usuarios normales o no autenticados)
-        status_filter = self.request.query_params.get('status')
+        # Visibilidad: sin ?status explícito (lo aplica PostFilter), usuarios no
+        # autenticados o estudiantes solo ven posts publicados
         user = self.request.user
-        
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        elif not user.is_authenticated or user.role not in ['ADMIN', 'PROFESSOR']:
-            # Usuarios no autenticados o estudiantes solo ven posts publicados
+        if not self.request.query_params.get('status') and (
+            not user.is_authenticated or user.role not in ['ADMIN', 'PROFESSOR']
+        ):
             queryset = queryset.filter(status='PUBLISHED')
         
-        # Filtro por búsqueda
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) | Q(content__icontains=search)
-            )
-        
         return queryset
     
+    def is_feed_cacheable(self):
+        """Solo el feed de publicados: los moderadores ven todos los estados y no usan la caché"""
+        user = self.request.user
+        if (user.is_authenticated and user.role in ['ADMIN', 'PROFESSOR']) or self.explain_requested():
+            return False
+        return self.request.query_params.get('status') in (None, '', 'PUBLISHED')
+    
+    def list(self, request, *args, **kwargs):
+        cache_key = feed_cache_key(request) if self.is_feed_cacheable() else None
+        if cache_key:
+            data = get_cached_feed(cache_key)
+            if data is not None:
+                return Response(data)
+        response = super().list(request, *args, **kwargs)
+        if cache_key and response.status_code == status.HTTP_200_OK:
+            set_cached_feed(cache_key, response.data)
+        return response
+    
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            # Solo en memoria: el buffer del proceso lo escribe por lotes (ver posts.view_counter)
+            post_id = int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+            view_buffer.record(post_id, visitor_key(request))
+        return response
+    
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
@@ -68,7 +133,7 @@ class PostViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='my-posts')
     def my_posts(self, request):
         """Obtener posts del usuario autenticado"""
-        posts = self.get_queryset().filter(author=request.user)
+        posts = self.filter_queryset(self.get_queryset()).filter(author=request.user)
         page = self.paginate_queryset(posts)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -76,6 +141,68 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(posts, many=True)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['get'], url_path='related')
+    def related(self, request, pk=None):
+        """Posts relacionados precalculados (build_related_posts), en una sola consulta"""
+        # get_object aplica la visibilidad del queryset: 404 si el post no es visible
+        post = self.get_object()
+        links = RelatedPost.objects.filter(
+            post_id=post.pk, related__status='PUBLISHED'
+        ).order_by('-score').values(
+            'score', 'related_id', 'related__title', 'related__excerpt', 'related__created_at'
+        )
+        return Response([
+            {
+                'id': link['related_id'],
+                'title': link['related__title'],
+                'excerpt': link['related__excerpt'],
+                'created_at': link['related__created_at'],
+                'score': round(link['score'], 4)
+            }
+            for link in links
+        ])
+    
+    @action(detail=True, methods=['get'], url_path='views')
+    def view_stats(self, request, pk=None):
+        """
+        Visitas y visitantes únicos por día de los últimos ?days= días (autor o moderadores).
+        
+        El total de visitantes únicos del periodo combina los bocetos diarios; no
+        incluye las visitas que aún están en el buffer de los procesos.
+        """
+        post = self.get_object()
+        if post.author != request.user and request.user.role not in ['ADMIN', 'PROFESSOR']:
+            return Response(
+                {'error': 'No tienes permisos para ver las visitas de este post'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        try:
+            days = int(request.query_params.get('days', VIEW_STATS_DAYS))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= MAX_VIEW_STATS_DAYS:
+            return Response(
+                {'error': f'days debe ser un entero entre 1 y {MAX_VIEW_STATS_DAYS}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        rows = PostDailyViews.objects.filter(
+            post=post, day__gt=timezone.localdate() - timedelta(days=days)
+        ).order_by('day').values_list('day', 'views', 'unique_visitors', 'visitors')
+        visitors = HyperLogLog()
+        daily = []
+        for day, views, unique_visitors, sketch in rows:
+            visitors.merge(HyperLogLog(sketch))
+            daily.append({'day': day, 'views': views, 'unique_visitors': unique_visitors})
+        return Response({
+            'id': post.pk,
+            'views_count': post.views_count,
+            'days': days,
+            'views': sum(entry['views'] for entry in daily),
+            'unique_visitors': visitors.count(),
+            'daily': daily
+        })
+    
     @action(detail=True, methods=['patch'], url_path='publish')
     def publish(self, request, pk=None):
         """Publicar un post"""
@@ -86,7 +213,7 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         post.status = 'PUBLISHED'
-        post.save()
+        post.save(update_fields=['status', 'updated_at'])
         return Response(PostSerializer(post).data)
     
     @action(detail=True, methods=['patch'], url_path='archive')
@@ -99,9 +226,26 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         post.status = 'ARCHIVED'
-        post.save()
+        post.save(update_fields=['status', 'updated_at'])
         return Response(PostSerializer(post).data)
 
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Publicar, archivar o eliminar varios posts en una sola petición"""
+        serializer = BulkPostActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = apply_bulk_action(
+            request.user,
+            serializer.validated_data['ids'],
+            serializer.validated_data['action']
+        )
+        return Response({
+            'action': serializer.validated_data['action'],
+            'processed': sum(1 for result in results if result['result'] == 'ok'),
+            'results': results
+        })
+
 
 class TagViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet de solo lectura para etiquetas"""
@@ -111,7 +255,65 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_permissions(self):
         # Permitir acceso público para listar tags
-        if self.action == 'list':
+        if self.action in ['list', 'top', 'trending']:
             from rest_framework.permissions import AllowAny
             return [AllowAny()]
         return super().get_permissions()
+    
+    def get_limit(self, default=10, maximum=100):
+        try:
+            limit = int(self.request.query_params.get('limit', default))
+        except ValueError:
+            return default
+        return max(1, min(limit, maximum))
+    
+    def list(self, request, *args, **kwargs):
+        """Listado desde el índice en memoria; ?prefix= filtra por prefijo (más usadas primero)"""
+        index = get_tag_index()
+        prefix = request.query_params.get('prefix', '').strip()
+        tags = index.prefix(prefix) if prefix else index.all()
+        page = self.paginate_queryset(tags)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(tags)
+    
+    @action(detail=False, methods=['get'], url_path='top')
+    def top(self, request):
+        """Etiquetas más usadas en posts publicados"""
+        return Response(get_tag_index().top(self.get_limit()))
+    
+    @action(detail=False, methods=['get'], url_path='trending')
+    def trending(self, request):
+        """Etiquetas en tendencia (índice sobre hot_score)"""
+        tags = Tag.objects.order_by('-hot_score').values('id', 'name', 'hot_score')[:self.get_limit()]
+        return Response([
+            {'id': tag['id'], 'name': tag['name'], 'score': round(decayed(tag['hot_score']), 4)}
+            for tag in tags
+        ])
+
+
+SUGGEST_MIN_LENGTH = 2
+SUGGEST_DEFAULT_LIMIT = 5
+SUGGEST_MAX_LIMIT = 20
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def suggest_view(request):
+    """Autocompletado tolerante a errores de títulos de posts publicados y etiquetas"""
+    text = request.query_params.get('q', '').strip()
+    try:
+        limit = int(request.query_params.get('limit', SUGGEST_DEFAULT_LIMIT))
+    except ValueError:
+        limit = SUGGEST_DEFAULT_LIMIT
+    limit = max(1, min(limit, SUGGEST_MAX_LIMIT))
+    
+    if len(text) < SUGGEST_MIN_LENGTH:
+        return Response({'posts': [], 'tags': []})
+    
+    posts = suggest(Post.objects.filter(status='PUBLISHED'), 'title', text, limit)
+    tags = suggest(Tag.objects.all(), 'name', text, limit)
+    return Response({
+        'posts': list(posts.values('id', 'title', 'similarity')),
+        'tags': list(tags.values('id', 'name', 'similarity'))
+    })
@@ -0,0 +1,18 @@
+import django_filters
+from .models import Report
+
+
+class ReportFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de reportes.
+
+    ?status usa el índice (status, -created_at), que también resuelve el orden.
+    """
+    status = django_filters.ChoiceFilter(choices=Report.Status.choices)
+    type = django_filters.ChoiceFilter(choices=Report.Type.choices)
+    post = django_filters.NumberFilter(field_name='post_id')
+    comment = django_filters.NumberFilter(field_name='comment_id')
+    
+    class Meta:
+        model = Report
+        fields = ['status', 'type', 'post', 'comment']
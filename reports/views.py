@@ -2,39 +2,48 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.filters import OrderingFilter
 from django.utils import timezone
 from django.db.models import Q
+from django_filters.rest_framework import DjangoFilterBackend
+from campus_forum.events import event_reason
+from campus_forum.export import StreamingExportMixin
+from campus_forum.mixins import QueryExplainMixin
+from .filters import ReportFilter
 from .models import Report
 from .serializers import ReportSerializer
 from .permissions import IsModerator
 
 
-class ReportViewSet(viewsets.ModelViewSet):
+class ReportViewSet(StreamingExportMixin, QueryExplainMixin, viewsets.ModelViewSet):
     serializer_class = ReportSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = ReportFilter
+    ordering_fields = ['created_at']
+    ordering = ['-created_at']
+    export_fields = ('id', 'type', 'status', 'reported_by_id', 'post_id', 'comment_id', 'reason',
+                     'reviewed_by_id', 'action_taken', 'created_at', 'reviewed_at')
     
     def get_queryset(self):
         user = self.request.user
         queryset = Report.objects.select_related(
             'reported_by', 'reviewed_by', 'post', 'comment'
-        )
+        ).defer('post__search_vector')
         
         # Moderadores ven todos los reportes
         if user.role in ['ADMIN', 'PROFESSOR']:
-            status_filter = self.request.query_params.get('status')
-            if status_filter:
-                queryset = queryset.filter(status=status_filter)
-            else:
-                # Por defecto, mostrar pendientes y revisados
+            if not self.request.query_params.get('status'):
+                # Por defecto, mostrar pendientes y revisados (?status lo aplica ReportFilter)
                 queryset = queryset.filter(status__in=['PENDING', 'REVIEWED'])
         else:
             # Usuarios normales solo ven sus propios reportes
             queryset = queryset.filter(reported_by=user)
         
-        return queryset.order_by('-created_at')
+        return queryset
     
     def get_permissions(self):
-        if self.action in ['review', 'resolve', 'dismiss']:
+        if self.action in ['review', 'resolve', 'dismiss', 'export']:
             return [IsModerator()]
         return super().get_permissions()
     
@@ -59,17 +68,18 @@ class ReportViewSet(viewsets.ModelViewSet):
         report = self.get_object()
         action_taken = request.data.get('action_taken', '')
         
-        # Archivar o eliminar contenido según el tipo
-        if report.type == 'POST' and report.post:
-            if 'archive' in action_taken.lower():
-                report.post.status = 'ARCHIVED'
-                report.post.save()
-            elif 'delete' in action_taken.lower():
-                report.post.delete()
-        
-        elif report.type == 'COMMENT' and report.comment:
-            if 'delete' in action_taken.lower():
-                report.comment.delete()
+        # Archivar o eliminar contenido según el tipo (los streams lo reciben con reason='report')
+        with event_reason('report'):
+            if report.type == 'POST' and report.post:
+                if 'archive' in action_taken.lower():
+                    report.post.status = 'ARCHIVED'
+                    report.post.save()
+                elif 'delete' in action_taken.lower():
+                    report.post.delete()
+            
+            elif report.type == 'COMMENT' and report.comment:
+                if 'delete' in action_taken.lower():
+                    report.comment.delete()
         
         report.status = Report.Status.RESOLVED
         report.reviewed_by = request.user